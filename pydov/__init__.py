@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import pydov.util.caching
+import pydov.util.parsing
 from pydov.util.hooks import Hooks, SimpleStatusHook
 from pydov.util.net import SessionFactory, proxy_autoconfiguration
 
@@ -9,6 +10,44 @@ __package_name__ = "pydov"
 
 cache = pydov.util.caching.GzipTextFileCache()
 
+# Engine used to download the XML documents of the search results, either
+# 'threads' (default) or 'async'. The async engine requires aiohttp.
+engine = 'threads'
+
+# Request the number of matching features upfront in a WFS search, so all WFS
+# pages can be requested in parallel at once.
+wfs_hits_probe = False
+
+# Use keyset pagination instead of offsets to page through the results of WFS
+# searches of types with a permanent key, keeping the cost of each page
+# constant.
+wfs_keyset_paging = False
+
+# Planner to split large spatial WFS searches into tiles that are requested
+# in parallel, see pydov.util.tiling.TilePlanner. Defaults to None, which
+# disables tiling.
+tile_planner = None
+
+# Cache for WFS GetFeature responses, see
+# pydov.util.caching.WfsResponseCache. Defaults to None, which disables
+# caching of WFS responses.
+wfs_cache = None
+
+# Cache for the metadata of the WFS layers, see
+# pydov.util.caching.MetadataCache. Defaults to None, which disables caching
+# of the metadata across processes and search instances.
+metadata_cache = None
+
+# Cache for the values parsed from the XML documents, see
+# pydov.util.caching.ParsedDataCache. Defaults to None, which parses the XML
+# documents for every search.
+parsed_cache = None
+
+# Number of worker processes to parse the XML documents of the search
+# results in, see pydov.util.parsing. Defaults to None, which parses the XML
+# documents in the download threads.
+parse_processes = None
+
 hooks = Hooks(
     (SimpleStatusHook(),)
 )
@@ -19,3 +58,46 @@ proxy_autoconfiguration()
 # Package wide requests session object. This increases performance as using a
 # session object allows connection pooling and TCP connection reuse.
 session = SessionFactory.get_session()
+
+
+def shutdown():
+    """Stop the persistent worker threads and processes and close their
+    sessions.
+
+    The worker threads and processes are started again automatically on next
+    use.
+    """
+    pydov.util.net.shutdown()
+    pydov.util.parsing.shutdown()
+
+
+def warm_up(layers):
+    """Initialise the metadata and fields of multiple search classes in
+    parallel.
+
+    Parameters
+    ----------
+    layers : list of pydov.search.abstract.AbstractSearch, type or str
+        Search classes to initialise, either as instances, as classes or as
+        the workspace qualified name of a WFS layer.
+
+    Returns
+    -------
+    list of pydov.search.abstract.AbstractSearch
+        Initialised search instances, in the order of the given layers.
+
+    """
+    from pydov.search.abstract import init_metadata
+    from pydov.search.generic import WfsSearch
+
+    searches = []
+    for layer in layers:
+        if isinstance(layer, str):
+            searches.append(WfsSearch(layer))
+        elif isinstance(layer, type):
+            searches.append(layer())
+        else:
+            searches.append(layer)
+
+    init_metadata(searches)
+    return searches
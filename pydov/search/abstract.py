@@ -1,34 +1,114 @@
 # -*- coding: utf-8 -*-
 """Module containing the abstract search classes to retrieve DOV data."""
 
-from itertools import chain
+import copy
+from collections import deque
+from itertools import chain, islice
 import math
+import warnings
 
 import owslib
 import owslib.fes2
 from owslib.etree import etree
-from owslib.feature import get_schema
 from owslib.fes2 import FilterRequest
 from owslib.wfs import WebFeatureService
 import pandas as pd
+from requests.exceptions import RequestException
 
 import pydov
 from pydov.search.fields import (
     FieldMetadata, FieldMetadataList, GeometryReturnField, ReturnFieldList)
 from pydov.types.fields import _WfsInjectedField
-from pydov.util import owsutil
+from pydov.util import arrow, owsutil
 from pydov.util.dovutil import build_dov_url
-from pydov.util.errors import (InvalidFieldError, InvalidSearchParameterError,
+from pydov.util.errors import (CodelistFetchWarning, DOVError,
+                               DataTypeWarning, InvalidFieldError,
+                               InvalidSearchParameterError,
                                LayerNotFoundError, WfsGetFeatureError)
 from pydov.util.hooks import HookRunner
-from pydov.util.net import LocalSessionThreadPool
+from pydov.util.location import Intersects, get_extent
+from pydov.util.net import get_shared_worker_pool
 from pydov.util.notebook import HtmlFormatter
 
 
+def init_metadata(searches):
+    """Initialise the metadata and fields of the given search instances.
+
+    The metadata is requested concurrently in the shared worker pool, as a
+    dependency graph: the WFS capabilities of each WFS endpoint and the
+    DescribeFeatureType of each layer are requested in parallel, the ISO
+    metadata and feature catalogue of each layer as soon as the capabilities
+    of its endpoint are available. Finally, the fields of each search
+    instance are built.
+
+    Parameters
+    ----------
+    searches : list of AbstractSearch
+        Search instances to initialise.
+
+    """
+    worker_pool = get_shared_worker_pool()
+
+    def execute(fn, session):
+        return fn()
+
+    def wait(result):
+        result.wait()
+        if result.get_error():
+            raise result.get_error()
+        return result.get_result()
+
+    searches = [s for s in searches if s._fields is None]
+
+    wfs_results = {}
+    for search in searches:
+        endpoint = search._get_wfs_endpoint()
+        if search._wfs is None and endpoint not in wfs_results:
+            wfs_results[endpoint] = worker_pool.submit(
+                execute, (search._get_wfs,))
+
+    schema_results = [worker_pool.submit(execute, (s._init_schema,))
+                      for s in searches]
+
+    md_results = []
+    for search in searches:
+        endpoint = search._get_wfs_endpoint()
+        if search._wfs is None:
+            search._wfs, search._wfs_max_features = wait(
+                wfs_results[endpoint])
+        md_results.append(worker_pool.submit(
+            execute, (search._init_remote_metadata,)))
+
+    for result in md_results + schema_results:
+        wait(result)
+
+    for search in searches:
+        search._inject_wfs_fields(search._wfs_schema)
+        search._fields = search._build_fields(
+            search._wfs_schema, search._fc_featurecatalogue)
+
+
 class AbstractSearch(HtmlFormatter):
     """Abstract search class grouping methods common to all DOV search
     classes. Not to be instantiated or used directly."""
 
+    # Maximum number of WFS pages being requested or waiting to be processed
+    # at the same time.
+    _wfs_page_window = 8
+
+    # Mapping of WFS datatypes to pydov datatypes.
+    _map_wfs_datatypes = {
+        'int': 'integer',
+        'long': 'integer',
+        'decimal': 'float',
+        'double': 'float',
+        'dateTime': 'datetime'
+    }
+
+    # Maximum ratio of distinct values to values of a string field without
+    # codelist to be returned as a categorical in typed dataframes.
+    _categorical_max_ratio = 0.5
+
     def __init__(self, layer, objecttype):
         """Initialisation.
 
@@ -51,6 +131,7 @@ class AbstractSearch(HtmlFormatter):
         self._map_df_wfs_source = {}
 
         self._wfs = None
+        self._wfs_describefeaturetype = None
         self._wfs_schema = None
         self._wfs_namespace = None
         self._wfs_max_features = None
@@ -83,75 +164,122 @@ class AbstractSearch(HtmlFormatter):
         workspace = self._layer.split(':')[0]
         return base_url + workspace + '/wfs'
 
-    def _init_wfs(self):
-        """Initialise the WFS service. If the WFS service is not
-        instantiated yet, do so and save it in a static variable available
-        to all subclasses and instances.
+    def _get_shared_metadata(self, key, build):
+        """Get the parsed metadata with the given key, shared process-wide
+        between all search instances if the metadata cache is enabled.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the parsed metadata.
+        build : function
+            Function without parameters, returning the parsed metadata.
+
+        Returns
+        -------
+        object
+            The parsed metadata.
+
         """
-        if self._wfs is None:
-            wfs_endpoint_url = self._get_wfs_endpoint()
+        if pydov.metadata_cache is None:
+            return build()
+        return pydov.metadata_cache.get_shared(key, build)
 
+    def _get_wfs(self):
+        """Get the WFS service and the maximum number of features it returns
+        in a single request. It is shared process-wide with all instances
+        using the same WFS endpoint if the metadata cache is enabled.
+
+        Returns
+        -------
+        wfs : owslib.wfs.WebFeatureService
+            WFS service to use for this search class.
+        max_features : int or None
+            Maximum number of features returned in a single request, or None
+            if it could not be determined.
+
+        """
+        wfs_endpoint_url = self._get_wfs_endpoint()
+
+        def build_wfs():
             capabilities = owsutil.get_wfs_capabilities(
                 wfs_endpoint_url + '?request=GetCapabilities&version=2.0.0')
 
-            self._wfs = WebFeatureService(
+            wfs = WebFeatureService(
                 url=wfs_endpoint_url, version="2.0.0", xml=capabilities)
+            return wfs, owsutil.get_wfs_max_features(capabilities)
 
-            self._wfs_max_features = owsutil.get_wfs_max_features(capabilities)
+        return self._get_shared_metadata(
+            ('wfs', wfs_endpoint_url), build_wfs)
+
+    def _init_wfs(self):
+        """Initialise the WFS service, if the WFS service is not
+        instantiated yet."""
+        if self._wfs is None:
+            self._wfs, self._wfs_max_features = self._get_wfs()
 
     def _init_namespace(self):
-        """Initialise the WFS namespace associated with the layer.
+        """Initialise the WFS namespace associated with the layer."""
+        if self._wfs_namespace is None:
+            self._wfs_namespace = self._get_shared_metadata(
+                ('namespace', self._layer), self._get_namespace)
 
-        Raises
-        ------
-        NotImplementedError
-            This is an abstract method that should be implemented in a
-            subclass.
+    def _init_schema(self):
+        """Initialise the WFS schema and namespace associated with the
+        layer, both derived from a single DescribeFeatureType request."""
+        if self._wfs_schema is None:
+            self._wfs_schema = self._get_shared_metadata(
+                ('schema', self._layer), self._get_schema)
 
-        """
-        if self._wfs_namespace is None:
-            self._wfs_namespace = self._get_namespace()
+        self._init_namespace()
+
+    def _init_remote_metadata(self):
+        """Initialise the remote ISO metadata and the feature catalogue
+        associated with the layer."""
+        if self._md_metadata is None:
+            self._md_metadata = self._get_shared_metadata(
+                ('md_metadata', self._layer), self._get_remote_metadata)
+
+        if self._md_metadata is not None and \
+                self._fc_featurecatalogue is None:
+            self._fc_featurecatalogue = self._get_shared_metadata(
+                ('fc_featurecatalogue', self._layer),
+                self._get_featurecatalogue)
 
     def _init_fields(self):
         """Initialise the fields and their metadata available in this search
-        class.
+        class."""
+        if self._fields is None:
+            init_metadata([self])
 
-        Raises
-        ------
-        NotImplementedError
-            This is an abstract method that should be implemented in a
-            subclass.
+    def _inject_wfs_fields(self, wfs_schema):
+        """Add the fields available in the WFS service, but not defined in
+        the type, to the fields of the type.
+
+        Parameters
+        ----------
+        wfs_schema : dict
+            The schema associated with the WFS layer.
 
         """
-        if self._fields is None:
-            if self._wfs_schema is None:
-                self._wfs_schema = self._get_schema()
-
-            if self._md_metadata is None:
-                self._md_metadata = self._get_remote_metadata()
-
-            if self._md_metadata is not None and \
-                    self._fc_featurecatalogue is None:
-                csw_url = self._get_csw_base_url()
-                fc_uuid = owsutil.get_featurecatalogue_uuid(self._md_metadata)
-                if fc_uuid is not None:
-                    self._fc_featurecatalogue = \
-                        owsutil.get_remote_featurecatalogue(csw_url, fc_uuid)
-
-            fields = self._build_fields(
-                self._wfs_schema,
-                self._fc_featurecatalogue)
-
-            for field in fields.values():
-                if field['name'] not in self._type.get_field_names(
-                        include_wfs_injected=True):
-                    self._type.fields.append(
-                        _WfsInjectedField(name=field['name'],
-                                          datatype=field['type']))
-
-            self._fields = self._build_fields(
-                self._wfs_schema,
-                self._fc_featurecatalogue)
+        map_wfs_source_df = {
+            f['sourcefield']: f['name'] for f in self._type.get_fields(
+                source=('wfs',)).values()}
+
+        wfs_fields = [
+            (map_wfs_source_df.get(wfs_field, wfs_field),
+             self._map_wfs_datatypes.get(datatype, datatype))
+            for wfs_field, datatype in wfs_schema['properties'].items()]
+
+        if owsutil.has_geom_support() and 'geometry' in wfs_schema and \
+                'geometry_column' in wfs_schema:
+            wfs_fields.append((wfs_schema['geometry_column'], 'geometry'))
+
+        field_names = self._type.get_field_names(include_wfs_injected=True)
+        for name, datatype in wfs_fields:
+            if name not in field_names:
+                self._type.fields.append(
+                    _WfsInjectedField(name=name, datatype=datatype))
 
     def _get_layer(self):
         """Get the WFS metadata for the layer.
@@ -176,6 +304,22 @@ class AbstractSearch(HtmlFormatter):
         else:
             return self._wfs.contents[self._layer]
 
+    def _get_describefeaturetype(self):
+        """Get the DescribeFeatureType response of the layer. It is
+        requested only once per instance.
+
+        Returns
+        -------
+        bytes
+            Response of the DescribeFeatureType request.
+
+        """
+        if self._wfs_describefeaturetype is None:
+            self._wfs_describefeaturetype = \
+                owsutil.get_remote_describefeaturetype(
+                    self._get_wfs_endpoint(), self._layer)
+        return self._wfs_describefeaturetype
+
     def _get_schema(self):
         """Get the WFS schema (i.e. the output of the DescribeFeatureType
         request) of the layer.
@@ -186,11 +330,7 @@ class AbstractSearch(HtmlFormatter):
             Schema associated with the layer.
 
         """
-        self._init_wfs()
-        layername = self._layer.split(':')[1] if ':' in self._layer else \
-            self._layer
-        return get_schema(
-            build_dov_url('geoserver/wfs'), layername, '2.0.0')
+        return owsutil.parse_schema(self._get_describefeaturetype())
 
     def _get_namespace(self):
         """Get the WFS namespace of the layer.
@@ -203,8 +343,7 @@ class AbstractSearch(HtmlFormatter):
             output of a GetFeature request.
 
         """
-        self._init_wfs()
-        return owsutil.get_namespace(self._wfs, self._layer)
+        return owsutil.parse_namespace(self._get_describefeaturetype())
 
     def _get_remote_metadata(self):
         """Request and parse the remote metadata associated with the layer.
@@ -220,6 +359,23 @@ class AbstractSearch(HtmlFormatter):
         wfs_layer = self._get_layer()
         return owsutil.get_remote_metadata(wfs_layer)
 
+    def _get_featurecatalogue(self):
+        """Request and parse the remote feature catalogue associated with
+        the layer.
+
+        Returns
+        -------
+        dict or None
+            Parsed feature catalogue, as returned by
+            pydov.util.owsutil.get_remote_featurecatalogue, or None when the
+            metadata does not refer to a feature catalogue.
+
+        """
+        csw_url = self._get_csw_base_url()
+        fc_uuid = owsutil.get_featurecatalogue_uuid(self._md_metadata)
+        if fc_uuid is not None:
+            return owsutil.get_remote_featurecatalogue(csw_url, fc_uuid)
+
     def _get_csw_base_url(self):
         """Get the CSW base url for the remote metadata associated with the
         layer.
@@ -296,14 +452,6 @@ class AbstractSearch(HtmlFormatter):
                     "pydov.types.fields.AbstractField, found {}.".format(
                         self._type.__name__, str(type(f))))
 
-        _map_wfs_datatypes = {
-            'int': 'integer',
-            'long': 'integer',
-            'decimal': 'float',
-            'double': 'float',
-            'dateTime': 'datetime'
-        }
-
         df_wfs_fields = self._type.get_fields(source=('wfs',)).values()
         for f in df_wfs_fields:
             self._map_wfs_source_df[f['sourcefield']] = f['name']
@@ -324,7 +472,7 @@ class AbstractSearch(HtmlFormatter):
             field = {
                 'name': name,
                 'definition': None,
-                'type': _map_wfs_datatypes.get(
+                'type': self._map_wfs_datatypes.get(
                     wfs_schema['properties'][wfs_field],
                     wfs_schema['properties'][wfs_field]),
                 'multivalue': multivalue,
@@ -545,7 +693,8 @@ class AbstractSearch(HtmlFormatter):
     def _get_remote_wfs_feature(wfs, typename, location, filter,
                                 sort_by, propertyname, max_features,
                                 geometry_column, crs=None, start_index=0,
-                                session=None):
+                                session=None, result_type=None,
+                                keyset_property=None, keyset_start=None):
         """Perform the WFS 2.0 GetFeature call to get features from the remote
         service.
 
@@ -573,6 +722,16 @@ class AbstractSearch(HtmlFormatter):
         session : requests.Session
             Session to use to perform HTTP requests for data. Defaults to None,
             which means a new session will be created for each request.
+        result_type : str, optional
+            Type of the result to request, use 'hits' to only request the
+            number of matching features. Defaults to None, which means the
+            features are returned.
+        keyset_property : str, optional
+            Property to sort on for keyset pagination. Defaults to None,
+            which means no keyset pagination is used.
+        keyset_start : str, optional
+            Only return the features with a value of `keyset_property`
+            greater than this value. Defaults to None.
 
         Returns
         -------
@@ -589,7 +748,10 @@ class AbstractSearch(HtmlFormatter):
             max_features=max_features,
             propertyname=propertyname,
             start_index=start_index,
-            crs=crs
+            crs=crs,
+            result_type=result_type,
+            keyset_property=keyset_property,
+            keyset_start=keyset_start
         )
 
         tree = HookRunner.execute_inject_wfs_getfeature_response(
@@ -598,6 +760,10 @@ class AbstractSearch(HtmlFormatter):
         if tree is not None:
             return tree, wfs_getfeature_xml
 
+        if pydov.wfs_cache is not None:
+            return pydov.wfs_cache.get(
+                wfs.url, wfs_getfeature_xml, session), wfs_getfeature_xml
+
         return owsutil.wfs_get_feature(
             baseurl=wfs.url,
             get_feature_request=wfs_getfeature_xml,
@@ -608,6 +774,53 @@ class AbstractSearch(HtmlFormatter):
                 sort_by=None, max_features=None, extra_wfs_fields=[]):
         """Perform the WFS search by issuing a GetFeature request.
 
+        Parameters
+        ----------
+        location : pydov.util.location.AbstractLocationFilter
+            Location filter limiting the features to retrieve.
+        query : owslib.fes2.OgcExpression
+            OGC filter expression to use for searching.
+        return_fields : list<str>
+            A list of fields to be returned in the output data.
+        sort_by : owslib.fes2.SortBy, optional
+            List of properties to sort by.
+        max_features : int
+            Limit the maximum number of features to request.
+        extra_wfs_fields: list<str>
+            A list of extra fields to be included in the WFS requests,
+            regardless whether they're needed as return field. Optional,
+            defaults to an empty list.
+
+        Returns
+        ------
+        list of etree.Element
+            XML trees of the WFS responses containing the features matching
+            the location and the query.
+
+        """
+        return list(self._search_iter(
+            location=location, query=query, return_fields=return_fields,
+            sort_by=sort_by, max_features=max_features,
+            extra_wfs_fields=extra_wfs_fields))
+
+    def _search_iter(self, location=None, query=None, return_fields=None,
+                     sort_by=None, max_features=None, extra_wfs_fields=[],
+                     validate=True):
+        """Perform the WFS search by issuing GetFeature requests, yielding
+        the WFS responses page by page.
+
+        The pages after the first one are requested in parallel, keeping at
+        most `_wfs_page_window` pages in progress or waiting to be consumed.
+
+        When `pydov.wfs_hits_probe` is enabled, the number of matching
+        features is requested first. This number is reported to the hooks
+        and all pages, including the first one, are requested at once.
+
+        When `pydov.tile_planner` is set, spatial searches are split in tiles
+        that are requested in parallel, see `pydov.util.tiling.TilePlanner`.
+        When `pydov.wfs_keyset_paging` is enabled, the pages are requested
+        using keyset pagination instead, see `_search_iter_keyset`.
+
         Parameters
         ----------
         location : pydov.util.location.AbstractLocationFilter
@@ -629,12 +842,16 @@ class AbstractSearch(HtmlFormatter):
             A list of extra fields to be included in the WFS requests,
             regardless whether they're needed as return field. Optional,
             defaults to an empty list.
+        validate : bool, optional
+            Whether to validate the search parameters. Set this to False
+            when they were already validated by `_prepare_search`. Defaults
+            to True.
 
-        Returns
+        Yields
         ------
-        list of etree.Element
+        etree.Element
             XML trees of the WFS responses containing the features matching
-            the location and the query.
+            the location and the query, in order.
 
         Raises
         ------
@@ -654,8 +871,9 @@ class AbstractSearch(HtmlFormatter):
             instead of as instance of GeometryReturnField.
 
         """
-        self._pre_search_validation(location, query, sort_by, return_fields,
-                                    max_features)
+        if validate:
+            self._pre_search_validation(location, query, sort_by,
+                                        return_fields, max_features)
         self._init_namespace()
         self._init_wfs()
 
@@ -734,11 +952,23 @@ class AbstractSearch(HtmlFormatter):
             geometry_column=self._geometry_column
         ))
 
-        def _get_remote_wfs(start_index=0, max_features=None, session=None):
+        keyset_property = None
+
+        def get_tile_location(tile):
+            if tile is None:
+                return location
+            # the tile is shared by the requests for its number of features
+            # and its features, use a copy to not move its elements
+            with owsutil.location_lock:
+                tile = copy.deepcopy(tile)
+            return owslib.fes2.And([location, Intersects(tile)])
+
+        def _get_remote_wfs(start_index=0, max_features=None, tile=None,
+                            session=None, keyset_start=None):
             fts, getfeature = self._get_remote_wfs_feature(
                 wfs=self._wfs,
                 typename=self._layer,
-                location=location,
+                location=get_tile_location(tile),
                 filter=filter_request,
                 sort_by=sort_by,
                 max_features=max_features,
@@ -746,7 +976,9 @@ class AbstractSearch(HtmlFormatter):
                 geometry_column=self._geometry_column,
                 crs=geom_return_crs,
                 start_index=start_index,
-                session=session)
+                session=session,
+                keyset_property=keyset_property,
+                keyset_start=keyset_start)
 
             tree = etree.fromstring(fts)
 
@@ -757,26 +989,286 @@ class AbstractSearch(HtmlFormatter):
                         self._layer,
                         etree.tostring(tree).decode('utf8')))
 
-            number_matched = int(tree.get('numberMatched'))
+            number_matched = self._get_number_matched(tree)
             number_returned = int(tree.get('numberReturned'))
 
-            HookRunner.execute_wfs_search_result(
-                number_matched, number_returned)
+            if number_matched is not None:
+                HookRunner.execute_wfs_search_result(
+                    number_matched, number_returned)
 
             HookRunner.execute_wfs_search_result_received(getfeature, tree)
 
             return tree
 
-        result = []
+        def _get_remote_wfs_hits(tile=None, session=None):
+            fts, getfeature = self._get_remote_wfs_feature(
+                wfs=self._wfs,
+                typename=self._layer,
+                location=get_tile_location(tile),
+                filter=filter_request,
+                sort_by=None,
+                max_features=None,
+                propertyname=wfs_property_names,
+                geometry_column=self._geometry_column,
+                crs=geom_return_crs,
+                session=session,
+                result_type='hits')
+
+            return self._get_number_matched(etree.fromstring(fts))
+
+        def get_result(worker_result):
+            worker_result.wait()
+            if worker_result.get_error():
+                raise worker_result.get_error()
+            return worker_result.get_result()
+
+        tiles = None
+        if pydov.tile_planner is not None and location is not None \
+                and sort_by is None and max_features is None \
+                and self._wfs_max_features is not None:
+            extent = get_extent(location)
+            if extent is not None:
+                tiles = pydov.tile_planner.plan(
+                    extent, _get_remote_wfs_hits, self._wfs_max_features)
+
+        if tiles is None and pydov.wfs_keyset_paging and sort_by is None \
+                and self._type.pkey_fieldname is not None:
+            keyset_property = self._type.pkey_fieldname
+            yield from self._search_iter_keyset(_get_remote_wfs, max_features)
+            return
+
+        number_matched = None
+        if tiles is None and pydov.wfs_hits_probe \
+                and self._wfs_max_features is not None:
+            # first request only the number of matching features, which is
+            # cheap and allows to request all pages at once
+            number_matched = _get_remote_wfs_hits(session=pydov.session)
+
+        tree = None
+        page_size = None
+        if tiles is not None:
+            # request the features per tile, tiles that could not be split
+            # any further are requested using multiple pages
+            page_requests = []
+            for tile, tile_matched in tiles:
+                page_requests.append((0, None, tile))
+                page_requests.extend(
+                    (start_index, count, tile)
+                    for start_index, count in self._get_wfs_page_requests(
+                        tile_matched,
+                        min(self._wfs_max_features, tile_matched), None))
+
+            page_window = self._wfs_page_window
+        elif number_matched is not None:
+            if max_features is not None:
+                number_expected = min(max_features, number_matched)
+            else:
+                number_expected = number_matched
+
+            page_requests = [(0, max_features, None)] + [
+                (start_index, count, None)
+                for start_index, count in self._get_wfs_page_requests(
+                    number_matched,
+                    min(self._wfs_max_features, number_expected),
+                    max_features)]
+
+            HookRunner.execute_wfs_search_hits(
+                number_matched, number_expected, len(page_requests))
+
+            # the total is known, request all pages at once
+            page_window = len(page_requests)
+        else:
+            tree = _get_remote_wfs(start_index=0, max_features=max_features,
+                                   session=pydov.session)
+
+            number_matched = self._get_number_matched(tree)
+            number_returned = int(tree.get('numberReturned'))
+            if number_matched is not None:
+                page_requests = [
+                    (start_index, count, None)
+                    for start_index, count in self._get_wfs_page_requests(
+                        number_matched, number_returned, max_features)]
+                page_window = self._wfs_page_window
+            else:
+                # the total is unknown, request the next pages one by one
+                # until a page comes back short
+                page_size = self._wfs_max_features or number_returned
+                page_requests = (
+                    (start_index, count, None)
+                    for start_index, count in
+                    self._get_wfs_page_requests_unknown(
+                        number_returned, page_size, max_features))
+                page_window = 1
+
+        seen_features = set()
+
+        def deduplicate(tree):
+            # features on the border of two tiles are returned twice
+            if tiles is None:
+                return tree
+
+            for member in tree.findall(
+                    './{http://www.opengis.net/wfs/2.0}member'):
+                key = self._get_feature_key(member[0])
+                if key is None:
+                    continue
+                elif key in seen_features:
+                    tree.remove(member)
+                else:
+                    seen_features.add(key)
+            return tree
+
+        worker_pool = get_shared_worker_pool() if page_requests else None
+        page_requests = iter(page_requests)
+        pending = deque()
+
+        # start requesting the next pages before handing out the first one
+        for args in islice(page_requests, page_window):
+            pending.append(worker_pool.submit(_get_remote_wfs, args))
+
+        if tree is None and tiles is None:
+            tree = get_result(pending.popleft())
+
+        if tree is not None:
+            yield tree
+
+        while len(pending) > 0:
+            tree = get_result(pending.popleft())
 
-        # execute the first WFS query
-        tree = _get_remote_wfs(
-            start_index=0, max_features=max_features, session=pydov.session)
-        result.append(tree)
+            if page_size is not None and len(tree.findall(
+                    './{http://www.opengis.net/wfs/2.0}member')) < page_size:
+                # the number of matched features is unknown and this page
+                # came back short, so it is the last one
+                page_requests = iter(())
 
-        number_matched = int(tree.get('numberMatched'))
-        number_returned = int(tree.get('numberReturned'))
+            for args in islice(page_requests, 1):
+                pending.append(worker_pool.submit(_get_remote_wfs, args))
 
+            if tree is not None:
+                tree = deduplicate(tree)
+                if len(tree) > 0:
+                    yield tree
+
+    def _search_iter_keyset(self, get_remote_wfs, max_features=None):
+        """Perform the WFS search using keyset pagination, yielding the WFS
+        responses page by page.
+
+        The features are sorted on the permanent key of the type, and each
+        page is requested by filtering on the features with a key greater
+        than the last key of the previous page. This keeps the cost of each
+        page constant, instead of increasing with the offset.
+
+        Parameters
+        ----------
+        get_remote_wfs : function
+            Function to request a single WFS page, accepting the parameters
+            `max_features`, `session` and `keyset_start`.
+        max_features : int
+            Limit the maximum number of features to request.
+
+        Yields
+        ------
+        etree.Element
+            XML trees of the WFS responses containing the features matching
+            the location and the query, in order of the permanent key.
+
+        """
+        keyset_start = None
+        remaining = max_features
+
+        while True:
+            tree = get_remote_wfs(
+                max_features=remaining, session=pydov.session,
+                keyset_start=keyset_start)
+
+            members = tree.findall('./{http://www.opengis.net/wfs/2.0}member')
+            if keyset_start is None or len(members) > 0:
+                yield tree
+
+            if remaining is not None:
+                remaining -= len(members)
+
+            if len(members) == 0 or remaining == 0:
+                break
+
+            number_matched = self._get_number_matched(tree)
+            if number_matched is not None:
+                if len(members) == number_matched:
+                    break
+            elif self._wfs_max_features is not None and \
+                    len(members) < self._wfs_max_features:
+                # the total is unknown, a short page is the last one
+                break
+
+            keyset_start = members[-1][0].findtext('./{{{}}}{}'.format(
+                self._wfs_namespace, self._type.pkey_fieldname))
+
+    def _get_feature_key(self, feature):
+        """Get the key identifying the given WFS feature, used to
+        deduplicate features returned more than once.
+
+        Parameters
+        ----------
+        feature : etree.Element
+            XML element representing a single record of the WFS layer.
+
+        Returns
+        -------
+        str or None
+            The gml:id of the feature, or the value of its permanent key if
+            the feature has no gml:id. None if neither is available.
+
+        """
+        key = feature.get('{http://www.opengis.net/gml/3.2}id')
+        if key is None and self._type.pkey_fieldname is not None:
+            key = feature.findtext('./{{{}}}{}'.format(
+                self._wfs_namespace, self._type.pkey_fieldname))
+        return key
+
+    @staticmethod
+    def _get_number_matched(tree):
+        """Get the number of features matched by a WFS search query from
+        its response.
+
+        Parameters
+        ----------
+        tree : etree.Element
+            XML tree of the WFS response.
+
+        Returns
+        -------
+        int or None
+            The number of features matched by the WFS search query, or None
+            if it is missing or unknown to the server.
+
+        """
+        number_matched = tree.get('numberMatched')
+        if number_matched is None or not number_matched.isdigit():
+            return None
+        return int(number_matched)
+
+    def _get_wfs_page_requests(self, number_matched, number_returned,
+                               max_features):
+        """Get the parameters of the WFS requests needed to retrieve the
+        features following the first page.
+
+        Parameters
+        ----------
+        number_matched : int
+            The number of features matched by the WFS search query.
+        number_returned : int
+            The number of features returned in the first page.
+        max_features : int
+            Limit the maximum number of features to request.
+
+        Returns
+        -------
+        list of tuple
+            List of tuples (start_index, max_features) with the parameters of
+            the remaining WFS requests, in order.
+
+        """
+        page_requests = []
         if max_features is not None and number_returned == max_features:
             # we asked for a limited number of features and we got all of them,
             # we're done!
@@ -788,8 +1280,6 @@ class AbstractSearch(HtmlFormatter):
         else:
             # more features matched the query than were returned by the server,
             # we need more requests to fetch the rest of the results
-            pool = LocalSessionThreadPool()
-
             if max_features is not None:
                 fts_to_get = min(
                     max_features, number_matched) - number_returned
@@ -802,24 +1292,55 @@ class AbstractSearch(HtmlFormatter):
                 start_index = (i+1)*fts_per_req
                 if i == extra_reqs - 1:
                     # last request
-                    if fts_to_get == fts_per_req:
+                    if fts_to_get % fts_per_req == 0:
                         max_features = None
                     else:
                         max_features = fts_to_get % fts_per_req
                 else:
                     max_features = fts_per_req
 
-                pool.execute(_get_remote_wfs, (start_index, max_features))
+                page_requests.append((start_index, max_features))
+
+        return page_requests
+
+    def _get_wfs_page_requests_unknown(self, number_returned, page_size,
+                                       max_features):
+        """Get the parameters of the WFS requests needed to retrieve the
+        features following the first page, when the server doesn't report
+        the number of features matched by the WFS search query.
 
-            for r in pool.join():
-                if r.get_error():
-                    raise r.get_error()
+        Pages are generated until the maximum number of features is
+        reached. The caller should stop requesting pages as soon as a page
+        comes back short.
+
+        Parameters
+        ----------
+        number_returned : int
+            The number of features returned in the first page.
+        page_size : int
+            The number of features per page.
+        max_features : int
+            Limit the maximum number of features to request.
 
-                worker_result = r.get_result()
-                if worker_result is not None and len(worker_result) > 0:
-                    result.append(worker_result)
+        Yields
+        ------
+        tuple
+            Tuples (start_index, max_features) with the parameters of the
+            remaining WFS requests, in order.
 
-        return result
+        """
+        if number_returned == 0 or number_returned < page_size or \
+                number_returned == max_features:
+            return
+
+        start_index = number_returned
+        while max_features is None or start_index < max_features:
+            if max_features is None:
+                count = page_size
+            else:
+                count = min(page_size, max_features - start_index)
+            yield start_index, count
+            start_index += count
 
     def get_description(self):
         """Get the description of this search layer.
@@ -906,7 +1427,8 @@ class AbstractSearch(HtmlFormatter):
         return field_metadata
 
     def search(self, location=None, query=None,
-               sort_by=None, return_fields=None, max_features=None):
+               sort_by=None, return_fields=None, max_features=None,
+               typed=False, output='dataframe'):
         """Search for objects of this type. Provide `location` and/or
         `query` and/or `max_features`.
         When `return_fields` is None, all fields are returned.
@@ -932,11 +1454,26 @@ class AbstractSearch(HtmlFormatter):
             not all fields are currently supported as return fields.
         max_features : int
             Limit the maximum number of features to request.
+        typed : bool, optional
+            Whether to return the columns with pandas extension datatypes,
+            based on the datatype of the fields: nullable `Int64` for
+            integers, `boolean` for booleans, `datetime64` for dates and
+            datetimes and `category` for strings with a codelist or with few
+            distinct values. Defaults to False, returning the columns with
+            the datatypes inferred by pandas. This only applies to the
+            'dataframe' output, the 'arrow' output is always typed.
+        output : str, optional
+            Type of output to return: 'dataframe' for a pandas DataFrame or
+            'arrow' for a pyarrow Table. The Arrow output is built directly
+            from the results, always with the datatypes of the fields (and
+            lists for fields with multiple values, WKB for geometries),
+            regardless of `typed`. It requires the optional pyarrow
+            dependency. Defaults to 'dataframe'.
 
         Returns
         -------
-        pandas.core.frame.DataFrame
-            DataFrame containing the output of the search query.
+        pandas.core.frame.DataFrame or pyarrow.Table
+            DataFrame (or Table) containing the output of the search query.
 
         Raises
         ------
@@ -957,30 +1494,696 @@ class AbstractSearch(HtmlFormatter):
             When the argument supplied as return_fields is not a list,
             tuple or set.
 
+        ValueError
+            When the output is not one of 'dataframe' or 'arrow'.
+
+        ImportError
+            When the output is 'arrow' and the pyarrow package is not
+            installed.
+
         NotImplementedError
             This is an abstract method that should be implemented in a
             subclass.
 
         """
-        return_fields = ReturnFieldList.from_field_names(return_fields)
+        if output not in ('dataframe', 'arrow'):
+            raise ValueError(
+                "Unknown output '{}', should be one of 'dataframe' or "
+                "'arrow'.".format(output))
+        elif output == 'arrow':
+            pa = arrow.import_pyarrow()
+
+        query, return_fields = self._prepare_search(
+            location, query, sort_by, return_fields, max_features)
+
+        trees = self._search_iter(
+            location=location, query=query, sort_by=sort_by,
+            return_fields=return_fields, max_features=max_features,
+            validate=False)
+
+        if output == 'arrow':
+            schema, batches = self._iter_arrow_batches(
+                trees, return_fields, None)
+            return pa.Table.from_batches(list(batches), schema=schema)
+
+        cols = self._get_columns(return_fields)
+        fields = self._get_typed_fields(cols) if typed else None
+
+        if self._type._supports_wfs_columns(return_fields):
+            columns = {c: [] for c in cols}
+            for tree in trees:
+                for c, values in self._type.from_wfs_columns(
+                        tree, self._wfs_namespace, return_fields).items():
+                    columns[c].extend(values)
+
+            if typed:
+                df = self._build_typed_dataframe(columns, cols, fields)
+            else:
+                df = pd.DataFrame(data=columns, columns=cols)
+        else:
+            features = chain.from_iterable(
+                self._type.from_wfs(tree, self._wfs_namespace)
+                for tree in trees)
 
-        trees = self._search(location=location, query=query, sort_by=sort_by,
-                             return_fields=return_fields,
-                             max_features=max_features)
+            if self._type._supports_df_columns(return_fields):
+                columns = self._type.to_df_columns(features, return_fields)
+
+                if typed:
+                    df = self._build_typed_dataframe(columns, cols, fields)
+                else:
+                    df = pd.DataFrame(
+                        data=columns, columns=cols).infer_objects()
+            else:
+                df = pd.DataFrame(
+                    data=self._type.to_df_array(features, return_fields),
+                    columns=cols)
+
+                if typed:
+                    df = self._convert_dtypes(df, fields)
+
+        return df
+
+    def search_iter(self, location=None, query=None, sort_by=None,
+                    return_fields=None, max_features=None, chunk_size=None,
+                    typed=False):
+        """Search for objects of this type, yielding the output in chunks.
+        Provide `location` and/or `query` and/or `max_features`.
+        When `return_fields` is None, all fields are returned.
+
+        This takes the same parameters as `search`, but instead of returning
+        a single DataFrame it yields DataFrames as the WFS pages and their
+        XML details are retrieved. This allows processing the output of large
+        searches in bounded memory.
+
+        Parameters
+        ----------
+        location : pydov.util.location.AbstractLocationFilter or \
+                   owslib.fes2.BinaryLogicOpType<AbstractLocationFilter> or \
+                   owslib.fes2.UnaryLogicOpType<AbstractLocationFilter>
+            Location filter limiting the features to retrieve. Can either be a
+            single instance of a subclass of AbstractLocationFilter, or a
+            combination using And, Or, Not of AbstractLocationFilters.
+        query : owslib.fes2.OgcExpression
+            OGC filter expression to use for searching. This can contain any
+            combination of filter elements defined in owslib.fes2. The query
+            should use the fields provided in `get_fields()`. Note that not
+            all fields are currently supported as a search parameter.
+        sort_by : owslib.fes2.SortBy, optional
+            List of properties to sort by.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data. This should
+            be a subset of the fields provided in `get_fields()`. Note that
+            not all fields are currently supported as return fields.
+        max_features : int
+            Limit the maximum number of features to request.
+        chunk_size : int, optional
+            Number of features (objects) to include in each chunk. Note that
+            a chunk can contain more rows than features when subtype fields
+            are returned. Defaults to None, which yields one chunk for each
+            WFS page.
+        typed : bool, optional
+            Whether to return the columns with pandas extension datatypes,
+            like `search`. To keep the datatypes of the chunks consistent,
+            only strings with a codelist are returned as `category`, with
+            the codes of the codelist as categories. Values that are not in
+            the codelist are kept and added to the categories of their
+            chunk, use `pandas.api.types.union_categoricals` to combine
+            columns of chunks with different categories. Defaults to False.
+
+        Yields
+        ------
+        pandas.core.frame.DataFrame
+            DataFrames containing consecutive parts of the output of the
+            search query. Concatenated they are equal to the output of
+            `search`. Nothing is yielded if no features match the search.
+
+        Raises
+        ------
+        pydov.util.errors.InvalidSearchParameterError
+            When not one of `location` or `query` or `max_features` is
+            provided.
+
+        pydov.util.errors.InvalidFieldError
+            When at least one of the fields in `return_fields` is unknown.
+
+            When a field that is only accessible as return field is used as
+            a query parameter.
+
+            When a field that can only be used as a query parameter is used as
+            a return field.
+
+        AttributeError
+            When the argument supplied as return_fields is not a list,
+            tuple or set.
+
+        ValueError
+            When the chunk_size is not a positive integer.
+
+        """
+        if chunk_size is not None and (
+                not isinstance(chunk_size, int) or chunk_size < 1):
+            raise ValueError("chunk_size should be a positive integer.")
+
+        query, return_fields = self._prepare_search(
+            location, query, sort_by, return_fields, max_features)
+
+        trees = self._search_iter(
+            location=location, query=query, sort_by=sort_by,
+            return_fields=return_fields, max_features=max_features,
+            validate=False)
+
+        cols = self._get_columns(return_fields)
+
+        if not typed:
+            def build(data):
+                return pd.DataFrame(data=data, columns=cols)
+
+            yield from self._iter_chunks(trees, cols, return_fields,
+                                         chunk_size, build, build)
+            return
+
+        fields = self._get_typed_fields(cols)
+
+        def from_columns(data):
+            return self._build_typed_dataframe(
+                data, cols, fields, chunked=True)
+
+        def from_rows(data):
+            return self._convert_dtypes(
+                pd.DataFrame(data=data, columns=cols), fields, chunked=True)
+
+        yield from self._iter_chunks(trees, cols, return_fields, chunk_size,
+                                     from_columns, from_rows)
+
+    def search_to_parquet(self, path, location=None, query=None,
+                          sort_by=None, return_fields=None, max_features=None,
+                          chunk_size=None):
+        """Search for objects of this type and write the output to a Parquet
+        file. Provide `location` and/or `query` and/or `max_features`.
+        When `return_fields` is None, all fields are returned.
+
+        The output is written incrementally, as the WFS pages and their XML
+        details are retrieved: each chunk is written as a separate row group.
+        The datatypes of the columns are based on the datatypes of the
+        fields, see `search` with `output='arrow'`. This requires the
+        optional pyarrow dependency.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Path of the Parquet file to write.
+        location : pydov.util.location.AbstractLocationFilter or \
+                   owslib.fes2.BinaryLogicOpType<AbstractLocationFilter> or \
+                   owslib.fes2.UnaryLogicOpType<AbstractLocationFilter>
+            Location filter limiting the features to retrieve.
+        query : owslib.fes2.OgcExpression
+            OGC filter expression to use for searching.
+        sort_by : owslib.fes2.SortBy, optional
+            List of properties to sort by.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data.
+        max_features : int
+            Limit the maximum number of features to request.
+        chunk_size : int, optional
+            Number of features (objects) to include in each row group.
+            Defaults to None, which writes one row group for each WFS page.
+
+        Returns
+        -------
+        int
+            Number of rows written.
+
+        Raises
+        ------
+        ImportError
+            When the pyarrow package is not installed.
+
+        ValueError
+            When the chunk_size is not a positive integer.
+
+        See Also
+        --------
+        search : for the other exceptions raised.
+
+        """
+        arrow.import_pyarrow()
+        import pyarrow.parquet as pq
+
+        if chunk_size is not None and (
+                not isinstance(chunk_size, int) or chunk_size < 1):
+            raise ValueError("chunk_size should be a positive integer.")
+
+        query, return_fields = self._prepare_search(
+            location, query, sort_by, return_fields, max_features)
+
+        trees = self._search_iter(
+            location=location, query=query, sort_by=sort_by,
+            return_fields=return_fields, max_features=max_features,
+            validate=False)
+
+        schema, batches = self._iter_arrow_batches(
+            trees, return_fields, chunk_size)
+
+        rows = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def _iter_arrow_batches(self, trees, return_fields, chunk_size):
+        """Get the Arrow schema and record batches of the search results.
+
+        Parameters
+        ----------
+        trees : iterable of etree.Element
+            WFS responses containing the features.
+        return_fields : pydov.search.fields.ReturnFieldList
+            List of fields to be returned in the output data.
+        chunk_size : int or None
+            Number of features in each record batch, or None for one record
+            batch per WFS page.
+
+        Returns
+        -------
+        tuple
+            Tuple of the pyarrow.Schema of the output and a generator
+            yielding the pyarrow.RecordBatch of each chunk.
+
+        """
+        cols = self._get_columns(return_fields)
+        schema = arrow.get_schema(cols, self._fields)
+
+        return schema, self._iter_chunks(
+            trees, cols, return_fields, chunk_size,
+            lambda columns: arrow.batch_from_columns(columns, schema),
+            lambda rows: arrow.batch_from_rows(rows, schema))
+
+    def _iter_chunks(self, trees, cols, return_fields, chunk_size,
+                     from_columns, from_rows):
+        """Yield the search results in chunks.
+
+        Parameters
+        ----------
+        trees : iterable of etree.Element
+            WFS responses containing the features.
+        cols : list of str
+            Names of the columns of the output.
+        return_fields : pydov.search.fields.ReturnFieldList
+            List of fields to be returned in the output data.
+        chunk_size : int or None
+            Number of features in each chunk, or None to yield one chunk
+            per WFS page.
+        from_columns : function
+            Function to build a chunk from a dictionary mapping the column
+            names to the lists of their values.
+        from_rows : function
+            Function to build a chunk from a list of rows.
+
+        Yields
+        ------
+        object
+            The chunks, as built by `from_columns` or `from_rows`.
+
+        """
+        if self._type._supports_wfs_columns(return_fields):
+            yield from self._iter_wfs_columns(trees, cols, return_fields,
+                                              chunk_size, from_columns)
+            return
+
+        page_sizes = deque()
+
+        def get_features():
+            for tree in trees:
+                features = list(
+                    self._type.from_wfs(tree, self._wfs_namespace))
+                page_sizes.append(len(features))
+                yield from features
+
+        rows = []
+        features_in_chunk = 0
+        target = None
+
+        for feature_rows in self._type.iter_df_array(
+                get_features(), return_fields):
+            if target is None:
+                if chunk_size is not None:
+                    target = chunk_size
+                else:
+                    target = page_sizes.popleft()
+                    while target == 0:
+                        target = page_sizes.popleft()
+
+            rows.extend(feature_rows)
+            features_in_chunk += 1
+
+            if features_in_chunk == target:
+                yield from_rows(rows)
+                rows = []
+                features_in_chunk = 0
+                target = None
+
+        if features_in_chunk > 0:
+            yield from_rows(rows)
+
+    def _iter_wfs_columns(self, trees, cols, return_fields, chunk_size,
+                          from_columns):
+        """Yield the search results in chunks, built directly from the
+        columns of the WFS responses.
+
+        Parameters
+        ----------
+        trees : iterable of etree.Element
+            WFS responses containing the features.
+        cols : list of str
+            Names of the columns of the output dataframe.
+        return_fields : pydov.search.fields.ReturnFieldList
+            List of fields to be returned in the output data.
+        chunk_size : int or None
+            Number of features in each chunk, or None to yield one chunk
+            per WFS page.
+        from_columns : function
+            Function to build a chunk from a dictionary mapping the column
+            names to the lists of their values.
+
+        Yields
+        ------
+        object
+            The chunks, as built by `from_columns`.
+
+        """
+        columns = {c: [] for c in cols}
+        size = 0
 
-        feature_generators = []
         for tree in trees:
-            feature_generators.append(
-                self._type.from_wfs(tree, self._wfs_namespace))
+            page = self._type.from_wfs_columns(
+                tree, self._wfs_namespace, return_fields)
+            page_size = len(page[cols[0]])
+
+            if chunk_size is None:
+                if page_size > 0:
+                    yield from_columns(page)
+                continue
+
+            for c in cols:
+                columns[c].extend(page[c])
+            size += page_size
 
+            while size >= chunk_size:
+                yield from_columns(
+                    {c: columns[c][:chunk_size] for c in cols})
+                columns = {c: columns[c][chunk_size:] for c in cols}
+                size -= chunk_size
+
+        if size > 0:
+            yield from_columns(columns)
+
+    def _amend_search_parameters(self, query, return_fields):
+        """Amend the search query and return fields before searching.
+
+        Subclasses can override this to restrict the search or to change the
+        default return fields.
+
+        Parameters
+        ----------
+        query : owslib.fes2.OgcExpression or None
+            OGC filter expression to use for searching.
+        return_fields : list<str> or tuple<str> or set<str> or None
+            A list of fields to be returned in the output data.
+
+        Returns
+        -------
+        query : owslib.fes2.OgcExpression or None
+            The amended OGC filter expression.
+        return_fields : list<str> or tuple<str> or set<str> or None
+            The amended list of return fields.
+
+        """
+        return query, return_fields
+
+    def _prepare_search(self, location, query, sort_by, return_fields,
+                        max_features):
+        """Validate and amend the search parameters.
+
+        Parameters
+        ----------
+        location : pydov.util.location.AbstractLocationFilter
+            Location filter limiting the features to retrieve.
+        query : owslib.fes2.OgcExpression
+            OGC filter expression to use for searching.
+        sort_by : owslib.fes2.SortBy, optional
+            List of properties to sort by.
+        return_fields : list<str> or tuple<str> or set<str>
+            A list of fields to be returned in the output data.
+        max_features : int
+            Limit the maximum number of features to request.
+
+        Returns
+        -------
+        query : owslib.fes2.OgcExpression or None
+            The amended OGC filter expression.
+        return_fields : pydov.search.fields.ReturnFieldList or None
+            The amended list of return fields.
+
+        """
+        self._pre_search_validation(location, query, sort_by, return_fields,
+                                    max_features)
+
+        query, return_fields = self._amend_search_parameters(
+            query, return_fields)
+        return query, ReturnFieldList.from_field_names(return_fields)
+
+    def _get_columns(self, return_fields):
+        """Get the names of the columns of the output dataframe.
+
+        Parameters
+        ----------
+        return_fields : pydov.search.fields.ReturnFieldList or None
+            List of fields to be returned in the output data.
+
+        Returns
+        -------
+        list of str
+            Names of the columns of the output dataframe.
+
+        """
         cols = self._type.get_field_names(return_fields, include_geometry=True)
         if len(cols) == 0:
             cols = self._type.get_field_names(
                 return_fields, include_wfs_injected=True,
                 include_geometry=False)
+        return cols
+
+    def _get_typed_fields(self, cols):
+        """Get the metadata of the fields of the columns to convert to pandas
+        extension datatypes.
+
+        Fields with multiple values and columns without field metadata (like
+        geometry fields) are left as is.
+
+        Parameters
+        ----------
+        cols : list of str
+            Names of the columns of the output dataframe.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping the names of the columns to convert to the
+            metadata of their field.
+
+        """
+        self._init_fields()
+
+        fields = {}
+        for name in cols:
+            field = self._fields.get(name)
+            if field is not None and not field.get('multivalue', False):
+                fields[name] = field
+        return fields
 
-        df = pd.DataFrame(
-            data=self._type.to_df_array(
-                chain.from_iterable(feature_generators), return_fields),
-            columns=cols)
+    def _build_typed_dataframe(self, columns, cols, fields, chunked=False):
+        """Build the output dataframe from its columns, converting each
+        column to the pandas extension datatype of its field as it is added.
+
+        The values of each column are removed from `columns` once it is
+        converted, so only a single column is kept twice in memory.
+
+        Parameters
+        ----------
+        columns : dict
+            Dictionary mapping the column names to the lists or arrays of
+            their values.
+        cols : list of str
+            Names of the columns of the output dataframe.
+        fields : dict
+            Dictionary mapping the names of the columns to convert to the
+            metadata of their field, see `_get_typed_fields`.
+        chunked : bool, optional
+            Whether the dataframe is a chunk of the output, see
+            `_convert_dtype`. Defaults to False.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            Output dataframe with converted datatypes.
+
+        """
+        data = {}
+        for name in cols:
+            series = pd.Series(columns.pop(name), name=name).infer_objects()
+            if name in fields:
+                series = self._convert_column(series, fields[name], chunked)
+            data[name] = series
+
+        return pd.DataFrame(data, columns=cols)
+
+    def _convert_dtypes(self, df, fields, chunked=False):
+        """Convert the columns of the output dataframe to pandas extension
+        datatypes, based on the metadata of the fields.
+
+        The columns are converted one at a time, in place.
+
+        Parameters
+        ----------
+        df : pandas.core.frame.DataFrame
+            Output dataframe of a search.
+        fields : dict
+            Dictionary mapping the names of the columns to convert to the
+            metadata of their field, see `_get_typed_fields`.
+        chunked : bool, optional
+            Whether the dataframe is a chunk of the output, see
+            `_convert_dtype`. Defaults to False.
+
+        Returns
+        -------
+        pandas.core.frame.DataFrame
+            Output dataframe with converted datatypes.
+
+        """
+        for name, field in fields.items():
+            df[name] = self._convert_column(df[name], field, chunked)
         return df
+
+    def _convert_column(self, series, field, chunked=False):
+        """Convert a column of the output dataframe to the pandas extension
+        datatype of the given field, emitting a DataTypeWarning if it cannot
+        be converted.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            Column of the output dataframe.
+        field : dict
+            Metadata of the field of the column.
+        chunked : bool, optional
+            Whether the column is part of a chunk of the output, see
+            `_convert_dtype`. Defaults to False.
+
+        Returns
+        -------
+        pandas.Series
+            Converted column, or the column as is if it cannot be converted.
+
+        """
+        try:
+            return self._convert_dtype(series, field, chunked)
+        except (ValueError, TypeError) as e:
+            warnings.warn(
+                "Failed to convert column '{}' to the datatype of its field "
+                "({}), returning it as is: {}".format(
+                    series.name, field['type'], e), DataTypeWarning)
+            return series
+
+    @staticmethod
+    def _get_codelist_values(field):
+        """Get the values of the codelist of the given field, emitting a
+        CodelistFetchWarning if it cannot be resolved.
+
+        Parameters
+        ----------
+        field : dict
+            Metadata of the field.
+
+        Returns
+        -------
+        dict or None
+            A dictionary with the codes as keys and the labels as values, or
+            None if the field has no codelist or it cannot be resolved.
+
+        """
+        codelist = field.get('codelist')
+        if codelist is None:
+            return None
+
+        try:
+            return codelist.get_values()
+        except (DOVError, RequestException):
+            warnings.warn(
+                "Failed to resolve the codelist of field '{}', the "
+                "categories will be based on the values instead.".format(
+                    field['name']), CodelistFetchWarning)
+            return None
+
+    def _convert_dtype(self, series, field, chunked=False):
+        """Convert a column of the output dataframe to the pandas extension
+        datatype of the given field.
+
+        Integers are converted to `Int64`, booleans to `boolean` and dates
+        and datetimes to `datetime64`. Strings are converted to `category`
+        if the field has a codelist, in which case the codes of the codelist
+        are the categories, or if the number of distinct values is at most
+        half of the number of values. The latter depends on the values, so
+        it is not applied to chunks of the output.
+
+        Values that are not in the codelist are added to the categories, so
+        chunks of the output containing such values get other categories
+        than the remaining chunks.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            Column of the output dataframe.
+        field : dict
+            Metadata of the field of the column.
+        chunked : bool, optional
+            Whether the column is part of a chunk of the output. Defaults to
+            False.
+
+        Returns
+        -------
+        pandas.Series
+            Converted column.
+
+        Raises
+        ------
+        ValueError or TypeError
+            When the values cannot be converted.
+
+        """
+        if field['type'] == 'integer':
+            return series.astype('Int64')
+        elif field['type'] == 'boolean':
+            return series.astype('boolean')
+        elif field['type'] in ('date', 'datetime'):
+            try:
+                return pd.to_datetime(series)
+            except ValueError:
+                # mixed timezones
+                return pd.to_datetime(series, utc=True)
+        elif field['type'] == 'string':
+            values = series.dropna()
+            codes = self._get_codelist_values(field)
+
+            if codes:
+                categories = list(codes)
+                categories.extend(
+                    sorted(set(values.unique()).difference(categories)))
+            elif not chunked and len(values) > 0 and values.nunique() <= \
+                    len(values) * self._categorical_max_ratio:
+                categories = sorted(values.unique())
+            else:
+                return series
+
+            return series.astype(pd.CategoricalDtype(categories))
+        return series
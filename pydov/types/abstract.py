@@ -5,7 +5,11 @@ import inspect
 import sys
 import types
 import warnings
-from collections import OrderedDict
+from collections import ChainMap, OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import Future
+from hashlib import md5
+from itertools import chain
 
 import numpy as np
 from owslib.etree import etree
@@ -13,20 +17,124 @@ from owslib.etree import etree
 import pydov
 from pydov.search.fields import ReturnFieldList
 from pydov.types.fields import AbstractField
-from pydov.util import owsutil
-from pydov.util.dovutil import get_dov_xml, parse_dov_xml
+from pydov.util import net, owsutil, parsing
+from pydov.util.dovutil import get_dov_xml, get_dov_xml_async, parse_dov_xml
 from pydov.util.errors import RemoteFetchError, XmlFetchWarning
-from pydov.util.net import LocalSessionThreadPool
 from pydov.util.notebook import HtmlFormatter
 
 from ..util.errors import InvalidFieldError, XmlParseError, XmlParseWarning
 from ..util.hooks import HookRunner
 
 
+class DataRecord(MutableMapping):
+    """Compact mapping of the field names of a type to their values.
+
+    The values are kept in a list, in the order of a schema mapping the
+    field names to their index, which is shared by all records of the same
+    type. Names that are not part of the schema are kept in a separate
+    dictionary, created when needed.
+
+    """
+
+    __slots__ = ('_schema', '_values', '_extra')
+
+    _MISSING = object()
+
+    def __init__(self, schema, value=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        schema : dict<str, int>
+            Dictionary mapping the field names to their index.
+        value : object, optional
+            Initial value of all the fields of the schema. Defaults to None.
+
+        """
+        self._schema = schema
+        self._values = [value] * len(schema)
+        self._extra = None
+
+    def __getitem__(self, key):
+        index = self._schema.get(key)
+        if index is not None:
+            value = self._values[index]
+            if value is not self._MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        index = self._schema.get(key)
+        if index is not None:
+            self._values[index] = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        index = self._schema.get(key)
+        if index is not None and self._values[index] is not self._MISSING:
+            self._values[index] = self._MISSING
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key, index in self._schema.items():
+            if self._values[index] is not self._MISSING:
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        index = self._schema.get(key)
+        if index is not None:
+            return self._values[index] is not self._MISSING
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        index = self._schema.get(key)
+        if index is not None:
+            value = self._values[index]
+            return default if value is self._MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, dict(self))
+
+    def __reduce__(self):
+        return self.__class__._from_items, (self._schema, dict(self))
+
+    @classmethod
+    def _from_items(cls, schema, items):
+        record = cls(schema, cls._MISSING)
+        record.update(items)
+        return record
+
+    @classmethod
+    def _from_values(cls, schema, values):
+        record = cls.__new__(cls)
+        record._schema = schema
+        record._values = list(values)
+        record._extra = None
+        return record
+
+
 class AbstractFieldsObject(object):
     """Abstract base class for objects containing fields, e.g.
     AbstractDovFieldSet, AbstractDovType, AbstractDovSubType."""
 
+    __slots__ = ()
+
     @classmethod
     def get_fields(cls):
         """Return the metadata of the fields available for this fieldset.
@@ -132,6 +240,8 @@ class AbstractFieldsObject(object):
             extra_fields = extra_fields.fields
 
         class newType(cls):
+            __slots__ = ()
+
             fields = cls.extend_fields(extra_fields)
         return newType
 
@@ -197,6 +307,8 @@ class AbstractTypeCommon(AbstractFieldsObject):
 
     """
 
+    __slots__ = ()
+
     fields = []
 
     @classmethod
@@ -245,6 +357,225 @@ class AbstractTypeCommon(AbstractFieldsObject):
 
         return owsutil.typeconvert(text, returntype)
 
+    @classmethod
+    def _get_fields_spec(cls):
+        """Get a specification of the field definitions of this class and
+        its subtypes, to compare them between classes and processes.
+
+        Returns
+        -------
+        tuple
+            Nested tuple of the root path, the class, name, source, source
+            field, datatype and split function of each field, and the
+            specifications of the subtypes.
+
+        """
+        def get_name(obj):
+            if obj is None:
+                return None
+            return '{}.{}'.format(obj.__module__, obj.__qualname__)
+
+        return (getattr(cls, 'rootpath', None),
+                tuple((get_name(type(f)), f['name'], f['source'],
+                       f.get('sourcefield'), f.get('type'),
+                       get_name(f.get('split_fn'))) for f in cls.fields),
+                tuple(st._get_fields_spec() for st in cls.subtypes))
+
+    @classmethod
+    def _get_plan(cls, key, build_fn):
+        """Get the extraction plan of this class with the given key,
+        building it on first use.
+
+        Extraction plans contain everything needed to extract the values of
+        the fields from an XML element that does not depend on the element
+        itself: the compiled XPath expressions, the type converters and the
+        order of the columns. They are saved on the class itself and are not
+        inherited, new classes created with `with_extra_fields` or
+        `with_subtype` build their own plans. Plans are rebuilt when the
+        fields of the class are changed in place.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the plan to get.
+        build_fn : function
+            Function to build the plan, if it does not exist yet.
+
+        Returns
+        -------
+        dict
+            The extraction plan.
+
+        """
+        fingerprint = (id(cls.fields), len(cls.fields)) + tuple(
+            (id(st.fields), len(st.fields)) for st in cls.subtypes)
+
+        plans = cls.__dict__.get('_plans')
+        if plans is None or plans[0] != fingerprint:
+            plans = (fingerprint, {})
+            cls._plans = plans
+
+        plan = plans[1].get(key)
+        if plan is None:
+            plan = plans[1][key] = build_fn()
+        return plan
+
+    @staticmethod
+    def _compile_path(xpath, namespace=None):
+        """Compile the XML path of a field into an XPath expression.
+
+        Parameters
+        ----------
+        xpath : str
+            XML path of the element, relative to the element of the record.
+        namespace : str or None
+            Namespace to be added to each item in the `xpath`. None to use
+            the xpath as is.
+
+        Returns
+        -------
+        etree.XPath
+            Compiled XPath expression returning the matching elements.
+
+        """
+        if namespace is not None:
+            return etree.XPath(
+                './ns:' + '/ns:'.join(xpath.split('/')),
+                namespaces={'ns': namespace})
+        return etree.XPath('./' + xpath.lstrip('/'))
+
+    @staticmethod
+    def _get_converter(returntype, split_fn=None):
+        """Get the function to convert the text of a field to its datatype.
+
+        Parameters
+        ----------
+        returntype : str
+            Parse the text to this output datatype.
+        split_fn : optional, function
+            Function to split values from this field into a list of values.
+
+        Returns
+        -------
+        function
+            Function converting the text of a field, or the element for
+            geometry fields, to its datatype. None is converted to NaN.
+
+        """
+        typeconvert = owsutil.get_typeconverter(returntype)
+
+        if split_fn is None:
+            def convert(text):
+                if text is None:
+                    return np.nan
+                return typeconvert(text)
+        else:
+            def convert(text):
+                if text is None:
+                    return np.nan
+                return tuple(typeconvert(item) for item in split_fn(text))
+
+        return convert
+
+    @classmethod
+    def _convert_column(cls, texts, returntype, split_fn=None):
+        """Convert the texts of a field of multiple records to its datatype.
+
+        Parameters
+        ----------
+        texts : list of str
+            Texts of the field, None for missing values.
+        returntype : str
+            Parse the texts to this output datatype.
+        split_fn : optional, function
+            Function to split values from this field into a list of values.
+
+        Returns
+        -------
+        list
+            List of the converted values.
+
+        """
+        if split_fn is None:
+            return owsutil.typeconvert_column(texts, returntype)
+
+        convert = cls._get_converter(returntype, split_fn)
+        return [convert(text) for text in texts]
+
+    @staticmethod
+    def _to_array(values, returntype):
+        """Convert a list of values of a field to a NumPy array.
+
+        Parameters
+        ----------
+        values : list
+            Converted values of the field.
+        returntype : str
+            Datatype of the field.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of float64 for fields of type `float`, or an array of
+            objects otherwise.
+
+        """
+        if returntype == 'float':
+            return np.array(values, dtype=float)
+        return np.fromiter(values, dtype=object, count=len(values))
+
+    @staticmethod
+    def _concat_columns(parts, names):
+        """Concatenate the columns of multiple parts.
+
+        Parameters
+        ----------
+        parts : list of tuple
+            List of tuples (count, columns) with the number of rows and the
+            dictionary mapping the names to the arrays of each part.
+        names : list of str
+            Names of the columns to concatenate.
+
+        Returns
+        -------
+        tuple
+            Tuple (count, columns) of the concatenated parts.
+
+        """
+        if len(parts) == 1:
+            return parts[0]
+        elif len(parts) == 0:
+            return 0, {name: np.empty(0, dtype=object) for name in names}
+
+        return sum(count for count, columns in parts), {
+            name: np.concatenate([columns[name] for count, columns in parts])
+            for name in names}
+
+    @staticmethod
+    def _extract(entries, element, data):
+        """Extract the values of the fields of an extraction plan from the
+        given element and save them in the data dictionary.
+
+        Parameters
+        ----------
+        entries : list of tuple
+            List of tuples (name, xpath, convert, geometry) of the fields to
+            extract.
+        element : etree.Element
+            XML element to extract the values from.
+        data : dict
+            Dictionary to save the extracted values in.
+
+        """
+        for name, xpath, convert, geometry in entries:
+            result = xpath(element)
+            if not result:
+                data[name] = np.nan
+            elif geometry:
+                data[name] = convert(result[0])
+            else:
+                data[name] = convert(result[0].text or '')
+
     @classmethod
     def _filter_classes_intended_for(cls, c):
         try:
@@ -349,6 +680,8 @@ class AbstractDovSubType(AbstractTypeCommon):
 
     """
 
+    __slots__ = ('data', 'subdata')
+
     rootpath = None
 
     subtypes = []
@@ -371,15 +704,9 @@ class AbstractDovSubType(AbstractTypeCommon):
                     "pydov.types.fields.AbstractField, found {}.".format(
                         self.__class__.__name__, str(type(f))))
 
-        self.data = dict(
-            zip(self.get_field_names(),
-                [AbstractDovSubType._UNRESOLVED] * len(self.get_field_names()))
-        )
-
-        self.subdata = dict(
-            zip([st.get_name() for st in self.subtypes],
-                [] * len(self.subtypes))
-        )
+        self.data = DataRecord(self._get_xml_plan()['schema'],
+                               AbstractDovSubType._UNRESOLVED)
+        self.subdata = {}
 
     @classmethod
     def from_xml(cls, xml_data):
@@ -399,14 +726,56 @@ class AbstractDovSubType(AbstractTypeCommon):
         """
         try:
             tree = parse_dov_xml(xml_data)
-            for element in tree.xpath(cls.rootpath):
-                yield cls.from_xml_element(element)
         except XmlParseError:
             # Ignore XmlParseError here in subtypes, assuming it will be
             # reported in the corresponding main type. We can make this
             # assumption safely because both main and subtypes are in a
             # single XML file.
-            pass
+            return
+
+        yield from cls.from_xml_tree(tree)
+
+    @classmethod
+    def from_xml_tree(cls, tree):
+        """Build instances of this subtype from a parsed XML document or
+        element.
+
+        Parameters
+        ----------
+        tree : etree.Element
+            Parsed XML document of the DOV object, or the element of a parent
+            subtype, that contains information about this subtype.
+
+        Yields
+        ------
+            An instance of this type for each occurrence of the rootpath in
+            the XML tree.
+
+        """
+        elements = tree.xpath(cls.rootpath)
+        plan = cls._get_xml_plan()
+
+        # convert the values of each field for all elements at once
+        columns = []
+        for name, xpath, returntype, split_fn in plan['xml_columns']:
+            texts = []
+            for element in elements:
+                result = xpath(element)
+                texts.append((result[0].text or '') if result else None)
+            columns.append((name, cls._convert_column(
+                texts, returntype, split_fn)))
+
+        for i, element in enumerate(elements):
+            instance = cls()
+            for name, values in columns:
+                instance.data[name] = values[i]
+
+            for field in plan['custom_xml']:
+                instance.data[field['name']] = field.calculate(
+                    cls, element) or np.nan
+
+            instance._parse_subtypes(element)
+            yield instance
 
     @classmethod
     def from_xml_element(cls, element):
@@ -424,23 +793,187 @@ class AbstractDovSubType(AbstractTypeCommon):
 
         """
         instance = cls()
+        plan = cls._get_xml_plan()
 
-        for field in cls.get_fields().values():
-            if field['source'] == 'xml':
-                instance.data[field['name']] = instance._parse(
-                    func=element.findtext,
-                    xpath=field['sourcefield'],
-                    namespace=None,
-                    returntype=field.get('type', None),
-                    split_fn=field.get('split_fn', None)
-                )
-            elif field['source'] == 'custom_xml':
-                instance.data[field['name']] = field.calculate(
-                    cls, element) or np.nan
+        cls._extract(plan['xml'], element, instance.data)
+        for field in plan['custom_xml']:
+            instance.data[field['name']] = field.calculate(
+                cls, element) or np.nan
+
+        instance._parse_subtypes(element)
+        return instance
+
+    @classmethod
+    def from_xml_columns(cls, tree):
+        """Build the columns of this subtype from a parsed XML document or
+        element, without building an instance for each occurrence.
+
+        The values of numeric fields are returned as float64 arrays.
+        Subtypes of this subtype are included by repeating the values of
+        this subtype for each of their occurrences, like the rows of
+        `get_data_dicts`. Only supported if `_supports_xml_columns`.
+
+        Parameters
+        ----------
+        tree : etree.Element
+            Parsed XML document of the DOV object, or the element of a parent
+            subtype, that contains information about this subtype.
 
-        instance._parse_subtypes(etree.tostring(element))
+        Returns
+        -------
+        tuple
+            Tuple of the number of rows and the dictionary mapping the field
+            names of this subtype (and its subtypes) to the arrays of their
+            values.
+
+        """
+        elements = tree.xpath(cls.rootpath)
+        plan = cls._get_xml_plan()
+
+        values = {}
+        for name, xpath, returntype, split_fn in plan['xml_columns']:
+            texts = []
+            for element in elements:
+                result = xpath(element)
+                texts.append((result[0].text or '') if result else None)
+            values[name] = cls._convert_column(texts, returntype, split_fn)
+
+        for field in plan['custom_xml']:
+            values[field['name']] = [field.calculate(cls, element) or np.nan
+                                     for element in elements]
+
+        columns = {name: cls._to_array(values[name], plan['types'][name])
+                   for name in plan['names']}
+
+        if len(cls.subtypes) == 0:
+            return len(elements), columns
+
+        names = cls.get_field_names()
+        parts = []
+        for i, element in enumerate(elements):
+            count, subcolumns = cls.subtypes[0].from_xml_columns(element)
+            if count == 0:
+                count, subcolumns = 1, {}
+            parts.append((count, {
+                name: subcolumns[name] if name in subcolumns
+                else np.repeat(columns[name][i:i + 1], count)
+                if name in columns else np.full(count, np.nan)
+                for name in names}))
+
+        return cls._concat_columns(parts, names)
+
+    @classmethod
+    def _from_values(cls, values):
+        """Build an instance of this subtype from the values of its fields,
+        without subtypes.
+
+        Parameters
+        ----------
+        values : sequence
+            Values of the fields of this subtype and its subtypes, in the
+            order of `get_field_names`.
+
+        Returns
+        -------
+        instance of this class
+            An instance of this class with the given values.
+
+        """
+        instance = cls.__new__(cls)
+        instance.data = DataRecord._from_values(
+            cls._get_xml_plan()['schema'], values)
+        instance.subdata = {}
         return instance
 
+    @classmethod
+    def _columns_from_values(cls, count, values):
+        """Build the columns of this subtype from the values of its fields,
+        like `from_xml_columns`.
+
+        Parameters
+        ----------
+        count : int
+            Number of rows.
+        values : list of tuple
+            Values of the fields of this subtype and its subtypes, per
+            field in the order of `get_field_names`.
+
+        Returns
+        -------
+        tuple
+            Tuple of the number of rows and the dictionary mapping the field
+            names to the arrays of their values.
+
+        """
+        names = cls.get_field_names()
+        if count == 0:
+            return cls._concat_columns([], names)
+
+        types = {}
+        subtype = cls
+        while subtype is not None:
+            types.update(subtype._get_xml_plan()['types'])
+            subtype = subtype.subtypes[0] if subtype.subtypes else None
+
+        return count, {
+            name: cls._to_array(
+                [np.nan if v == cls._UNRESOLVED else v for v in column],
+                types.get(name))
+            for name, column in zip(names, values)}
+
+    @classmethod
+    def _supports_xml_columns(cls):
+        """Check whether the columns of this subtype can be built with
+        `from_xml_columns`.
+
+        Returns
+        -------
+        bool
+            True if this subtype, and each of its subtypes, has at most one
+            subtype.
+
+        """
+        return len(cls.subtypes) == 0 or (
+            len(cls.subtypes) == 1 and
+            cls.subtypes[0]._supports_xml_columns())
+
+    @classmethod
+    def _get_xml_plan(cls):
+        """Get the extraction plan of the fields of this subtype.
+
+        Returns
+        -------
+        dict
+            Dictionary with the names (`names`), the index of each name in
+            the data records (`schema`) and datatypes (`types`) of the
+            fields, the fields to extract from a single XML element (`xml`) or
+            from multiple elements at once (`xml_columns`) and the custom
+            fields to calculate (`custom_xml`).
+
+        """
+        def build():
+            fields = cls.get_fields().values()
+            xml_fields = [(f, cls._compile_path(f['sourcefield']))
+                          for f in fields if f['source'] == 'xml']
+            names = cls.get_field_names()
+            return {
+                'names': names,
+                'schema': {name: i for i, name in enumerate(names)},
+                'types': {f['name']: f['type'] for f in fields},
+                'xml': [(f['name'], xpath,
+                         cls._get_converter(f.get('type', None),
+                                            f.get('split_fn', None)),
+                         False)
+                        for f, xpath in xml_fields],
+                'xml_columns': [(f['name'], xpath, f.get('type', None),
+                                 f.get('split_fn', None))
+                                for f, xpath in xml_fields],
+                'custom_xml': [f for f in fields
+                               if f['source'] == 'custom_xml']
+            }
+
+        return cls._get_plan('xml', build)
+
     @classmethod
     def get_field_names(cls):
         """Return the names of the fields available for this subtype.
@@ -485,13 +1018,14 @@ class AbstractDovSubType(AbstractTypeCommon):
         """
         return cls.__name__
 
-    def _parse_subtypes(self, xml):
-        """Parse the subtypes with the given XML data.
+    def _parse_subtypes(self, tree):
+        """Parse the subtypes with the given XML tree.
 
         Parameters
         ----------
-        xml : bytes
-            The raw XML data of the DOV object as bytes.
+        tree : etree.Element
+            The parsed XML document of the DOV object, or the element of this
+            subtype.
 
         """
         for subtype in self.subtypes:
@@ -499,16 +1033,19 @@ class AbstractDovSubType(AbstractTypeCommon):
             if st_name not in self.subdata:
                 self.subdata[st_name] = []
 
-            for subitem in subtype.from_xml(xml):
-                self.subdata[st_name].append(subitem)
+            self.subdata[st_name].extend(subtype.from_xml_tree(tree))
 
     def get_data_dicts(self):
         """Return the data dictionaries for this instance, including subtypes,
         for inclusion in the output dataframe.
 
+        The data of the occurrences of the subtypes is combined with the
+        data of this instance in a `collections.ChainMap`, referencing the
+        values of this instance instead of copying them.
+
         Returns
         -------
-        list(dict)
+        list(collections.abc.Mapping)
             list of data dictionaries for inclusion in the output dataframe
         """
         datadicts = []
@@ -522,10 +1059,8 @@ class AbstractDovSubType(AbstractTypeCommon):
                 else:
                     for subdata in self.subdata[subtype]:
                         for subdata_dict in subdata.get_data_dicts():
-                            datadict = {}
-                            datadict.update(self.data)
-                            datadict.update(subdata_dict)
-                            datadicts.append(datadict)
+                            datadicts.append(
+                                ChainMap(subdata_dict, self.data))
 
         return datadicts
 
@@ -541,6 +1076,9 @@ class AbstractDovType(AbstractTypeCommon):
 
     """
 
+    __slots__ = ('typename', 'pkey', 'data', 'subdata', '_xml_data',
+                 '_parsed_data', '_subcolumns')
+
     _UNRESOLVED = "{UNRESOLVED}"
 
     subtypes = []
@@ -572,6 +1110,9 @@ class AbstractDovType(AbstractTypeCommon):
 
         self.typename = typename
         self.pkey = pkey
+        self._xml_data = None
+        self._parsed_data = None
+        self._subcolumns = None
 
         for f in self.fields:
             if not isinstance(f, AbstractField):
@@ -580,19 +1121,13 @@ class AbstractDovType(AbstractTypeCommon):
                     "pydov.types.fields.AbstractField, found {}.".format(
                         self.__class__.__name__, str(type(f))))
 
-        self.data = dict(
-            zip(self.get_field_names(include_subtypes=False),
-                [AbstractDovType._UNRESOLVED] * len(self.get_field_names()))
-        )
-
-        self.subdata = dict(
-            zip([st.get_name() for st in self.subtypes],
-                [] * len(self.subtypes))
-        )
+        self.data = DataRecord(self._get_xml_plan()['schema'],
+                               AbstractDovType._UNRESOLVED)
+        self.subdata = {}
 
         self.data['pkey_{}'.format(self.typename)] = self.pkey
 
-    def _parse_xml_data(self, session=None):
+    def _parse_xml_data(self, session=None, subtype_columns=False):
         """Get remote XML data for this DOV object, parse the raw XML and
         save the results in the data object.
 
@@ -601,6 +1136,10 @@ class AbstractDovType(AbstractTypeCommon):
         session : requests.Session
             Session to use to perform HTTP requests for data. Defaults to None,
             which means a new session will be created for each request.
+        subtype_columns : bool, optional
+            Whether to save the columns of the subtype (see
+            `AbstractDovSubType.from_xml_columns`) instead of its instances.
+            Defaults to False.
 
         Returns
         -------
@@ -608,6 +1147,18 @@ class AbstractDovType(AbstractTypeCommon):
             Whether or not the XML data could be fetched and parsed.
 
         """
+        parsed_cache = self._get_parsed_cache()
+        if parsed_cache is not None:
+            values, self._parsed_data = self._parsed_data, None
+            if values is None:
+                values = parsed_cache.get(self._get_parsed_fingerprint(),
+                                          self.pkey)
+            if values is not None:
+                self._xml_data = None
+                HookRunner.execute_parsed_cache_hit(self.pkey)
+                self._set_parsed_data(values, subtype_columns)
+                return True
+
         try:
             xml = self._get_xml_data(session)
         except RemoteFetchError:
@@ -619,22 +1170,24 @@ class AbstractDovType(AbstractTypeCommon):
         try:
             tree = parse_dov_xml(xml)
 
-            for field in self.get_fields(source=('xml',),
-                                         include_subtypes=False).values():
-                self.data[field['name']] = self._parse(
-                    func=tree.findtext,
-                    xpath=field['sourcefield'],
-                    namespace=None,
-                    returntype=field.get('type', None),
-                    split_fn=field.get('split_fn', None)
-                )
-
-            for field in self.get_fields(source=('custom_xml',),
-                                         include_subtypes=False).values():
+            plan = self._get_xml_plan()
+
+            self._extract(plan['xml'], tree, self.data)
+            for field in plan['custom_xml']:
                 self.data[field['name']] = field.calculate(
                     self.__class__, tree) or np.nan
 
-            self._parse_subtypes(xml)
+            if parsed_cache is not None:
+                # parse the instances of the subtypes to save their values,
+                # regardless of the output
+                values = self._get_parsed_data(tree)
+                parsed_cache.save(self._get_parsed_fingerprint(),
+                                  self.pkey, values)
+                self._set_parsed_data(values, subtype_columns)
+            elif subtype_columns:
+                self._subcolumns = self.subtypes[0].from_xml_columns(tree)
+            else:
+                self._parse_subtypes(tree)
             return True
         except XmlParseError:
             warnings.warn(
@@ -643,6 +1196,116 @@ class AbstractDovType(AbstractTypeCommon):
                 XmlParseWarning)
             return False
 
+    @staticmethod
+    def _get_parsed_cache():
+        """Get the cache of the values parsed from the XML documents to use.
+
+        Returns
+        -------
+        pydov.util.caching.ParsedDataCache or None
+            The cache, or None if it is disabled or if any of the registered
+            hooks needs the XML documents.
+
+        """
+        if pydov.parsed_cache is None or pydov.hooks.has_xml_hooks():
+            return None
+        return pydov.parsed_cache
+
+    @classmethod
+    def _get_parsed_fingerprint(cls):
+        """Get the fingerprint of the field definitions of this type and its
+        subtypes, to key the values in the parsed data cache.
+
+        Returns
+        -------
+        str
+            Fingerprint of the field definitions.
+
+        """
+        return cls._get_plan('parsed', lambda: md5(
+            repr(cls._get_fields_spec()).encode('utf8')).hexdigest())
+
+    def _load_parsed_data(self):
+        """Get the values parsed from the XML document of this instance from
+        the parsed data cache, and keep them to be used when parsing the
+        instance.
+
+        Returns
+        -------
+        bool
+            True if the parsed values are available, False otherwise.
+
+        """
+        parsed_cache = self._get_parsed_cache()
+        if parsed_cache is not None:
+            self._parsed_data = parsed_cache.get(
+                self._get_parsed_fingerprint(), self.pkey)
+        return self._parsed_data is not None
+
+    def _get_parsed_data(self, tree):
+        """Parse the subtypes of this instance and get all the values
+        parsed from the XML document, to save in the parsed data cache.
+
+        Parameters
+        ----------
+        tree : etree.Element
+            The parsed XML document of the DOV object. The fields of this
+            type should already be extracted.
+
+        Returns
+        -------
+        tuple
+            Tuple of the values of the XML fields of this type and the
+            dictionary mapping the names of the subtypes to the number of
+            rows and the columns of their values.
+
+        """
+        plan = self._get_xml_plan()
+        values = tuple(self.data.get(f[0]) for f in plan['xml']) + tuple(
+            self.data.get(f['name']) for f in plan['custom_xml'])
+
+        subvalues = {}
+        for subtype in self.subtypes:
+            names = subtype.get_field_names()
+            rows = [tuple(d.get(name, subtype._UNRESOLVED) for name in names)
+                    for instance in subtype.from_xml_tree(tree)
+                    for d in instance.get_data_dicts()]
+            subvalues[subtype.get_name()] = (len(rows), list(zip(*rows)))
+
+        return values, subvalues
+
+    def _set_parsed_data(self, parsed, subtype_columns=False):
+        """Set the values parsed from the XML document of this instance.
+
+        Parameters
+        ----------
+        parsed : tuple
+            The parsed values, see `_get_parsed_data`.
+        subtype_columns : bool, optional
+            Whether to save the columns of the subtype (see
+            `AbstractDovSubType.from_xml_columns`) instead of its instances.
+            Defaults to False.
+
+        """
+        values, subvalues = parsed
+        plan = self._get_xml_plan()
+
+        names = [f[0] for f in plan['xml']] + [
+            f['name'] for f in plan['custom_xml']]
+        for name, value in zip(names, values):
+            self.data[name] = value
+
+        if subtype_columns:
+            subtype = self.subtypes[0]
+            self._subcolumns = subtype._columns_from_values(
+                *subvalues[subtype.get_name()])
+            return
+
+        for subtype in self.subtypes:
+            count, columns = subvalues[subtype.get_name()]
+            self.subdata.setdefault(subtype.get_name(), []).extend(
+                subtype._from_values(row) for row in zip(*columns))
+
     @classmethod
     def get_subtypes(cls):
         """List all available subtypes to use with this type.
@@ -702,6 +1365,8 @@ class AbstractDovType(AbstractTypeCommon):
                              "is it a subclass of AbstractDovSubType?")
 
         class newType(cls):
+            __slots__ = ()
+
             subtypes = [subtype]
 
         return newType
@@ -724,65 +1389,124 @@ class AbstractDovType(AbstractTypeCommon):
             element.
 
         """
-        if cls.pkey_fieldname is not None:
-            pkey = feature.findtext(
-                './{{{}}}{}'.format(namespace, cls.pkey_fieldname))
+        plan = cls._get_wfs_plan(namespace)
+
+        if plan['pkey'] is not None:
+            pkey = plan['pkey'](feature)
+            pkey = (pkey[0].text or '') if pkey else None
         else:
             pkey = feature.get('{http://www.opengis.net/gml/3.2}id')
 
         instance = cls(pkey)
 
-        for field in cls.get_fields(source=('wfs',)).values():
-            if owsutil.has_geom_support() and field['type'] == 'geometry':
-                instance.data[field['name']] = cls._parse(
-                    func=feature.find,
-                    xpath=field['sourcefield'],
-                    namespace=namespace,
-                    returntype='geometry'
-                )
-            else:
-                instance.data[field['name']] = cls._parse(
-                    func=feature.findtext,
-                    xpath=field['sourcefield'],
-                    namespace=namespace,
-                    returntype=field.get('type', str),
-                    split_fn=field.get('split_fn', None)
-                )
-
-        for field in cls.get_fields(source=('custom_wfs',)).values():
-            for required_field in field.requires_wfs_fields():
-                instance.data[required_field] = cls._parse(
-                    func=feature.findtext,
-                    xpath=required_field,
-                    namespace=namespace,
-                    returntype=field.get('type', str),
-                    split_fn=field.get('split_fn', None)
-                )
-
-        for field in cls.get_fields(source=('custom_wfs',)).values():
+        cls._extract(plan['wfs'], feature, instance.data)
+        for field in plan['custom_wfs']:
             instance.data[field['name']] = field.calculate(instance) or np.nan
 
         return instance
 
     @classmethod
-    def from_wfs(cls, response, namespace):
-        """Build instances of this type from a WFS response.
+    def _get_wfs_plan(cls, namespace):
+        """Get the extraction plan of the fields of this type from a WFS
+        feature.
 
         Parameters
         ----------
-        response : str or bytes or etree.Element or iterable<etree.Element>
-            WFS response containing GML features.
+        namespace : str
+            Namespace associated with this WFS featuretype.
 
-            Can either be a GML `str` or `byte` sequence, in which case it
-            will be parsed and scanned for `wfs20:member`.
+        Returns
+        -------
+        dict
+            Dictionary with the XPath expression of the permanent key
+            (`pkey`), the fields to extract from the WFS feature (`wfs`),
+            including the fields required by the custom fields, and the
+            custom fields to calculate (`custom_wfs`).
 
-            Can also be a single instance of `etree.Element` containing the
-            parsed GML response.
+        """
+        def build():
+            entries = []
+            for field in cls.get_fields(source=('wfs',)).values():
+                geometry = owsutil.has_geom_support() and \
+                    field['type'] == 'geometry'
+                entries.append((
+                    field['name'],
+                    cls._compile_path(field['sourcefield'], namespace),
+                    cls._get_converter(
+                        'geometry' if geometry else field.get('type', str),
+                        None if geometry else field.get('split_fn', None)),
+                    geometry))
+
+            custom_fields = list(
+                cls.get_fields(source=('custom_wfs',)).values())
+            for field in custom_fields:
+                for required_field in field.requires_wfs_fields():
+                    entries.append((
+                        required_field,
+                        cls._compile_path(required_field, namespace),
+                        cls._get_converter(field.get('type', str),
+                                           field.get('split_fn', None)),
+                        False))
+
+            return {
+                'pkey': None if cls.pkey_fieldname is None else
+                cls._compile_path(cls.pkey_fieldname, namespace),
+                'wfs': entries,
+                'custom_wfs': custom_fields
+            }
+
+        return cls._get_plan(('wfs', namespace), build)
 
-            It can also be an iterable (list, tuple or generator) of
-            `etree.Element` in which case it will be looped over.
-        namespace : str
-             Namespace associated with this WFS featuretype.
+    @classmethod
+    def _get_xml_plan(cls):
+        """Get the extraction plan of the fields of this type from the DOV
+        XML document, excluding the fields of its subtypes.
+
+        Returns
+        -------
+        dict
+            Dictionary with the names of the fields (`names`), the index of
+            each name in the data records (`schema`), the fields to extract
+            from the XML document (`xml`) and the custom fields to calculate
+            (`custom_xml`).
+
+        """
+        def build():
+            names = cls.get_field_names(include_subtypes=False)
+            return {
+                'names': names,
+                'schema': {name: i for i, name in enumerate(names)},
+                'xml': [(f['name'], cls._compile_path(f['sourcefield']),
+                         cls._get_converter(f.get('type', None),
+                                            f.get('split_fn', None)),
+                         False)
+                        for f in cls.get_fields(
+                            source=('xml',), include_subtypes=False).values()],
+                'custom_xml': list(cls.get_fields(
+                    source=('custom_xml',), include_subtypes=False).values())
+            }
+
+        return cls._get_plan('xml', build)
+
+    @classmethod
+    def from_wfs(cls, response, namespace):
+        """Build instances of this type from a WFS response.
+
+        Parameters
+        ----------
+        response : str or bytes or etree.Element or iterable<etree.Element>
+            WFS response containing GML features.
+
+            Can either be a GML `str` or `byte` sequence, in which case it
+            will be parsed and scanned for `wfs20:member`.
+
+            Can also be a single instance of `etree.Element` containing the
+            parsed GML response.
+
+            It can also be an iterable (list, tuple or generator) of
+            `etree.Element` in which case it will be looped over.
+        namespace : str
+             Namespace associated with this WFS featuretype.
 
         Yields
         ------
@@ -810,6 +1534,168 @@ class AbstractDovType(AbstractTypeCommon):
             for el in response:
                 yield (cls.from_wfs_element(el, namespace))
 
+    @classmethod
+    def _supports_wfs_columns(cls, return_fields=None):
+        """Check whether the output dataframe can be built directly from the
+        WFS response using `from_wfs_columns`.
+
+        This is the case when none of the return fields are resolved from the
+        XML document and the type has no custom WFS fields.
+
+        Parameters
+        ----------
+        return_fields : ReturnFieldList
+            List of fields to include in the output dataframe. Defaults to
+            None, which will include all fields.
+
+        Returns
+        -------
+        bool
+            True if the output dataframe can be built directly from the WFS
+            response, False otherwise.
+
+        """
+        return len(cls._get_df_field_names(return_fields)) > 0 \
+            and not cls._requires_xml(return_fields) \
+            and len(cls.get_fields(source=('custom_wfs',))) == 0
+
+    @classmethod
+    def _get_df_field_names(cls, return_fields=None):
+        """Get the names of the fields included in the output dataframe.
+
+        Parameters
+        ----------
+        return_fields : ReturnFieldList
+            List of fields to include in the output dataframe. Defaults to
+            None, which will include all fields.
+
+        Returns
+        -------
+        list<str>
+            Names of the fields in the output dataframe.
+
+        """
+        fields = cls.get_field_names(return_fields, include_geometry=True)
+        if len(fields) == 0:
+            fields = cls.get_field_names(
+                return_fields, include_wfs_injected=True,
+                include_geometry=False)
+        return fields
+
+    @classmethod
+    def from_wfs_columns(cls, response, namespace, return_fields=None):
+        """Build the columns of the output dataframe directly from a WFS
+        response, without building an instance for each feature.
+
+        The GML features are walked once, collecting the values of each
+        field in a separate column. Only the fields available in the WFS
+        response are resolved, other fields are returned as NaN.
+
+        Parameters
+        ----------
+        response : str or bytes or etree.Element
+            WFS response containing GML features, either as a GML `str` or
+            `byte` sequence or as the parsed `etree.Element`.
+        namespace : str
+            Namespace associated with this WFS featuretype.
+        return_fields : ReturnFieldList
+            List of fields to include in the output dataframe. Defaults to
+            None, which will include all fields.
+
+        Returns
+        -------
+        dict<str, list>
+            Dictionary mapping the field (column) names to the list of values
+            of all features, in the order of the fields of the datatype.
+
+        Raises
+        ------
+        ValueError
+            When a feature has no permanent key.
+
+        """
+        if isinstance(response, str):
+            response = response.encode('utf-8')
+
+        if isinstance(response, bytes):
+            response = etree.fromstring(response)
+
+        ns = '{{{}}}'.format(namespace)
+        fields = cls._get_df_field_names(return_fields)
+        wfs_fields = cls.get_fields(source=('wfs',))
+
+        # map the tag of the child elements of a feature to the indices of
+        # the columns they are saved in, nested fields use an XML path
+        child_columns = {}
+        nested_columns = []
+        geometry_columns = set()
+        for i, name in enumerate(fields):
+            if name not in wfs_fields:
+                continue
+
+            field = wfs_fields[name]
+            if owsutil.has_geom_support() and field['type'] == 'geometry':
+                geometry_columns.add(i)
+
+            path = field['sourcefield'].split('/')
+            if len(path) == 1:
+                child_columns.setdefault(ns + path[0], []).append(i)
+            else:
+                nested_columns.append((i, './' + ns + ('/' + ns).join(path)))
+
+        if cls.pkey_fieldname is not None:
+            pkey_path = './' + ns + cls.pkey_fieldname
+        else:
+            pkey_path = None
+
+        values = [[] for f in fields]
+        count = 0
+
+        for member in response.iterfind(
+                './/{http://www.opengis.net/wfs/2.0}member'):
+            feature = member[0]
+
+            if pkey_path is not None:
+                pkey = feature.findtext(pkey_path)
+            else:
+                pkey = feature.get('{http://www.opengis.net/gml/3.2}id')
+
+            if pkey is None:
+                # raises the same ValueError as building an instance
+                cls(pkey)
+
+            for child in feature:
+                for i in child_columns.get(child.tag, ()):
+                    if len(values[i]) == count:
+                        values[i].append(child if i in geometry_columns
+                                         else child.text or '')
+
+            for i, path in nested_columns:
+                values[i].append(feature.find(path) if i in geometry_columns
+                                 else feature.findtext(path))
+
+            count += 1
+            for column in values:
+                if len(column) < count:
+                    column.append(None)
+
+        columns = {}
+        for i, name in enumerate(fields):
+            if name not in wfs_fields:
+                columns[name] = [np.nan] * count
+                continue
+
+            field = wfs_fields[name]
+            if i in geometry_columns:
+                columns[name] = owsutil.typeconvert_column(
+                    values[i], 'geometry')
+            else:
+                columns[name] = cls._convert_column(
+                    values[i], field.get('type', str),
+                    field.get('split_fn', None))
+
+        return columns
+
     @classmethod
     def get_field_names(cls, return_fields=None, include_subtypes=True,
                         include_wfs_injected=False, include_geometry=False):
@@ -970,7 +1856,8 @@ class AbstractDovType(AbstractTypeCommon):
         """Returns a dataframe array with one or more arrays (rows) for each
         instance in the given iterable.
 
-        Uses parallel processing to speed up IO operations.
+        Uses parallel processing to speed up IO operations, see
+        `iter_df_array`.
 
         Parameters
         ----------
@@ -990,26 +1877,498 @@ class AbstractDovType(AbstractTypeCommon):
             resulting Pandas dataframe of a search operation.
 
         """
-        def unnest_result(result, df_result):
-            """Unnest the result into multiple rows (lists) if necessary. Rows
-            are appended to the df_result list."""
-            if result is not None and len(result) > 0:
-                if isinstance(result[0], list):
-                    for r in result:
-                        df_result.append(r)
-                else:
-                    df_result.append(result)
+        return list(chain.from_iterable(
+            cls.iter_df_array(iterable, return_fields)))
 
-        pool = LocalSessionThreadPool()
+    @classmethod
+    def iter_df_array(cls, iterable, return_fields=None):
+        """Yields the dataframe rows of each instance in the given iterable,
+        as soon as they are available.
+
+        Instances are consumed from the iterable while the data of earlier
+        instances is being retrieved, keeping a bounded number of instances
+        in progress. This allows the iterable to be a lazy generator, for
+        example one that is still retrieving WFS pages.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array. The order is
+            ignored, the default order of the fields of the datatype is used
+            instead. Defaults to None, which will include all fields.
+
+        Yields
+        ------
+        list of list
+            The rows (lists) of one instance of the iterable, in the same
+            order as the iterable. The list is empty if the data of the
+            instance could not be retrieved.
+
+        Raises
+        ------
+        ValueError
+            When `pydov.engine` is not one of 'threads' or 'async'.
+
+        """
+        if pydov.engine not in ('async', 'threads'):
+            raise ValueError(
+                "Unknown engine '{}', should be one of 'threads' or "
+                "'async'.".format(pydov.engine))
+
+        if pydov.parse_processes and cls._requires_xml(return_fields) \
+                and cls._get_process_spec() is not None:
+            return cls._iter_df_array_processes(iterable, return_fields)
+        elif pydov.engine == 'async':
+            return cls._iter_df_array_async(iterable, return_fields)
+        else:
+            return cls._iter_df_array_threads(iterable, return_fields)
+
+    @staticmethod
+    def _unnest_df_array(result):
+        """Unnest the result of get_df_array into a list of rows.
+
+        Parameters
+        ----------
+        result : list or list of list or None
+            Result of get_df_array of a single instance.
+
+        Returns
+        -------
+        list of list
+            The rows (lists) of the instance.
+
+        """
+        if result is None or len(result) == 0:
+            return []
+        elif isinstance(result[0], list):
+            return result
+        else:
+            return [result]
+
+    @classmethod
+    def _iter_df_array_threads(cls, iterable, return_fields, columns=False):
+        """Yields the dataframe rows of each instance using the threads
+        engine.
+
+        The instances are processed in parallel in the shared worker pool.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array.
+        columns : bool, optional
+            Whether to yield the columns of each instance (see
+            `get_df_columns`) instead of its rows. Defaults to False.
+
+        Yields
+        ------
+        list of list or tuple
+            The rows (lists) or columns of one instance of the iterable.
+
+        """
+        max_pending = 8 * net.worker_threads
+        worker_pool = net.get_shared_worker_pool()
+        pending = deque()
+
+        def resolve(worker_result):
+            worker_result.wait()
+            if columns:
+                return worker_result.get_result()
+            return cls._unnest_df_array(worker_result.get_result())
 
         for item in iterable:
-            pool.execute(item.get_df_array, (return_fields,))
+            pending.append(worker_pool.submit(
+                item.get_df_columns if columns else item.get_df_array,
+                (return_fields,)))
+
+            while len(pending) > max_pending:
+                yield resolve(pending.popleft())
+
+        while len(pending) > 0:
+            yield resolve(pending.popleft())
+
+    @classmethod
+    def _iter_df_array_async(cls, iterable, return_fields, columns=False):
+        """Yields the dataframe rows of each instance using the async
+        engine.
+
+        The XML documents of the instances are downloaded concurrently on an
+        asyncio event loop, while parsing happens in the calling thread in
+        the order of the instances in the iterable.
 
-        df_result = []
-        for res in pool.join():
-            unnest_result(res.get_result(), df_result)
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array.
+        columns : bool, optional
+            Whether to yield the columns of each instance (see
+            `get_df_columns`) instead of its rows. Defaults to False.
+
+        Yields
+        ------
+        list of list or tuple
+            The rows (lists) or columns of one instance of the iterable.
+
+        """
+        requires_xml = cls._requires_xml(return_fields)
+        max_pending = net.async_max_connections * 2
+
+        def resolve(item, future):
+            if future is not None:
+                try:
+                    item._xml_data = future.result()
+                except BaseException as e:
+                    item._xml_data = e
+
+            return cls._get_df_output(item, return_fields, columns)
+
+        loop = net.get_shared_async_loop() if requires_xml else None
+        pending = deque()
+
+        try:
+            for item in iterable:
+                future = None
+                if requires_xml and not item._load_parsed_data():
+                    future = loop.submit(item._get_xml_data_async, ())
+                pending.append((item, future))
+
+                while len(pending) > max_pending:
+                    yield resolve(*pending.popleft())
+
+            while len(pending) > 0:
+                yield resolve(*pending.popleft())
+        finally:
+            for item, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    @classmethod
+    def _iter_df_array_processes(cls, iterable, return_fields,
+                                 columns=False):
+        """Yields the dataframe rows of each instance, parsing the XML
+        documents in the shared pool of worker processes.
+
+        The XML documents are retrieved by the download engine (threads or
+        async), from the network or the cache, and the raw documents are
+        handed to the worker processes that parse them and build the rows.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array.
+        columns : bool, optional
+            Whether to yield the columns of each instance (see
+            `get_df_columns`) instead of its rows. Defaults to False.
+
+        Yields
+        ------
+        list of list or tuple
+            The rows (lists) or columns of one instance of the iterable.
+
+        """
+        spec = cls._get_process_spec()
+        process_pool = parsing.get_shared_process_pool()
+        max_parsing = 4 * pydov.parse_processes
+        parsed_cache = cls._get_parsed_cache()
+
+        if pydov.engine == 'async':
+            max_pending = net.async_max_connections * 2
+            loop = net.get_shared_async_loop()
+
+            def fetch_xml(item):
+                return loop.submit(item._get_xml_data_async, ()), None
+        else:
+            max_pending = 8 * net.worker_threads
+            worker_pool = net.get_shared_worker_pool()
+
+            def fetch_xml(item):
+                future = Future()
+
+                def get_xml_data(session):
+                    try:
+                        future.set_result(item._get_xml_data(session))
+                    except BaseException as e:
+                        future.set_exception(e)
+
+                return future, worker_pool.submit(get_xml_data, ())
+
+        def fetch(item):
+            if item._load_parsed_data():
+                # no XML document to parse, use the parsed data cache
+                future = Future()
+                future.set_result(None)
+                return future, None
+            return fetch_xml(item)
+
+        def parse_local(item, xml):
+            item._xml_data = xml
+            return cls._get_df_output(item, return_fields, columns)
+
+        def parse(item, future, job):
+            if job is not None:
+                # the job is not executed when the worker pool was stopped,
+                # forward its error to not wait forever for the document
+                job.wait()
+                if job.get_error() is not None and not future.done():
+                    future.set_exception(job.get_error())
+
+            try:
+                xml = future.result()
+            except BaseException as e:
+                return item, e, None
+
+            if xml is None:
+                return item, None, None
+
+            return item, xml, process_pool.submit(
+                parsing.parse_df_array, spec, item.pkey, item.data, xml,
+                return_fields, columns, parsed_cache)
+
+        def resolve(item, xml, future):
+            if future is None:
+                return parse_local(item, xml)
+
+            try:
+                output, caught = future.result()
+            except Exception:
+                return parse_local(item, xml)
+
+            for category, message in caught:
+                warnings.warn(message, category)
+            return output if columns else cls._unnest_df_array(output)
+
+        pending = deque()
+        parsed = deque()
+
+        try:
+            for item in iterable:
+                pending.append((item, *fetch(item)))
+
+                while len(pending) > 0 and (len(pending) > max_pending or
+                                            pending[0][1].done()):
+                    parsed.append(parse(*pending.popleft()))
+
+                while len(parsed) > max_parsing:
+                    yield resolve(*parsed.popleft())
+
+            while len(pending) > 0:
+                parsed.append(parse(*pending.popleft()))
+
+                while len(parsed) > max_parsing:
+                    yield resolve(*parsed.popleft())
+
+            while len(parsed) > 0:
+                yield resolve(*parsed.popleft())
+        finally:
+            for item, future, job in pending:
+                future.cancel()
+            for item, xml, future in parsed:
+                if future is not None:
+                    future.cancel()
+
+    @classmethod
+    def _get_df_output(cls, item, return_fields, columns, session=None):
+        """Get the rows or columns of the given instance, ignoring errors.
+
+        Parameters
+        ----------
+        item : AbstractDovType
+            Instance to get the rows or columns of.
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array.
+        columns : bool
+            Whether to get the columns (see `get_df_columns`) instead of the
+            rows.
+        session : requests.Session
+            Session to use to perform HTTP requests for data. Defaults to
+            None.
+
+        Returns
+        -------
+        list of list or tuple or None
+            The rows of the instance (an empty list on errors) or its columns
+            (None on errors).
+
+        """
+        try:
+            if columns:
+                return item.get_df_columns(return_fields, session)
+            return cls._unnest_df_array(
+                item.get_df_array(return_fields, session))
+        except Exception:
+            return None if columns else []
+
+    @classmethod
+    def _supports_df_columns(cls, return_fields=None):
+        """Check whether the output dataframe can be built from the columns
+        of the instances, see `get_df_columns`.
+
+        This is the case for types with a single subtype (that has at most a
+        single subtype itself), when fields of the subtype are requested.
+
+        Parameters
+        ----------
+        return_fields : ReturnFieldList
+            List of fields to include in the output dataframe. Defaults to
+            None, which will include all fields.
+
+        Returns
+        -------
+        bool
+            True if the output dataframe can be built from columns, False
+            otherwise.
+
+        """
+        if len(cls.subtypes) != 1 or \
+                not cls.subtypes[0]._supports_xml_columns():
+            return False
+
+        subfields = cls.subtypes[0].get_field_names()
+        return any(f in subfields for f in cls._get_df_field_names(
+            return_fields))
+
+    @classmethod
+    def to_df_columns(cls, iterable, return_fields=None):
+        """Returns the columns of the output dataframe for the instances in
+        the given iterable.
+
+        The columns of the instances are retrieved in parallel, like
+        `iter_df_array`, and concatenated. Only supported if
+        `_supports_df_columns`.
+
+        Parameters
+        ----------
+        iterable : list<DovType> or tuple<DovType> or iterable<DovType>
+            A list of instances of a DOV type.
+        return_fields : ReturnFieldList
+            List of fields to include in the output dataframe. Defaults to
+            None, which will include all fields.
+
+        Returns
+        -------
+        dict<str, numpy.ndarray>
+            Dictionary mapping the field (column) names to the arrays of
+            their values.
 
-        return df_result
+        Raises
+        ------
+        ValueError
+            When `pydov.engine` is not one of 'threads' or 'async'.
+
+        """
+        if pydov.engine not in ('async', 'threads'):
+            raise ValueError(
+                "Unknown engine '{}', should be one of 'threads' or "
+                "'async'.".format(pydov.engine))
+
+        if pydov.parse_processes and cls._get_process_spec() is not None:
+            parts = cls._iter_df_array_processes(
+                iterable, return_fields, columns=True)
+        elif pydov.engine == 'async':
+            parts = cls._iter_df_array_async(
+                iterable, return_fields, columns=True)
+        else:
+            parts = cls._iter_df_array_threads(
+                iterable, return_fields, columns=True)
+
+        fields = cls._get_df_field_names(return_fields)
+        return cls._concat_columns(
+            [p for p in parts if p is not None], fields)[1]
+
+    def get_df_columns(self, return_fields=None, session=None):
+        """Return the columns of the instance of this type for inclusion in
+        the resulting output dataframe of a search operation.
+
+        Contrary to `get_df_array`, no instances are built for the
+        occurrences of the subtype: their values are extracted from the XML
+        document straight into arrays. Only supported if
+        `_supports_df_columns`.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array. The order is
+            ignored, the default order of the fields of the datatype is used
+            instead. Defaults to None, which will include all fields.
+        session : requests.Session
+            Session to use to perform HTTP requests for data. Defaults to None,
+            which means a new session will be created for each request.
+
+        Returns
+        -------
+        tuple
+            Tuple of the number of rows and the dictionary mapping the field
+            (column) names to the arrays of their values, with the same rows
+            as `get_df_array`.
+
+        """
+        fields = self._get_df_field_names(return_fields)
+        types = {f['name']: f['type'] for f in self.get_fields(
+            source=('wfs', 'xml', 'custom_wfs', 'custom_xml')).values()}
+
+        self._subcolumns = None
+        self._parse_xml_data(session, subtype_columns=True)
+
+        count, subcolumns = self._subcolumns or (0, {})
+        self._subcolumns = None
+
+        columns = {}
+        for name in fields:
+            if count > 0 and name in subcolumns:
+                columns[name] = subcolumns[name]
+            else:
+                value = self.data.get(name, np.nan)
+                if value == self._UNRESOLVED:
+                    value = np.nan
+                columns[name] = self._to_array(
+                    [value] * max(count, 1), types.get(name))
+        return max(count, 1), columns
+
+    @classmethod
+    def _get_process_spec(cls):
+        """Get the pickled specification to rebuild this type in the worker
+        processes.
+
+        Returns
+        -------
+        bytes or None
+            Pickled specification of this type, or None if this type cannot
+            be parsed in worker processes.
+
+        """
+        return cls._get_plan(
+            'process', lambda: parsing.get_type_spec(cls) or False) or None
+
+    @classmethod
+    def _requires_xml(cls, return_fields=None):
+        """Check whether the XML document of the instances needs to be
+        fetched to resolve the given return fields.
+
+        Parameters
+        ----------
+        return_fields : list<str> or tuple<str> or set<str> or iterable<str>
+            List of fields to include in the data array. Defaults to None,
+            which will include all fields.
+
+        Returns
+        -------
+        bool
+            True if any of the return fields is resolved from the XML
+            document, False otherwise.
+
+        """
+        fields = cls._get_df_field_names(return_fields)
+
+        xml_fields = cls.get_fields(source=('xml', 'custom_xml'))
+        return any(f in xml_fields for f in fields)
 
     def _get_xml_data(self, session=None):
         """Return the raw XML data for this DOV object.
@@ -1026,6 +2385,12 @@ class AbstractDovType(AbstractTypeCommon):
             The raw XML data of this DOV object as bytes.
 
         """
+        if self._xml_data is not None:
+            xml, self._xml_data = self._xml_data, None
+            if isinstance(xml, BaseException):
+                raise xml
+            return xml
+
         if pydov.cache:
             return pydov.cache.get(self.pkey + '.xml', session)
         else:
@@ -1033,13 +2398,35 @@ class AbstractDovType(AbstractTypeCommon):
             HookRunner.execute_xml_downloaded(self.pkey)
             return xml
 
-    def _parse_subtypes(self, xml):
-        """Parse the subtypes with the given XML data.
+    async def _get_xml_data_async(self, session):
+        """Asynchronously return the raw XML data for this DOV object.
 
         Parameters
         ----------
+        session : aiohttp.ClientSession
+            Async session to use to perform HTTP requests for data.
+
+        Returns
+        -------
         xml : bytes
-            The raw XML data of the DOV object as bytes.
+            The raw XML data of this DOV object as bytes.
+
+        """
+        if pydov.cache:
+            return await pydov.cache.get_async(self.pkey + '.xml', session)
+        else:
+            xml = await get_dov_xml_async(self.pkey + '.xml', session)
+            HookRunner.execute_xml_downloaded(self.pkey)
+            return xml
+
+    def _parse_subtypes(self, tree):
+        """Parse the subtypes with the given XML tree.
+
+        Parameters
+        ----------
+        tree : etree.Element
+            The parsed XML document of the DOV object, or the element of this
+            subtype.
 
         """
         for subtype in self.subtypes:
@@ -1047,8 +2434,7 @@ class AbstractDovType(AbstractTypeCommon):
             if st_name not in self.subdata:
                 self.subdata[st_name] = []
 
-            for subitem in subtype.from_xml(xml):
-                self.subdata[st_name].append(subitem)
+            self.subdata[st_name].extend(subtype.from_xml_tree(tree))
 
     def get_df_array(self, return_fields=None, session=None):
         """Return the data array of the instance of this type for inclusion
@@ -1087,25 +2473,21 @@ class AbstractDovType(AbstractTypeCommon):
         if len(subfields) > 0:
             parsed = self._parse_xml_data(session)
 
-        datadicts = []
+        ownrecord = [self.data.get(field, np.nan) for field in fields]
         datarecords = []
 
         if len(self.subdata) == 0 or len(subfields) == 0:
-            datadicts.append(self.data)
+            datarecords.append(ownrecord)
         else:
             for subtype in self.subdata:
                 if len(self.subdata[subtype]) == 0:
-                    datadicts.append(self.data)
+                    datarecords.append(ownrecord)
                 else:
                     for subdata in self.subdata[subtype]:
                         for subdata_dict in subdata.get_data_dicts():
-                            datadict = {}
-                            datadict.update(self.data)
-                            datadict.update(subdata_dict)
-                            datadicts.append(datadict)
-
-        for d in datadicts:
-            datarecords.append([d.get(field, np.nan) for field in fields])
+                            datarecords.append(
+                                [subdata_dict.get(field, value)
+                                 for field, value in zip(fields, ownrecord)])
 
         for d in datarecords:
             if parsed is None and self._UNRESOLVED in d:
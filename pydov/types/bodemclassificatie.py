@@ -7,6 +7,8 @@ from .abstract import AbstractDovType
 class Bodemclassificatie(AbstractDovType):
     """Class representing the DOV data type for bodemclassificaties."""
 
+    __slots__ = ()
+
     subtypes = []
 
     fields = [
@@ -9,6 +9,8 @@ from .abstract import AbstractDovType
 class Bodemdiepteinterval(AbstractDovType):
     """Class representing the DOV data type for bodemdiepteinterval."""
 
+    __slots__ = ()
+
     subtypes = []
 
     fields = [
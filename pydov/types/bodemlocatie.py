@@ -9,6 +9,8 @@ from .abstract import AbstractDovType
 class Bodemlocatie(AbstractDovType):
     """Class representing the DOV data type for bodemlocaties."""
 
+    __slots__ = ()
+
     subtypes = []
 
     fields = [
@@ -9,6 +9,8 @@ from .abstract import AbstractDovType
 class Bodemsite(AbstractDovType):
     """Class representing the DOV data type for bodemsites."""
 
+    __slots__ = ()
+
     subtypes = []
 
     fields = [
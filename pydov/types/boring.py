@@ -12,6 +12,8 @@ from .abstract import AbstractDovFieldSet, AbstractDovSubType, AbstractDovType
 class BoorMethode(AbstractDovSubType):
     """Subtype listing the method used to make the borehole."""
 
+    __slots__ = ()
+
     intended_for = ['Boring']
 
     rootpath = './/boring/details/boormethode'
@@ -37,6 +39,8 @@ class BoorMethode(AbstractDovSubType):
 class Kleur(AbstractDovSubType):
     """Subtype listing the color values of the borehole."""
 
+    __slots__ = ()
+
     intended_for = ['Boring']
 
     rootpath = './/boring/details/kleur'
@@ -62,6 +66,8 @@ class Kleur(AbstractDovSubType):
 class Boring(AbstractDovType):
     """Class representing the DOV data type for boreholes."""
 
+    __slots__ = ()
+
     subtypes = [BoorMethode]
 
     fields = [
@@ -111,6 +117,8 @@ class MethodeXyz(AbstractDovFieldSet):
     """Fieldset containing fields for method and reliability of the point
     location of the borehole."""
 
+    __slots__ = ()
+
     __generiekeDataCodes = build_dov_url(
         'xdov/schema/latest/xsd/kern/generiek/GeneriekeDataCodes.xsd')
 
@@ -24,6 +24,8 @@ class WfsTypeFactory:
         """
         class WfsType(AbstractDovType):
 
+            __slots__ = ()
+
             fields = []
 
             def __init__(self, pkey):
@@ -15,6 +15,8 @@ _filterDataCodes_xsd = build_dov_url(
 class Peilmeting(AbstractDovSubType):
     """Subtype listing the water head level measurements."""
 
+    __slots__ = ()
+
     intended_for = ['GrondwaterFilter']
 
     rootpath = './/filtermeting/peilmeting'
@@ -71,6 +73,8 @@ class Gxg(AbstractDovSubType):
     """Subtype listing the GxG values or precalculated groundwaterlevel
     statistics."""
 
+    __slots__ = ()
+
     intended_for = ['GrondwaterFilter']
 
     rootpath = './/filtermeting/gxg'
@@ -104,6 +108,8 @@ class Gxg(AbstractDovSubType):
 class GrondwaterFilter(AbstractDovType):
     """Class representing the DOV data type for Groundwater screens."""
 
+    __slots__ = ()
+
     subtypes = [Peilmeting]
 
     fields = [
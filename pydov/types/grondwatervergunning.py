@@ -8,6 +8,8 @@ class GrondwaterVergunning(AbstractDovType):
     """Class representing the DOV data type for groundwater abstraction
     permits."""
 
+    __slots__ = ()
+
     subtypes = []
 
     fields = [
@@ -54,6 +54,8 @@ class AbstractCommonInterpretatie(AbstractDovType):
     """Abstract base class for interpretations that can be linked to
     boreholes or cone penetration tests."""
 
+    __slots__ = ()
+
     fields = [
         WfsField(name='pkey_interpretatie',
                  source_field='Interpretatiefiche', datatype='string'),
@@ -87,6 +89,8 @@ class AbstractBoringInterpretatie(AbstractDovType):
     """Abstract base class for interpretations that are linked to boreholes
     only."""
 
+    __slots__ = ()
+
     fields = [
         WfsField(name='pkey_interpretatie',
                  source_field='Interpretatiefiche', datatype='string'),
@@ -135,6 +139,8 @@ class AbstractBoringInterpretatie(AbstractDovType):
 
 class InformeleStratigrafieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['InformeleStratigrafie']
 
     rootpath = './/informelestratigrafie/laag'
@@ -163,11 +169,15 @@ class InformeleStratigrafie(AbstractCommonInterpretatie):
     """Class representing the DOV data type for 'informele stratigrafie'
     interpretations."""
 
+    __slots__ = ()
+
     subtypes = [InformeleStratigrafieLaag]
 
 
 class FormeleStratigrafieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['FormeleStratigrafie']
 
     rootpath = './/formelestratigrafie/laag'
@@ -223,11 +233,15 @@ class FormeleStratigrafie(AbstractCommonInterpretatie):
     """Class representing the DOV data type for 'Formele stratigrafie'
     interpretations."""
 
+    __slots__ = ()
+
     subtypes = [FormeleStratigrafieLaag]
 
 
 class HydrogeologischeStratigrafieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['HydrogeologischeStratigrafie']
 
     rootpath = './/hydrogeologischeinterpretatie/laag'
@@ -263,11 +277,15 @@ class HydrogeologischeStratigrafie(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'hydrogeologische
     stratigrafie' interpretations."""
 
+    __slots__ = ()
+
     subtypes = [HydrogeologischeStratigrafieLaag]
 
 
 class LithologischeBeschrijvingLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['LithologischeBeschrijvingen']
 
     rootpath = './/lithologischebeschrijving/laag'
@@ -295,11 +313,15 @@ class LithologischeBeschrijvingen(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'lithologische
     beschrijvingen' interpretations."""
 
+    __slots__ = ()
+
     subtypes = [LithologischeBeschrijvingLaag]
 
 
 class GecodeerdeLithologieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['GecodeerdeLithologie']
 
     rootpath = './/gecodeerdelithologie/laag'
@@ -394,11 +416,15 @@ class GecodeerdeLithologie(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'gecodeerde
     lithologie' interpretations."""
 
+    __slots__ = ()
+
     subtypes = [GecodeerdeLithologieLaag]
 
 
 class GeotechnischeCoderingLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['GeotechnischeCodering']
 
     rootpath = './/geotechnischecodering/laag'
@@ -494,11 +520,15 @@ class GeotechnischeCodering(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'geotechnische
     codering' interpretations."""
 
+    __slots__ = ()
+
     subtypes = [GeotechnischeCoderingLaag]
 
 
 class QuartairStratigrafieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['QuartairStratigrafie']
 
     rootpath = './/quartairstratigrafie/laag'
@@ -554,11 +584,15 @@ class QuartairStratigrafie(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'Quartairstratigrafie'
     interpretations."""
 
+    __slots__ = ()
+
     subtypes = [QuartairStratigrafieLaag]
 
 
 class InformeleHydrogeologischeStratigrafieLaag(AbstractDovSubType):
 
+    __slots__ = ()
+
     intended_for = ['InformeleHydrogeologischeStratigrafie']
 
     rootpath = './/informelehydrostratigrafie/laag'
@@ -587,4 +621,6 @@ class InformeleHydrogeologischeStratigrafie(AbstractBoringInterpretatie):
     """Class representing the DOV data type for 'informele stratigrafie'
     interpretations."""
 
+    __slots__ = ()
+
     subtypes = [InformeleHydrogeologischeStratigrafieLaag]
@@ -163,6 +163,8 @@ class MonsterDetails(AbstractDovFieldSet):
     details about the sample.
     """
 
+    __slots__ = ()
+
     intended_for = ['Monster']
 
     fields = [
@@ -176,6 +178,8 @@ class MonsterDetails(AbstractDovFieldSet):
 class BemonsterdObject(AbstractDovSubType):
     """Subtype listing the sampled object(s) of the sample."""
 
+    __slots__ = ()
+
     rootpath = './/monster/bemonsterdObject'
     intended_for = ['Monster']
 
@@ -199,6 +203,8 @@ class BemonsterdObject(AbstractDovSubType):
 class Opslaglocatie(AbstractDovSubType):
     """Subtype listing the storage location(s) of the sample."""
 
+    __slots__ = ()
+
     rootpath = './/monster/opslaglocatie'
     intended_for = ['Monster']
 
@@ -224,6 +230,8 @@ class Monsterbehandeling(AbstractDovSubType):
     """Subtype containing fields about the
     treatment of the sample."""
 
+    __slots__ = ()
+
     intended_for = ['Monster']
     rootpath = './/monster/verwerkingsdetails'
 
@@ -251,6 +259,8 @@ class Monsterbehandeling(AbstractDovSubType):
 class Monster(AbstractDovType):
     """Class representing the DOV data type for ground samples."""
 
+    __slots__ = ()
+
     def _split_pipes_to_list(agg_value):
         """
         Splits the given aggregated value into a list of values.
@@ -74,6 +74,8 @@ class NumeriekTekstField(_CustomXmlField):
 class ObservatieDetails(AbstractDovFieldSet):
     """Fieldset containing fields with extra details about the observation."""
 
+    __slots__ = ()
+
     intended_for = ['Observatie']
 
     fields = [
@@ -101,6 +103,8 @@ class ObservatieDetails(AbstractDovFieldSet):
 class ObservatieHerhaling(AbstractDovSubType):
     """Subtype showing the repetition information of an observation."""
 
+    __slots__ = ()
+
     rootpath = './/observatie/herhaling'
     intended_for = ['Observatie']
 
@@ -127,6 +131,8 @@ class ObservatieHerhaling(AbstractDovSubType):
 class SecundaireParameter(AbstractDovSubType):
     """Subtype showing the secondary parameter of an observation."""
 
+    __slots__ = ()
+
     rootpath = './/observatie/secundaireparameter'
     intended_for = ['Observatie']
 
@@ -148,6 +154,8 @@ class SecundaireParameter(AbstractDovSubType):
 class Fractiemeting(AbstractDovSubType):
     """Subtype showing the details of a fraction measurement."""
 
+    __slots__ = ()
+
     rootpath = './/waarde_fractiemeting/meting'
     intended_for = ['Observatie']
 
@@ -170,6 +178,8 @@ class Fractiemeting(AbstractDovSubType):
 class MeetreeksWaarde(AbstractDovSubType):
     """Subtype showing the details of a measurement value in a series."""
 
+    __slots__ = ()
+
     rootpath = './/meetreekswaarde'
     intended_for = ['Meetreeks']
 
@@ -186,6 +196,8 @@ class MeetreeksWaarde(AbstractDovSubType):
 class Meetreeks(AbstractDovSubType):
     """Subtype showing the details of a measurement series."""
 
+    __slots__ = ()
+
     rootpath = './/waarde_meetreeks'
     intended_for = ['Observatie']
 
@@ -247,6 +259,8 @@ class Meetreeks(AbstractDovSubType):
 class Observatie(AbstractDovType):
     """Class representing the DOV data type for observations."""
 
+    __slots__ = ()
+
     fields = [
         WfsField(name='pkey_observatie', source_field='observatie_link',
                  datatype='string'),
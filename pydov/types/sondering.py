@@ -11,6 +11,8 @@ from pydov.types.fields_custom import MvMtawField
 class Meetdata(AbstractDovSubType):
     """Subtype listing the CPT measurement results."""
 
+    __slots__ = ()
+
     intended_for = ['Sondering']
 
     rootpath = './/sondering/sondeonderzoek/penetratietest/meetdata'
@@ -59,6 +61,8 @@ class Meetdata(AbstractDovSubType):
 class Techniek(AbstractDovSubType):
     """Subtype listing the different techniques used to perform the CPT."""
 
+    __slots__ = ()
+
     intended_for = ['Sondering']
 
     rootpath = './/sondering/sondeonderzoek/penetratietest/technieken'
@@ -95,6 +99,8 @@ class Techniek(AbstractDovSubType):
 class Sondering(AbstractDovType):
     """Class representing the DOV data type for CPT measurements."""
 
+    __slots__ = ()
+
     subtypes = [Meetdata]
 
     fields = [
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Module grouping functions to build Apache Arrow tables from search
+results.
+
+This requires the optional pyarrow dependency."""
+import math
+
+from pydov.util.owsutil import has_geom_support
+
+
+def import_pyarrow():
+    """Import the pyarrow package.
+
+    Returns
+    -------
+    module
+        The pyarrow module.
+
+    Raises
+    ------
+    ImportError
+        When the pyarrow package is not installed.
+
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow and Parquet output require the pyarrow package. Install "
+            "it using 'pip install pydov[arrow]'.")
+    return pyarrow
+
+
+def _is_null(value):
+    """Check whether the given value is missing.
+
+    Parameters
+    ----------
+    value : object
+        Value to check.
+
+    Returns
+    -------
+    bool
+        True if the value is None or NaN, False otherwise.
+
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _get_arrow_type(pa, datatype):
+    """Get the Arrow datatype of the given pydov datatype.
+
+    Parameters
+    ----------
+    pa : module
+        The pyarrow module.
+    datatype : str
+        The pydov datatype, one of `string`, `float`, `integer`, `date`,
+        `datetime`, `boolean` or `geometry`.
+
+    Returns
+    -------
+    pyarrow.DataType
+        The Arrow datatype, strings for unknown datatypes.
+
+    """
+    if datatype == 'float':
+        return pa.float64()
+    elif datatype == 'integer':
+        return pa.int64()
+    elif datatype == 'boolean':
+        return pa.bool_()
+    elif datatype == 'date':
+        return pa.date32()
+    elif datatype == 'datetime':
+        return pa.timestamp('us')
+    elif datatype == 'geometry' and has_geom_support():
+        # geometries as WKB
+        return pa.binary()
+    return pa.string()
+
+
+def get_schema(columns, fields):
+    """Get the Arrow schema of the output of a search.
+
+    Parameters
+    ----------
+    columns : list of str
+        Names of the columns of the output.
+    fields : dict
+        Dictionary mapping the names of the fields to their metadata, with
+        at least their `type` and whether they are `multivalue`.
+
+    Returns
+    -------
+    pyarrow.Schema
+        The schema of the output.
+
+    """
+    pa = import_pyarrow()
+
+    schema = []
+    for name in columns:
+        field = fields.get(name, {})
+        arrow_type = _get_arrow_type(pa, field.get('type'))
+        if field.get('multivalue', False):
+            arrow_type = pa.list_(arrow_type)
+        schema.append(pa.field(name, arrow_type))
+    return pa.schema(schema)
+
+
+def _to_arrow_values(values, arrow_type):
+    """Prepare the values of a column to be converted to Arrow.
+
+    Missing values are replaced by None, geometries by their WKB
+    representation and multiple values by lists.
+
+    Parameters
+    ----------
+    values : sequence
+        Values of the column.
+    arrow_type : pyarrow.DataType
+        Arrow datatype of the column.
+
+    Returns
+    -------
+    list
+        List of the values to convert.
+
+    """
+    pa = import_pyarrow()
+
+    if pa.types.is_list(arrow_type):
+        return [None if _is_null(v) else
+                [None if _is_null(i) else i for i in v] for v in values]
+    elif pa.types.is_binary(arrow_type):
+        return [None if _is_null(v) else v.wkb for v in values]
+    return [None if _is_null(v) else v for v in values]
+
+
+def batch_from_columns(columns, schema):
+    """Build an Arrow record batch from the columns of a chunk of search
+    results.
+
+    Parameters
+    ----------
+    columns : dict
+        Dictionary mapping the column names to the sequences of their
+        values.
+    schema : pyarrow.Schema
+        The schema of the output, see `get_schema`.
+
+    Returns
+    -------
+    pyarrow.RecordBatch
+        The record batch.
+
+    """
+    pa = import_pyarrow()
+    return pa.record_batch(
+        [pa.array(_to_arrow_values(columns[f.name], f.type), type=f.type)
+         for f in schema], schema=schema)
+
+
+def batch_from_rows(rows, schema):
+    """Build an Arrow record batch from the rows of a chunk of search
+    results.
+
+    Parameters
+    ----------
+    rows : list of list
+        The rows, with the values in the order of the schema.
+    schema : pyarrow.Schema
+        The schema of the output, see `get_schema`.
+
+    Returns
+    -------
+    pyarrow.RecordBatch
+        The record batch.
+
+    """
+    if len(rows) > 0:
+        values = zip(*rows)
+    else:
+        values = ([] for f in schema)
+    return batch_from_columns(dict(zip(schema.names, values)), schema)
@@ -1,16 +1,33 @@
 # -*- coding: utf-8 -*-
-"""Module implementing a local cache for downloaded XML files."""
+"""Module implementing a local cache for downloaded XML files, WFS
+responses and metadata."""
+import asyncio
 import datetime
 import gzip
 import os
+import pickle
 import re
 import shutil
+import sqlite3
 import tempfile
+import time
+import uuid
 import warnings
-
-from pydov.util.dovutil import build_dov_url, get_dov_xml
-from pydov.util.errors import RemoteFetchError, XmlStaleWarning
+import zlib
+from collections import OrderedDict
+from hashlib import md5
+from threading import Lock, RLock, local
+
+from requests.exceptions import RequestException
+
+import pydov
+from pydov.util.dovutil import (build_dov_url, get_dov_xml,
+                                get_dov_xml_async)
+from pydov.util.errors import (ParsedCacheWarning, RemoteFetchError,
+                               WfsStaleWarning, XmlStaleWarning)
 from pydov.util.hooks import HookRunner
+from pydov.util.owsutil import (get_wfs_getfeature_request_hash,
+                                wfs_get_feature)
 
 
 class AbstractCache(object):
@@ -48,6 +65,27 @@ class AbstractCache(object):
         HookRunner.execute_xml_downloaded(url.rstrip('.xml'))
         return xml
 
+    async def _get_remote_async(self, url, session):
+        """Get the XML data by requesting it asynchronously from the given
+        URL.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        session : aiohttp.ClientSession
+            Async session to use to perform HTTP requests for data.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of this DOV object as bytes.
+
+        """
+        xml = await get_dov_xml_async(url, session)
+        HookRunner.execute_xml_downloaded(url.rstrip('.xml'))
+        return xml
+
     def _emit_cache_hit(self, url):
         """Emit the XML cache hit event for all registered hooks.
 
@@ -101,6 +139,75 @@ class AbstractCache(object):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
+    async def get_async(self, url, session):
+        """Asynchronously get the XML data for the DOV object referenced by
+        the given URL.
+
+        This is used by the async engine, and will be called concurrently
+        from the event loop. The default implementation runs the synchronous
+        `get` in a separate thread, subclasses can override this to perform
+        the remote request using the given async session instead.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        session : aiohttp.ClientSession
+            Async session to use to perform HTTP requests for data.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of this DOV object as bytes.
+
+        """
+        return await asyncio.to_thread(self.get, url)
+
+    def _fetch(self, url, session=None):
+        """Get the XML data for the DOV object referenced by the given URL,
+        and whether a stale cached version was returned.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        session : requests.Session
+            Session to use to perform HTTP requests for data. Defaults to None,
+            which means a new session will be created for each request.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of this DOV object as bytes.
+        stale : bool
+            True if a stale cached version was returned because the remote
+            request failed, False otherwise.
+
+        """
+        return self.get(url, session), False
+
+    async def _fetch_async(self, url, session):
+        """Asynchronously get the XML data for the DOV object referenced by
+        the given URL, and whether a stale cached version was returned.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        session : aiohttp.ClientSession
+            Async session to use to perform HTTP requests for data.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of this DOV object as bytes.
+        stale : bool
+            True if a stale cached version was returned because the remote
+            request failed, False otherwise.
+
+        """
+        return await self.get_async(url, session), False
+
     def clean(self):
         """Clean the cache by removing old records from the cache.
 
@@ -285,8 +392,9 @@ class AbstractFileCache(AbstractCache):
 
         Returns
         -------
-        str (xml)
-            XML string of the DOV object, loaded from the cache.
+        xml : bytes
+            The raw XML data of the DOV object as bytes, loaded from the
+            cache.
 
         """
         raise NotImplementedError('This should be implemented in a subclass.')
@@ -306,9 +414,53 @@ class AbstractFileCache(AbstractCache):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
-    def get(self, url, session=None):
-        datatype, key = self._get_type_key_from_url(url)
+    def _write_file(self, filepath, data):
+        """Write the given data to a file atomically.
+
+        The data is written to a temporary file first, which then replaces
+        the file. Other threads or processes reading the file never see a
+        partially written file.
+
+        Parameters
+        ----------
+        filepath : str
+            Full absolute path of the file to write.
+        data : bytes
+            The data to write.
+
+        """
+        folder = os.path.dirname(filepath)
+        os.makedirs(folder, exist_ok=True)
+
+        tmp_filepath = '{}.{}.tmp'.format(filepath, uuid.uuid4().hex)
+        try:
+            with open(tmp_filepath, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_filepath, filepath)
+        except Exception:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+            raise
+
+    def _get_cached(self, url, datatype, key):
+        """Get the XML data from the inject hooks or a valid cached version.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        datatype : str
+            Datatype of the DOV object.
+        key : str
+            Unique and permanent object key of the DOV object.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of this DOV object as bytes, or None if it
+            should be requested remotely.
 
+        """
         data = HookRunner.execute_inject_xml_response(url)
 
         if data is not None:
@@ -318,36 +470,96 @@ class AbstractFileCache(AbstractCache):
         if self._is_valid(datatype, key):
             try:
                 self._emit_cache_hit(url)
-                data = self._load(datatype, key).encode('utf-8')
+                data = self._load(datatype, key)
 
                 HookRunner.execute_xml_received(url, data)
                 return data
             except Exception:
                 pass
 
+    def _get_stale(self, url, datatype, key):
+        """Get a stale cached version of the XML data after the remote
+        request failed, if allowed and available.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        datatype : str
+            Datatype of the DOV object.
+        key : str
+            Unique and permanent object key of the DOV object.
+
+        Returns
+        -------
+        xml : bytes
+            The raw XML data of this DOV object as bytes.
+
+        Raises
+        ------
+        RemoteFetchError
+            If no stale version can be used.
+
+        """
+        if self.stale_on_error and self._is_stale(datatype, key):
+            self._emit_stale_hit(url)
+            warnings.warn((
+                "Failed to fetch remote XML document for "
+                "object '{}', using older stale version from cache. "
+                "Resulting dataframe will be out-of-date.".format(url)),
+                XmlStaleWarning)
+
+            return self._load(datatype, key)
+        else:
+            HookRunner.execute_xml_fetch_error(url)
+            raise RemoteFetchError
+
+    def get(self, url, session=None):
+        return self._fetch(url, session)[0]
+
+    async def get_async(self, url, session):
+        return (await self._fetch_async(url, session))[0]
+
+    def _fetch(self, url, session=None):
+        datatype, key = self._get_type_key_from_url(url)
+
+        data = self._get_cached(url, datatype, key)
+        if data is not None:
+            return data, False
+
         try:
             data = self._get_remote(url, session)
         except RemoteFetchError:
-            if self.stale_on_error and self._is_stale(datatype, key):
-                self._emit_stale_hit(url)
-                warnings.warn((
-                    "Failed to fetch remote XML document for "
-                    "object '{}', using older stale version from cache. "
-                    "Resulting dataframe will be out-of-date.".format(url)),
-                    XmlStaleWarning)
-
-                data = self._load(datatype, key).encode('utf-8')
-                return data
-            else:
-                HookRunner.execute_xml_fetch_error(url)
-                raise RemoteFetchError
+            return self._get_stale(url, datatype, key), True
         else:
             try:
                 self._save(datatype, key, data)
             except Exception:
                 pass
 
-        return data
+        return data, False
+
+    async def _fetch_async(self, url, session):
+        # reading, decompressing and saving cached documents is blocking, so
+        # only the remote request is run on the event loop
+        datatype, key = self._get_type_key_from_url(url)
+
+        data = await asyncio.to_thread(self._get_cached, url, datatype, key)
+        if data is not None:
+            return data, False
+
+        try:
+            data = await self._get_remote_async(url, session)
+        except RemoteFetchError:
+            return await asyncio.to_thread(
+                self._get_stale, url, datatype, key), True
+        else:
+            try:
+                await asyncio.to_thread(self._save, datatype, key, data)
+            except Exception:
+                pass
+
+        return data, False
 
     def clean(self):
         """Clean the cache by removing old records from the cache.
@@ -397,18 +609,11 @@ class PlainTextFileCache(AbstractFileCache):
         return datatype, key
 
     def _save(self, datatype, key, content):
-        filepath = self._get_filepath(datatype, key)
-        folder = os.path.dirname(filepath)
-
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content.decode('utf-8'))
+        self._write_file(self._get_filepath(datatype, key), content)
 
     def _load(self, datatype, key):
         filepath = self._get_filepath(datatype, key)
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'rb') as f:
             return f.read()
 
 
@@ -424,16 +629,1474 @@ class GzipTextFileCache(AbstractFileCache):
         return datatype, key
 
     def _save(self, datatype, key, content):
+        self._write_file(self._get_filepath(datatype, key),
+                         gzip.compress(content))
+
+    def _load(self, datatype, key):
         filepath = self._get_filepath(datatype, key)
-        folder = os.path.dirname(filepath)
+        with gzip.open(filepath, 'rb') as f:
+            return f.read()
+
+
+def import_zstandard():
+    """Import the zstandard package.
+
+    Returns
+    -------
+    module
+        The zstandard module.
+
+    Raises
+    ------
+    ImportError
+        When the zstandard package is not installed.
+
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The ZstdTextFileCache requires the zstandard package. Install "
+            "it using 'pip install pydov[zstd]'.")
+    return zstandard
+
+
+class ZstdTextFileCache(AbstractFileCache):
+    """Class for Zstandard compressed caching of downloaded XML files from
+    DOV.
+
+    DOV XML documents are small and very similar to the other documents of
+    the same datatype. A compression dictionary can be trained per datatype
+    from the documents already in the cache using `train_dictionaries`,
+    after which new documents are compressed using the dictionary. This
+    gives a much better compression ratio and faster decompression than
+    gzip.
+
+    Existing gzipped documents of a `GzipTextFileCache` in the same cache
+    directory are read transparently, and replaced by Zstandard compressed
+    documents when they are downloaded again.
+
+    This requires the optional zstandard package.
+
+    """
+
+    def __init__(self, max_age=datetime.timedelta(weeks=2), cachedir=None,
+                 level=3):
+        """Initialisation.
+
+        Parameters
+        ----------
+        max_age : datetime.timedelta, optional
+            The maximum age of a cached XML file to be valid. If the last
+            modification date of the file is before this time, it will be
+            redownloaded. Defaults to two weeks.
+        cachedir : str, optional
+            Path of the directory that will be used to save the cached XML
+            files. Be sure to use a directory that will only be used for
+            this PyDOV cache. Default to a temporary directory provided by
+            the operating system.
+        level : int, optional
+            Zstandard compression level. Defaults to 3.
+
+        Raises
+        ------
+        ImportError
+            When the zstandard package is not installed.
+
+        """
+        self._zstd = import_zstandard()
+        super().__init__(max_age=max_age, cachedir=cachedir)
+        self.level = level
+
+        self._dictionaries = {}
+        self._current_dictionaries = {}
+        self._local = local()
+        self._lock = RLock()
+
+    def _get_filepath(self, datatype, key):
+        filepath = self._get_zstd_filepath(datatype, key)
+        legacy_filepath = self._get_legacy_filepath(datatype, key)
+        if not os.path.exists(filepath) and os.path.exists(legacy_filepath):
+            return legacy_filepath
+        return filepath
+
+    def _get_zstd_filepath(self, datatype, key):
+        """Get the location on disk where the object with given datatype and
+        key is saved with Zstandard compression.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV object.
+        key : str
+            Unique and permanent object key of the DOV object.
+
+        Returns
+        -------
+        str
+            Full absolute path on disk of the Zstandard compressed object.
+
+        """
+        return os.path.join(self.cachedir, datatype, key + '.xml.zst')
+
+    def _get_legacy_filepath(self, datatype, key):
+        """Get the location on disk where the object with given datatype and
+        key is saved by a GzipTextFileCache.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV object.
+        key : str
+            Unique and permanent object key of the DOV object.
+
+        Returns
+        -------
+        str
+            Full absolute path on disk of the gzipped object.
+
+        """
+        return os.path.join(self.cachedir, datatype, key + '.xml.gz')
+
+    def _get_dictionary_dir(self, datatype):
+        """Get the directory where the compression dictionaries of the given
+        datatype are saved.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV objects.
+
+        Returns
+        -------
+        str
+            Full absolute path of the directory.
+
+        """
+        return os.path.join(self.cachedir, datatype, 'dictionaries')
+
+    def _get_type_key_from_path(self, path):
+        filename = os.path.basename(path)
+        for extension in ('.xml.zst', '.xml.gz'):
+            if filename.endswith(extension):
+                filename = filename[:-len(extension)]
+        return os.path.basename(os.path.dirname(path)), filename
+
+    def _get_dictionary(self, datatype, dict_id):
+        """Get the compression dictionary of the given datatype with the
+        given id.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV objects.
+        dict_id : int
+            Id of the dictionary, as saved in the compressed documents.
+
+        Returns
+        -------
+        zstandard.ZstdCompressionDict
+            The compression dictionary.
+
+        """
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                with open(os.path.join(self._get_dictionary_dir(datatype),
+                                       '{}.zdict'.format(dict_id)),
+                          'rb') as f:
+                    dictionary = self._zstd.ZstdCompressionDict(f.read())
+                self._dictionaries[dict_id] = dictionary
+            return dictionary
+
+    def _get_current_dictionary(self, datatype):
+        """Get the compression dictionary to compress new documents of the
+        given datatype.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV objects.
+
+        Returns
+        -------
+        zstandard.ZstdCompressionDict or None
+            The most recently trained dictionary of the datatype, or None if
+            no dictionary has been trained.
+
+        """
+        with self._lock:
+            if datatype not in self._current_dictionaries:
+                filepath = os.path.join(
+                    self._get_dictionary_dir(datatype), 'current')
+                dictionary = None
+                if os.path.exists(filepath):
+                    with open(filepath, 'r') as f:
+                        dict_id = int(f.read())
+                    dictionary = self._get_dictionary(datatype, dict_id)
+                self._current_dictionaries[datatype] = dictionary
+            return self._current_dictionaries[datatype]
+
+    def _get_compressor(self, datatype):
+        """Get a compressor for documents of the given datatype for the
+        current thread.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV objects.
+
+        Returns
+        -------
+        zstandard.ZstdCompressor
+            Compressor using the current dictionary of the datatype, if any.
+
+        """
+        dictionary = self._get_current_dictionary(datatype)
+        dict_id = dictionary.dict_id() if dictionary is not None else 0
+
+        if not hasattr(self._local, 'compressors'):
+            self._local.compressors = {}
+        compressors = self._local.compressors
+        compressor = compressors.get((datatype, dict_id))
+        if compressor is None:
+            compressor = self._zstd.ZstdCompressor(
+                level=self.level, dict_data=dictionary)
+            compressors[(datatype, dict_id)] = compressor
+        return compressor
+
+    def _get_decompressor(self, datatype, data):
+        """Get a decompressor for the given compressed document for the
+        current thread.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV object.
+        data : bytes
+            Zstandard compressed document.
+
+        Returns
+        -------
+        zstandard.ZstdDecompressor
+            Decompressor using the dictionary the document was compressed
+            with, if any.
+
+        """
+        dict_id = self._zstd.get_frame_parameters(data).dict_id
+
+        if not hasattr(self._local, 'decompressors'):
+            self._local.decompressors = {}
+        decompressors = self._local.decompressors
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id:
+                decompressor = self._zstd.ZstdDecompressor(
+                    dict_data=self._get_dictionary(datatype, dict_id))
+            else:
+                decompressor = self._zstd.ZstdDecompressor()
+            decompressors[dict_id] = decompressor
+        return decompressor
 
-        if not os.path.exists(folder):
-            os.makedirs(folder)
+    def _save(self, datatype, key, content):
+        self._write_file(self._get_zstd_filepath(datatype, key),
+                         self._get_compressor(datatype).compress(content))
 
-        with gzip.open(filepath, 'wb') as f:
-            f.write(content)
+        legacy_filepath = self._get_legacy_filepath(datatype, key)
+        if os.path.exists(legacy_filepath):
+            os.remove(legacy_filepath)
 
     def _load(self, datatype, key):
         filepath = self._get_filepath(datatype, key)
-        with gzip.open(filepath, 'rb') as f:
-            return f.read().decode('utf-8')
+        if filepath.endswith('.xml.gz'):
+            with gzip.open(filepath, 'rb') as f:
+                return f.read()
+
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        return self._get_decompressor(datatype, data).decompress(data)
+
+    def _get_datatypes(self):
+        """Get the datatypes of the documents in the cache.
+
+        Returns
+        -------
+        list of str
+            List of datatypes.
+
+        """
+        if not os.path.exists(self.cachedir):
+            return []
+        return sorted(d for d in os.listdir(self.cachedir)
+                      if os.path.isdir(os.path.join(self.cachedir, d)))
+
+    def _get_keys(self, datatype):
+        """Get the keys of the documents of the given datatype in the cache.
+
+        Parameters
+        ----------
+        datatype : str
+            Datatype of the DOV objects.
+
+        Returns
+        -------
+        list of str
+            List of keys.
+
+        """
+        keys = set()
+        for name in os.listdir(os.path.join(self.cachedir, datatype)):
+            if name.endswith(('.xml.zst', '.xml.gz')):
+                keys.add(self._get_type_key_from_path(
+                    os.path.join(self.cachedir, datatype, name))[1])
+        return sorted(keys)
+
+    def train_dictionaries(self, datatypes=None, dict_size=32*1024,
+                           max_samples=1000, min_samples=10):
+        """Train a compression dictionary per datatype from the documents in
+        the cache.
+
+        The dictionaries are saved in the cache directory and used to
+        compress the documents that are saved afterwards. Documents
+        compressed with an earlier dictionary can still be read.
+
+        Parameters
+        ----------
+        datatypes : list of str, optional
+            Datatypes to train a dictionary for. Defaults to all datatypes
+            in the cache.
+        dict_size : int, optional
+            Maximum size of the dictionaries, in bytes. Defaults to 32 KiB.
+        max_samples : int, optional
+            Maximum number of documents to train each dictionary with.
+            Defaults to 1000.
+        min_samples : int, optional
+            Minimum number of documents in the cache to train a dictionary
+            for a datatype. Defaults to 10.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping the datatypes to the ids of their newly
+            trained compression dictionary.
+
+        """
+        if datatypes is None:
+            datatypes = self._get_datatypes()
+
+        trained = {}
+        for datatype in datatypes:
+            if not os.path.isdir(os.path.join(self.cachedir, datatype)):
+                continue
+
+            samples = []
+            for key in self._get_keys(datatype)[:max_samples]:
+                try:
+                    samples.append(self._load(datatype, key))
+                except Exception:
+                    pass
+
+            if len(samples) < min_samples:
+                continue
+
+            dictionary = self._zstd.train_dictionary(dict_size, samples)
+            dict_id = dictionary.dict_id()
+
+            dictionary_dir = self._get_dictionary_dir(datatype)
+            if not os.path.exists(dictionary_dir):
+                os.makedirs(dictionary_dir)
+
+            with open(os.path.join(dictionary_dir,
+                                   '{}.zdict'.format(dict_id)), 'wb') as f:
+                f.write(dictionary.as_bytes())
+            with open(os.path.join(dictionary_dir, 'current'), 'w') as f:
+                f.write(str(dict_id))
+
+            with self._lock:
+                self._dictionaries[dict_id] = dictionary
+                self._current_dictionaries[datatype] = dictionary
+            trained[datatype] = dict_id
+
+        return trained
+
+    def clean(self):
+        """Clean the cache by removing old records from the cache.
+
+        This removes all documents older than the maximum age, but keeps
+        the compression dictionaries.
+
+        """
+        for datatype in self._get_datatypes():
+            for key in self._get_keys(datatype):
+                if not self._is_valid(datatype, key):
+                    os.remove(self._get_filepath(datatype, key))
+
+    def remove(self):
+        """Remove the entire cache directory, including the compression
+        dictionaries."""
+        super().remove()
+        with self._lock:
+            self._dictionaries = {}
+            self._current_dictionaries = {}
+        self._local = local()
+
+
+class _SqliteDatabase(object):
+    """Class managing the connections to an SQLite database.
+
+    SQLite connections cannot be shared between threads, so every thread
+    opens its own connection. The database uses write-ahead logging, so it
+    can be read by multiple threads and processes while it is written.
+
+    """
+
+    def __init__(self, path, statements=()):
+        """Initialisation.
+
+        Parameters
+        ----------
+        path : str
+            Path of the database file.
+        statements : tuple of str, optional
+            SQL statements to execute when opening a connection, to create
+            the tables and indexes if they do not exist already.
+
+        """
+        self.path = path
+        self.statements = statements
+
+        self._local = local()
+        self._connections = []
+        self._lock = Lock()
+
+    def __getstate__(self):
+        return self.path, self.statements
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def connect(self):
+        """Get the connection to the database of the current thread,
+        creating the database on first use.
+
+        Returns
+        -------
+        sqlite3.Connection
+            Connection to the database.
+
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return connection
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # connections are only shared with the thread calling close()
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None,
+            check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in self.statements:
+            connection.execute(statement)
+
+        self._local.connection = connection
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = local()
+
+
+class SqliteCache(AbstractFileCache):
+    """Class for caching downloaded XML files from DOV in a single SQLite
+    database.
+
+    The XML documents are stored zlib-compressed, together with their
+    datatype, key, download time and uncompressed size. Checking whether a
+    cached version is valid is a single lookup on the primary key instead
+    of a filesystem stat, and cleaning the cache is a single DELETE
+    statement. The database uses write-ahead logging so it can be read
+    while a document is being saved.
+
+    """
+
+    def __init__(self, max_age=datetime.timedelta(weeks=2), cachedir=None):
+        """Initialisation.
+
+        Set up the instance variables and create the cache directory and
+        database if they do not exist already.
+
+        Parameters
+        ----------
+        max_age : datetime.timedelta, optional
+            The maximum age of a cached XML document to be valid. If it was
+            downloaded before this time, it will be redownloaded. Defaults
+            to two weeks.
+        cachedir : str, optional
+            Path of the directory that will be used to save the database.
+            Be sure to use a directory that will only be used for this
+            cache. Default to a temporary directory provided by the
+            operating system.
+
+        """
+        if not cachedir:
+            cachedir = os.path.join(tempfile.gettempdir(), 'pydov_sqlite')
+        super().__init__(max_age=max_age, cachedir=cachedir)
+
+        self.database = os.path.join(self.cachedir, 'pydov.sqlite')
+        self._database = _SqliteDatabase(self.database, (
+            'CREATE TABLE IF NOT EXISTS xml_cache ('
+            'datatype TEXT NOT NULL, '
+            'key TEXT NOT NULL, '
+            'fetched_at REAL NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'content BLOB NOT NULL, '
+            'PRIMARY KEY (datatype, key))',
+            'CREATE INDEX IF NOT EXISTS xml_cache_fetched_at '
+            'ON xml_cache (fetched_at)'))
+
+    def _get_connection(self):
+        """Get the connection to the database of the current thread.
+
+        Returns
+        -------
+        sqlite3.Connection
+            Connection to the database.
+
+        """
+        return self._database.connect()
+
+    def _get_min_fetched_at(self):
+        """Get the oldest download time of a valid cached version.
+
+        Returns
+        -------
+        float
+            Timestamp, in seconds since the epoch.
+
+        """
+        return time.time() - self.max_age.total_seconds()
+
+    def _is_valid(self, datatype, key):
+        return self._get_connection().execute(
+            'SELECT 1 FROM xml_cache '
+            'WHERE datatype = ? AND key = ? AND fetched_at >= ?',
+            (datatype, key, self._get_min_fetched_at())).fetchone() \
+            is not None
+
+    def _is_stale(self, datatype, key):
+        return self._get_connection().execute(
+            'SELECT 1 FROM xml_cache '
+            'WHERE datatype = ? AND key = ? AND fetched_at < ?',
+            (datatype, key, self._get_min_fetched_at())).fetchone() \
+            is not None
+
+    def _load(self, datatype, key):
+        content, = self._get_connection().execute(
+            'SELECT content FROM xml_cache WHERE datatype = ? AND key = ?',
+            (datatype, key)).fetchone()
+        return zlib.decompress(content)
+
+    def _save(self, datatype, key, content):
+        self._get_connection().execute(
+            'INSERT OR REPLACE INTO xml_cache '
+            '(datatype, key, fetched_at, size, content) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (datatype, key, time.time(), len(content),
+             zlib.compress(content)))
+
+    def clean(self):
+        """Clean the cache by removing all records older than the maximum
+        age from the cache."""
+        if os.path.exists(self.database):
+            self._get_connection().execute(
+                'DELETE FROM xml_cache WHERE fetched_at < ?',
+                (self._get_min_fetched_at(),))
+
+    def remove(self):
+        """Close all connections and remove the entire cache directory."""
+        self._database.close()
+
+        if os.path.exists(self.cachedir):
+            shutil.rmtree(self.cachedir)
+
+
+class TieredCache(AbstractCache):
+    """Class for caching downloaded XML files from DOV in memory, in front
+    of another cache.
+
+    The most recently used XML documents are kept in memory, up to a
+    maximum total size. Documents not in memory are requested from the
+    wrapped cache, which in turn loads them from disk or downloads them.
+    This avoids reading and decompressing the same documents over and over
+    again in long-running processes.
+
+    Documents kept in memory longer than the maximum age of the wrapped
+    cache are requested from the wrapped cache again. Stale documents
+    returned by the wrapped cache after a failed remote request are never
+    kept in memory.
+
+    Attributes
+    ----------
+    cache : pydov.util.caching.AbstractCache
+        The wrapped cache.
+    max_size : int
+        Maximum total size of the documents kept in memory, in bytes.
+    hits : int
+        Number of documents returned from memory.
+    misses : int
+        Number of documents requested from the wrapped cache.
+
+    """
+
+    def __init__(self, cache, max_size=64*1024**2):
+        """Initialisation.
+
+        Parameters
+        ----------
+        cache : pydov.util.caching.AbstractCache
+            The cache to wrap, for example a `GzipTextFileCache`.
+        max_size : int, optional
+            Maximum total size of the documents kept in memory, in bytes.
+            When more documents are added, the least recently used ones are
+            removed from memory. Defaults to 64 MiB.
+
+        """
+        # stale_on_error is delegated to the wrapped cache, so the base
+        # initialisation is not used
+        self.cache = cache
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._documents = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    @property
+    def stale_on_error(self):
+        return self.cache.stale_on_error
+
+    @stale_on_error.setter
+    def stale_on_error(self, value):
+        self.cache.stale_on_error = value
+
+    @property
+    def size(self):
+        """Total size of the documents kept in memory, in bytes."""
+        return self._size
+
+    def _get_memory(self, url):
+        """Get the XML data of the given URL from memory.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of this DOV object as bytes, or None if it is
+            not kept in memory.
+
+        """
+        max_age = getattr(self.cache, 'max_age', None)
+
+        with self._lock:
+            entry = self._documents.get(url)
+            if entry is not None and max_age is not None and \
+                    time.time() - entry[1] > max_age.total_seconds():
+                del self._documents[url]
+                self._size -= len(entry[0])
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._documents.move_to_end(url)
+            self.hits += 1
+            return entry[0]
+
+    def _save_memory(self, url, data):
+        """Keep the XML data of the given URL in memory, removing the least
+        recently used documents if the maximum size is exceeded.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+        data : bytes
+            The raw XML data of this DOV object as bytes.
+
+        """
+        if len(data) > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._documents.pop(url, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+
+            self._documents[url] = (data, time.time())
+            self._size += len(data)
+
+            while self._size > self.max_size:
+                _, removed = self._documents.popitem(last=False)
+                self._size -= len(removed[0])
+
+    def _get_injected(self, url):
+        """Get the XML data from the inject hooks, or from memory.
+
+        Parameters
+        ----------
+        url : str
+            Permanent URL to a DOV object.
+
+        Returns
+        -------
+        xml : bytes or None
+            The raw XML data of this DOV object as bytes, or None if it
+            should be requested from the wrapped cache.
+
+        """
+        data = HookRunner.execute_inject_xml_response(url)
+        if data is None:
+            data = self._get_memory(url)
+            if data is not None:
+                self._emit_cache_hit(url)
+
+        if data is not None:
+            HookRunner.execute_xml_received(url, data)
+        return data
+
+    def get(self, url, session=None):
+        return self._fetch(url, session)[0]
+
+    async def get_async(self, url, session):
+        return (await self._fetch_async(url, session))[0]
+
+    def _fetch(self, url, session=None):
+        data = self._get_injected(url)
+        if data is not None:
+            return data, False
+
+        data, stale = self.cache._fetch(url, session)
+        if not stale:
+            self._save_memory(url, data)
+        return data, stale
+
+    async def _fetch_async(self, url, session):
+        data = self._get_injected(url)
+        if data is not None:
+            return data, False
+
+        data, stale = await self.cache._fetch_async(url, session)
+        if not stale:
+            self._save_memory(url, data)
+        return data, stale
+
+    def clear(self):
+        """Remove all documents from memory and reset the counters, without
+        changing the wrapped cache."""
+        with self._lock:
+            self._documents.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def clean(self):
+        """Remove all documents from memory and clean the wrapped cache."""
+        self.clear()
+        self.cache.clean()
+
+    def remove(self):
+        """Remove all documents from memory and remove the wrapped cache."""
+        self.clear()
+        self.cache.remove()
+
+
+class ParsedDataCache(object):
+    """Class for caching the values parsed from the XML documents of DOV
+    objects.
+
+    For every DOV object, the values of the fields extracted from its XML
+    document and the values of its subtypes are saved in a single SQLite
+    database, as compressed columns. They are keyed by the permanent key of
+    the object and a fingerprint of the field definitions of its type, so
+    types with extra fields or other subtypes don't share their values.
+    Values saved by another version of pydov are never reused.
+
+    Only enable this cache in a cache directory you trust, since the values
+    are saved using pickle.
+
+    """
+
+    def __init__(self, max_age=datetime.timedelta(weeks=2), cachedir=None):
+        """Initialisation.
+
+        Parameters
+        ----------
+        max_age : datetime.timedelta, optional
+            The maximum age of the cached values to be valid. If they were
+            parsed before this time, the XML document will be parsed
+            again. Defaults to two weeks.
+        cachedir : str, optional
+            Path of the directory that will be used to save the database.
+            Be sure to use a directory that will only be used for this
+            cache. Default to a temporary directory provided by the
+            operating system.
+
+        """
+        if cachedir:
+            self.cachedir = cachedir
+        else:
+            self.cachedir = os.path.join(tempfile.gettempdir(),
+                                         'pydov_parsed')
+        self.max_age = max_age
+
+        self.database = os.path.join(self.cachedir, 'pydov.sqlite')
+        self._database = _SqliteDatabase(self.database, (
+            'CREATE TABLE IF NOT EXISTS parsed_cache ('
+            'version TEXT NOT NULL, '
+            'fingerprint TEXT NOT NULL, '
+            'key TEXT NOT NULL, '
+            'parsed_at REAL NOT NULL, '
+            'content BLOB NOT NULL, '
+            'PRIMARY KEY (version, fingerprint, key))',
+            'CREATE INDEX IF NOT EXISTS parsed_cache_parsed_at '
+            'ON parsed_cache (parsed_at)'))
+
+    def _get_min_parsed_at(self):
+        """Get the oldest parse time of valid cached values.
+
+        Returns
+        -------
+        float
+            Timestamp, in seconds since the epoch.
+
+        """
+        return time.time() - self.max_age.total_seconds()
+
+    def get(self, fingerprint, key):
+        """Get the cached values of the given object.
+
+        Parameters
+        ----------
+        fingerprint : str
+            Fingerprint of the field definitions of the type.
+        key : str
+            Permanent key of the DOV object.
+
+        Returns
+        -------
+        object or None
+            The cached values, or None if no valid values exist in the
+            cache or the cache cannot be read, in which case a
+            ParsedCacheWarning is emitted.
+
+        """
+        try:
+            row = self._database.connect().execute(
+                'SELECT content FROM parsed_cache WHERE version = ? AND '
+                'fingerprint = ? AND key = ? AND parsed_at >= ?',
+                (pydov.__version__, fingerprint, key,
+                 self._get_min_parsed_at())).fetchone()
+            if row is None:
+                return None
+            return pickle.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, zlib.error, pickle.UnpicklingError) as e:
+            self._warn('read', e)
+            return None
+
+    def save(self, fingerprint, key, values):
+        """Save the values of the given object in the cache.
+
+        Parameters
+        ----------
+        fingerprint : str
+            Fingerprint of the field definitions of the type.
+        key : str
+            Permanent key of the DOV object.
+        values : object
+            The values to save, which should be picklable. If they cannot be
+            saved, a ParsedCacheWarning is emitted.
+
+        """
+        try:
+            content = zlib.compress(pickle.dumps(
+                values, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError) as e:
+            self._warn('write', e)
+            return
+
+        try:
+            self._database.connect().execute(
+                'INSERT OR REPLACE INTO parsed_cache '
+                '(version, fingerprint, key, parsed_at, content) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (pydov.__version__, fingerprint, key, time.time(), content))
+        except sqlite3.Error as e:
+            self._warn('write', e)
+
+    def _warn(self, operation, error):
+        """Emit a ParsedCacheWarning for an error using the cache.
+
+        Parameters
+        ----------
+        operation : str
+            The operation that failed, 'read' or 'write'.
+        error : Exception
+            The error raised.
+
+        """
+        warnings.warn((
+            "Failed to {} the parsed data cache in {}: {}. The XML documents "
+            "are parsed instead.".format(operation, self.cachedir, error)),
+            ParsedCacheWarning)
+
+    def clean(self):
+        """Clean the cache by removing all values older than the maximum
+        age and the values saved by other versions of pydov."""
+        if os.path.exists(self.database):
+            self._database.connect().execute(
+                'DELETE FROM parsed_cache '
+                'WHERE parsed_at < ? OR version != ?',
+                (self._get_min_parsed_at(), pydov.__version__))
+
+    def remove(self):
+        """Close all connections and remove the entire cache directory."""
+        self._database.close()
+
+        if os.path.exists(self.cachedir):
+            shutil.rmtree(self.cachedir)
+
+
+class WfsResponseCache(object):
+    """Class for filebased caching of WFS GetFeature responses.
+
+    Responses are stored gzipped on disk, keyed by a hash of the GetFeature
+    request and the URL of the WFS service. The hash of the request is the
+    same as the one used by the RepeatableLogRecorder hook to archive the
+    responses.
+
+    Attributes
+    ----------
+    stale_on_error : bool, default to True
+        Whether to return stale responses from the cache in case of a network
+        error prevents requesting a fresh copy.
+
+    """
+
+    def __init__(self, max_age=datetime.timedelta(hours=1), cachedir=None,
+                 max_size=512*1024**2):
+        """Initialisation.
+
+        Set up the instance variables and create the cache directory if
+        it does not exists already.
+
+        Parameters
+        ----------
+        max_age : datetime.timedelta, optional
+            The maximum age of a cached response to be valid. If the last
+            modification date of the file is before this time, the request
+            will be executed again. Defaults to one hour.
+        cachedir : str, optional
+            Path of the directory that will be used to save the cached
+            responses. Be sure to use a directory that will only be used for
+            this cache. Default to a temporary directory provided by the
+            operating system.
+        max_size : int, optional
+            Maximum size of the cache on disk, in bytes. When the cache grows
+            larger, the least recently saved responses are removed. Defaults
+            to 512 MiB. Use None for no limit.
+
+        """
+        self.stale_on_error = True
+
+        if cachedir:
+            self.cachedir = cachedir
+        else:
+            self.cachedir = os.path.join(tempfile.gettempdir(), 'pydov_wfs')
+        self.max_age = max_age
+        self.max_size = max_size
+
+        self._lock = Lock()
+
+        try:
+            if not os.path.exists(self.cachedir):
+                os.makedirs(self.cachedir)
+        except Exception:
+            pass
+
+    def _get_key(self, baseurl, get_feature_request):
+        """Get the key of the response to the given request.
+
+        Parameters
+        ----------
+        baseurl : str
+            Base URL of the WFS service.
+        get_feature_request : etree.Element
+            XML element representing the WFS GetFeature request.
+
+        Returns
+        -------
+        str
+            Key of the response in the cache.
+
+        """
+        return '{}_{}'.format(
+            md5(baseurl.encode('utf8')).hexdigest()[:8],
+            get_wfs_getfeature_request_hash(get_feature_request))
+
+    def _get_filepath(self, key):
+        """Get the location on disk where the response with the given key is
+        to be saved.
+
+        Parameters
+        ----------
+        key : str
+            Key of the response in the cache.
+
+        Returns
+        -------
+        str
+            Full absolute path on disk where the response is to be saved.
+
+        """
+        return os.path.join(self.cachedir, key + '.xml.gz')
+
+    def _is_valid(self, key):
+        """Check if a valid version of the response exists in the cache.
+
+        Parameters
+        ----------
+        key : str
+            Key of the response in the cache.
+
+        Returns
+        -------
+        bool
+            True if a valid cached version exists, False otherwise.
+
+        """
+        filepath = self._get_filepath(key)
+        if not os.path.exists(filepath):
+            return False
+
+        last_modification = datetime.datetime.fromtimestamp(
+            os.path.getmtime(filepath))
+        return (datetime.datetime.now() - last_modification) <= self.max_age
+
+    def _load(self, key):
+        """Read a cached response from disk.
+
+        Parameters
+        ----------
+        key : str
+            Key of the response in the cache.
+
+        Returns
+        -------
+        bytes
+            The cached WFS GetFeature response.
+
+        """
+        with gzip.open(self._get_filepath(key), 'rb') as f:
+            return f.read()
+
+    def _save(self, key, content):
+        """Save the given response in the cache.
+
+        The response is written to a temporary file first, so concurrent
+        readers never see a partially written response.
+
+        Parameters
+        ----------
+        key : str
+            Key of the response in the cache.
+        content : bytes
+            The WFS GetFeature response.
+
+        """
+        filepath = self._get_filepath(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cachedir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                gz.write(content)
+        os.replace(tmp_path, filepath)
+
+        if self.max_size is not None:
+            self._limit_size()
+
+    def _limit_size(self):
+        """Remove the least recently saved responses until the size of the
+        cache is below its maximum size."""
+        with self._lock:
+            files = []
+            for name in os.listdir(self.cachedir):
+                if name.endswith('.xml.gz'):
+                    stat = os.stat(os.path.join(self.cachedir, name))
+                    files.append((stat.st_mtime, stat.st_size, name))
+
+            size = sum(f[1] for f in files)
+            for mtime, file_size, name in sorted(files):
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(os.path.join(self.cachedir, name))
+                except OSError:
+                    pass
+                size -= file_size
+
+    @staticmethod
+    def _is_feature_collection(response):
+        """Check whether the response is a valid FeatureCollection, in
+        contrast to for example an exception report.
+
+        Parameters
+        ----------
+        response : bytes
+            The WFS GetFeature response.
+
+        Returns
+        -------
+        bool
+            True if the response is a FeatureCollection, False otherwise.
+
+        """
+        return re.search(rb'<[^>]*FeatureCollection[^>]*numberReturned=',
+                         response[:4096]) is not None
+
+    def _use_stale(self, key, baseurl):
+        """Check whether a stale response can be used instead of a failed
+        request, and emit a WfsStaleWarning if so.
+
+        Parameters
+        ----------
+        key : str
+            Key of the response in the cache.
+        baseurl : str
+            Base URL of the WFS service.
+
+        Returns
+        -------
+        bool
+            True if a stale response should be used, False otherwise.
+
+        """
+        if not self.stale_on_error or not os.path.exists(
+                self._get_filepath(key)):
+            return False
+
+        warnings.warn((
+            "Failed to execute the WFS GetFeature request on {}, using older "
+            "stale response from cache. Resulting dataframe will be "
+            "out-of-date.".format(baseurl)), WfsStaleWarning)
+        return True
+
+    def get(self, baseurl, get_feature_request, session=None):
+        """Get the response to the given WFS GetFeature request.
+
+        Because of parallel processing, this method will be called
+        simultaneously from multiple threads.
+
+        If a valid version exists in the cache, it will be loaded and
+        returned. If no valid version exists, the request will be executed,
+        the response saved in the cache and returned. If the request fails
+        or the WFS service returns an error, an older stale version from the
+        cache is returned instead, if available.
+
+        Parameters
+        ----------
+        baseurl : str
+            Base URL of the WFS service.
+        get_feature_request : etree.Element
+            XML element representing the WFS GetFeature request.
+        session : requests.Session
+            Session to use to perform HTTP requests for data. Defaults to None,
+            which means a new session will be created for each request.
+
+        Returns
+        -------
+        bytes
+            Response of the WFS service.
+
+        """
+        key = self._get_key(baseurl, get_feature_request)
+
+        if self._is_valid(key):
+            try:
+                return self._load(key)
+            except Exception:
+                pass
+
+        try:
+            data = wfs_get_feature(baseurl, get_feature_request, session)
+        except RequestException:
+            if not self._use_stale(key, baseurl):
+                raise
+            return self._load(key)
+
+        if self._is_feature_collection(data):
+            try:
+                self._save(key, data)
+            except Exception:
+                pass
+        elif self._use_stale(key, baseurl):
+            return self._load(key)
+
+        return data
+
+    def clean(self):
+        """Clean the cache by removing all responses older than the maximum
+        age from the cache."""
+        if os.path.exists(self.cachedir):
+            for name in os.listdir(self.cachedir):
+                if name.endswith('.xml.gz') and not self._is_valid(
+                        name[:-len('.xml.gz')]):
+                    os.remove(os.path.join(self.cachedir, name))
+
+    def remove(self):
+        """Remove the entire cache directory."""
+        if os.path.exists(self.cachedir):
+            shutil.rmtree(self.cachedir)
+
+
+class MetadataCache(object):
+    """Class for caching the metadata of the WFS layers, i.e. the WFS
+    capabilities, DescribeFeatureType responses, ISO metadata and feature
+    catalogues.
+
+    The raw metadata documents are stored gzipped on disk, so they can be
+    reused by subsequent processes. The documents are saved in a
+    subdirectory per pydov version, so upgrading pydov does not reuse
+    documents saved by another version.
+
+    Additionally, the parsed metadata is shared process-wide between all
+    search instances of the same layer.
+
+    """
+
+    def __init__(self, max_age=datetime.timedelta(days=1), cachedir=None):
+        """Initialisation.
+
+        Set up the instance variables and create the cache directory if
+        it does not exists already.
+
+        Parameters
+        ----------
+        max_age : datetime.timedelta, optional
+            The maximum age of cached metadata to be valid. If the last
+            modification date of the file is before this time, the metadata
+            will be requested again. Defaults to one day.
+        cachedir : str, optional
+            Path of the directory that will be used to save the cached
+            metadata documents. Be sure to use a directory that will only be
+            used for this cache. Default to a temporary directory provided by
+            the operating system.
+
+        """
+        if cachedir:
+            self.cachedir = cachedir
+        else:
+            self.cachedir = os.path.join(
+                tempfile.gettempdir(), 'pydov_metadata')
+        self.max_age = max_age
+
+        self._shared = {}
+        self._locks = {}
+        self._lock = Lock()
+
+        try:
+            if not os.path.exists(self._get_versiondir()):
+                os.makedirs(self._get_versiondir())
+        except Exception:
+            pass
+
+    def _get_versiondir(self):
+        """Get the directory containing the metadata documents saved by the
+        current version of pydov.
+
+        Returns
+        -------
+        str
+            Full absolute path of the directory.
+
+        """
+        return os.path.join(self.cachedir, pydov.__version__)
+
+    def _get_filepath(self, url):
+        """Get the location on disk where the metadata document of the given
+        URL is to be saved.
+
+        Parameters
+        ----------
+        url : str
+            URL of the metadata document.
+
+        Returns
+        -------
+        str
+            Full absolute path on disk where the document is to be saved.
+
+        """
+        return os.path.join(self._get_versiondir(),
+                            md5(url.encode('utf8')).hexdigest() + '.xml.gz')
+
+    def _is_valid(self, filepath):
+        """Check if a valid version of the document exists on disk.
+
+        Parameters
+        ----------
+        filepath : str
+            Full absolute path of the cached document.
+
+        Returns
+        -------
+        bool
+            True if a valid cached version exists, False otherwise.
+
+        """
+        if not os.path.exists(filepath):
+            return False
+
+        last_modification = datetime.datetime.fromtimestamp(
+            os.path.getmtime(filepath))
+        return (datetime.datetime.now() - last_modification) <= self.max_age
+
+    def _get_remote(self, url):
+        """Request the metadata document from the given URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of the metadata document.
+
+        Returns
+        -------
+        response : bytes
+            The metadata document.
+        valid : bool
+            Whether the request succeeded and the document can be saved in
+            the cache.
+
+        """
+        request = pydov.session.get(url)
+        return request.content, request.status_code == 200
+
+    def get(self, url):
+        """Get the metadata document of the given URL.
+
+        If a valid version exists in the cache, it will be loaded and
+        returned. If no valid version exists, the document will be requested,
+        saved in the cache and returned.
+
+        Parameters
+        ----------
+        url : str
+            URL of the metadata document.
+
+        Returns
+        -------
+        bytes
+            The metadata document.
+
+        """
+        filepath = self._get_filepath(url)
+
+        if self._is_valid(filepath):
+            try:
+                with gzip.open(filepath, 'rb') as f:
+                    return f.read()
+            except Exception:
+                pass
+
+        response, valid = self._get_remote(url)
+
+        if valid:
+            try:
+                os.makedirs(self._get_versiondir(), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self._get_versiondir(), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                        gz.write(response)
+                os.replace(tmp_path, filepath)
+            except Exception:
+                pass
+
+        return response
+
+    def get_shared(self, key, build):
+        """Get the parsed metadata with the given key, shared process-wide.
+
+        If no valid parsed version exists, it is built by calling `build`.
+        Concurrent calls for the same key will wait for the first one to
+        complete, calls for different keys can run in parallel.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the parsed metadata, i.e. the type of metadata and the
+            name of the layer it describes.
+        build : function
+            Function without parameters, returning the parsed metadata.
+
+        Returns
+        -------
+        object
+            The parsed metadata.
+
+        """
+        with self._lock:
+            lock = self._locks.setdefault(key, Lock())
+
+        with lock:
+            if key in self._shared:
+                timestamp, value = self._shared[key]
+                if (datetime.datetime.now() - timestamp) <= self.max_age:
+                    return value
+
+            value = build()
+            self._shared[key] = (datetime.datetime.now(), value)
+            return value
+
+    def clean(self):
+        """Clean the cache by removing all metadata older than the maximum
+        age, as well as the metadata saved by other versions of pydov."""
+        if os.path.exists(self.cachedir):
+            for name in os.listdir(self.cachedir):
+                path = os.path.join(self.cachedir, name)
+                if path != self._get_versiondir() and os.path.isdir(path):
+                    shutil.rmtree(path)
+
+        if os.path.exists(self._get_versiondir()):
+            for name in os.listdir(self._get_versiondir()):
+                filepath = os.path.join(self._get_versiondir(), name)
+                if not self._is_valid(filepath):
+                    os.remove(filepath)
+
+        with self._lock:
+            now = datetime.datetime.now()
+            for key in list(self._shared.keys()):
+                if (now - self._shared[key][0]) > self.max_age:
+                    del self._shared[key]
+
+    def remove(self):
+        """Remove the entire cache directory and all shared parsed
+        metadata."""
+        if os.path.exists(self.cachedir):
+            shutil.rmtree(self.cachedir)
+
+        with self._lock:
+            self._shared.clear()
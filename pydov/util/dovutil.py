@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """Module grouping utility functions for DOV XML services."""
+import asyncio
 import os
 import requests
+import time
 
 from owslib.etree import etree
 
+from pydov.util import net
 from pydov.util.errors import RemoteFetchError, XmlParseError
 from pydov.util.hooks import HookRunner
-from pydov.util.net import SessionFactory
+from pydov.util.net import SessionFactory, send_limited
 
 import re
 
@@ -60,7 +63,7 @@ def build_dov_sparql_request(query):
     )
 
 
-def get_remote_url(url, session=None):
+def get_remote_url(url, session=None, limit_concurrency=False):
     """Request the URL from the remote service and return its contents.
 
     Parameters
@@ -70,6 +73,9 @@ def get_remote_url(url, session=None):
     session : requests.Session
         Session to use to perform HTTP requests for data. Defaults to None,
         which means a new session will be created for each request.
+    limit_concurrency : bool, optional
+        Whether to limit the number of concurrent requests using the adaptive
+        concurrency limiter, defaults to False.
 
     Returns
     -------
@@ -80,12 +86,72 @@ def get_remote_url(url, session=None):
     if session is None:
         session = SessionFactory.get_session()
 
-    request = session.get(url)
+    if limit_concurrency:
+        request = send_limited(session, 'GET', url)
+    else:
+        request = session.get(url)
     if request.status_code != 200:
         raise RemoteFetchError("Failed to fetch data at {}".format(url))
 
-    request.encoding = 'utf-8'
-    return request.text.encode('utf8')
+    return request.content
+
+
+async def get_remote_url_async(url, session):
+    """Asynchronously request the URL from the remote service and return its
+    contents.
+
+    The number of concurrent requests is limited by the adaptive
+    async_concurrency_limiter. Connection errors, timeouts and HTTP 429 or
+    503 responses are reported to the limiter and retried with exponential
+    backoff, consistent with the retry-logic of the synchronous sessions.
+    The request slot is released while waiting to retry.
+
+    Parameters
+    ----------
+    url : str
+        URL to download.
+    session : aiohttp.ClientSession
+        Async session to use to perform HTTP requests for data.
+
+    Returns
+    -------
+    xml : bytes
+        The raw XML data as bytes.
+
+    """
+    import aiohttp
+
+    limiter = net.async_concurrency_limiter
+
+    for attempt in range(11):
+        if attempt > 0:
+            await asyncio.sleep(min(2 ** (attempt - 1), 120))
+
+        if limiter is not None:
+            await limiter.acquire_async()
+        start = time.monotonic()
+        latency, success = None, True
+
+        try:
+            async with session.get(url) as response:
+                if response.status in (429, 503):
+                    latency, success = time.monotonic() - start, False
+                    continue
+                if response.status != 200:
+                    raise RemoteFetchError(
+                        "Failed to fetch data at {}".format(url))
+                data = await response.read()
+                latency = time.monotonic() - start
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            latency, success = time.monotonic() - start, False
+            continue
+        finally:
+            if limiter is not None:
+                limiter.release(latency, success)
+
+        return data
+
+    raise RemoteFetchError("Failed to fetch data at {}".format(url))
 
 
 def get_remote_request(request, session=None):
@@ -113,8 +179,7 @@ def get_remote_request(request, session=None):
         raise RemoteFetchError("Failed to fetch data at {}".format(
             req.url))
 
-    req.encoding = 'utf-8'
-    return req.text.encode('utf8')
+    return req.content
 
 
 def get_dov_xml(url, session=None):
@@ -137,7 +202,34 @@ def get_dov_xml(url, session=None):
     response = HookRunner.execute_inject_xml_response(url)
 
     if response is None:
-        response = get_remote_url(url, session)
+        response = get_remote_url(url, session, limit_concurrency=True)
+
+    HookRunner.execute_xml_received(url, response)
+
+    return response
+
+
+async def get_dov_xml_async(url, session):
+    """Asynchronously request the XML from the remote DOV webservices and
+    return it.
+
+    Parameters
+    ----------
+    url : str
+        URL of the DOV object to download.
+    session : aiohttp.ClientSession
+        Async session to use to perform HTTP requests for data.
+
+    Returns
+    -------
+    xml : bytes
+        The raw XML data of this DOV object as bytes.
+
+    """
+    response = HookRunner.execute_inject_xml_response(url)
+
+    if response is None:
+        response = await get_remote_url_async(url, session)
 
     HookRunner.execute_xml_received(url, response)
 
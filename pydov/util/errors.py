@@ -67,6 +67,17 @@ class XmlStaleWarning(DOVWarning):
     in an out-of-date dataframe."""
 
 
+class WfsStaleWarning(DOVWarning):
+    """Emitted when a WFS GetFeature request fails and an older stale
+    response is used from the WFS response cache, resulting in an out-of-date
+    dataframe."""
+
+
+class ParsedCacheWarning(DOVWarning):
+    """Emitted when the parsed data cache cannot be read or written. The XML
+    documents are parsed instead, so the dataframe is not affected."""
+
+
 class XmlParseWarning(DOVWarning):
     """Emitted when the failure to parse an XML document results in
     an incomplete dataframe."""
@@ -76,3 +87,9 @@ class DataParseWarning(DOVWarning):
     """Emitted when some data retrieved from DOV failed to be parsed according
     to the datatypes in pydov. The data that failed to be parsed is removed,
     resulting in an incomplete dataframe."""
+
+
+class DataTypeWarning(DOVWarning):
+    """Emitted when a column of a typed dataframe cannot be converted to the
+    datatype of its field. The column is returned with the datatype inferred
+    by pandas instead."""
@@ -48,6 +48,24 @@ class Hooks(list):
         """
         return (h for h in self if isinstance(h, AbstractInjectHook))
 
+    def has_xml_hooks(self):
+        """Check whether any of the registered hooks needs the XML documents
+        of the DOV objects, i.e. an inject hook or a read hook implementing
+        `xml_received`.
+
+        Returns
+        -------
+        bool
+            True if any registered hook needs the XML documents, False
+            otherwise.
+
+        """
+        return any(
+            isinstance(h, AbstractInjectHook) or (
+                isinstance(h, AbstractReadHook) and
+                type(h).xml_received is not AbstractReadHook.xml_received)
+            for h in self)
+
 
 class HookRunner(object):
     """Class for executing registered hooks."""
@@ -132,6 +150,26 @@ class HookRunner(object):
         """
         HookRunner.__execute_read('wfs_search_init', [params])
 
+    @staticmethod
+    def execute_wfs_search_hits(number_matched, number_expected,
+                                number_pages):
+        """Execute the wfs_search_hits method for all registered hooks.
+
+        Parameters
+        ----------
+        number_matched : int
+            The number of features matched by the WFS search query.
+        number_expected : int
+            The number of features that will be returned by the WFS search,
+            taking into account the maximum number of features requested.
+        number_pages : int
+            The number of WFS GetFeature requests that will be issued to
+            retrieve the features.
+
+        """
+        HookRunner.__execute_read(
+            'wfs_search_hits', [number_matched, number_expected, number_pages])
+
     @staticmethod
     def execute_wfs_search_result(number_matched, number_returned):
         """Execute the wfs_search_result method for all registered hooks.
@@ -189,6 +227,17 @@ class HookRunner(object):
         """
         HookRunner.__execute_read('xml_cache_hit', [pkey_object])
 
+    @staticmethod
+    def execute_parsed_cache_hit(pkey_object):
+        """Execute the parsed_cache_hit method for all registered hooks.
+
+        Parameters
+        ----------
+        pkey_object : str
+            Permanent key of the requested object.
+        """
+        HookRunner.__execute_read('parsed_cache_hit', [pkey_object])
+
     @staticmethod
     def execute_xml_stale_hit(pkey_object):
         """Execute the xml_stale_hit method for all registered hooks.
@@ -225,6 +274,23 @@ class HookRunner(object):
         """
         HookRunner.__execute_read('xml_downloaded', [pkey_object])
 
+    @staticmethod
+    def execute_concurrency_changed(limit, latency_p50, latency_p95):
+        """Execute the concurrency_changed method for all registered hooks.
+
+        Parameters
+        ----------
+        limit : int
+            The new maximum number of concurrent requests.
+        latency_p50 : float or None
+            The observed median request latency, in seconds.
+        latency_p95 : float or None
+            The observed 95th percentile request latency, in seconds.
+
+        """
+        HookRunner.__execute_read(
+            'concurrency_changed', [limit, latency_p50, latency_p95])
+
     @staticmethod
     def execute_inject_meta_response(url):
         """Execute the inject_meta_response method for all registered hooks.
@@ -340,6 +406,28 @@ class AbstractReadHook(object):
         """
         pass
 
+    def wfs_search_hits(self, number_matched, number_expected,
+                        number_pages):
+        """Called when the number of features matching a WFS search is
+        known, before any of the features are received.
+
+        This is only called when the number of matching features is
+        requested upfront, see `pydov.wfs_hits_probe`.
+
+        Parameters
+        ----------
+        number_matched : int
+            The number of features matched by the WFS search query.
+        number_expected : int
+            The number of features that will be returned by the WFS search,
+            taking into account the maximum number of features requested.
+        number_pages : int
+            The number of WFS GetFeature requests that will be issued to
+            retrieve the features.
+
+        """
+        pass
+
     def wfs_search_result(self, number_matched, number_returned):
         """Called after a WFS search query finished.
 
@@ -415,6 +503,23 @@ class AbstractReadHook(object):
         """
         pass
 
+    def parsed_cache_hit(self, pkey_object):
+        """Called when the values of an object are retrieved from the parsed
+        data cache. No XML document is retrieved or parsed for the object in
+        this case, so none of the other XML methods are called for it.
+
+        Because of parallel processing, this method will be called
+        simultaneously from multiple threads. Make sure your implementation is
+        threadsafe or uses locking.
+
+        Parameters
+        ----------
+        pkey_object : str
+            Permanent key of the requested object.
+
+        """
+        pass
+
     def xml_stale_hit(self, pkey_object):
         """Called when the XML document of an object failed to be retrieved
         from the DOV service and a stale version has been returned from the
@@ -465,6 +570,27 @@ class AbstractReadHook(object):
         """
         pass
 
+    def concurrency_changed(self, limit, latency_p50, latency_p95):
+        """Called when the adaptive concurrency controller changes the
+        maximum number of concurrent requests for XML documents and WFS pages.
+
+        This method can be called from multiple threads. Make sure your
+        implementation is threadsafe or uses locking.
+
+        Parameters
+        ----------
+        limit : int
+            The new maximum number of concurrent requests.
+        latency_p50 : float or None
+            The observed median request latency, in seconds, or None if no
+            latency has been observed yet.
+        latency_p95 : float or None
+            The observed 95th percentile request latency, in seconds, or None
+            if no latency has been observed yet.
+
+        """
+        pass
+
 
 class AbstractInjectHook(object):
     """Abstract base class for custom hook implementations.
@@ -671,6 +797,26 @@ class SimpleStatusHook(AbstractReadHook):
         self.wfs_progress.max_results = params.get('max_features', None)
         self.xml_progress.max_results = params.get('max_features', None)
 
+    def wfs_search_hits(self, number_matched, number_expected,
+                        number_pages):
+        """When the number of matching features is known upfront, set the
+        total result count.
+
+        Parameters
+        ----------
+        number_matched : int
+            The number of features matched by the WFS search query.
+        number_expected : int
+            The number of features that will be returned by the WFS search,
+            taking into account the maximum number of features requested.
+        number_pages : int
+            The number of WFS GetFeature requests that will be issued to
+            retrieve the features.
+
+        """
+        self.wfs_progress.result_count = number_pages
+        self.xml_progress.result_count = number_expected
+
     def wfs_search_result(self, number_matched, number_returned):
         """When the WFS search completes, set the total result count.
 
@@ -714,6 +860,19 @@ class SimpleStatusHook(AbstractReadHook):
         with self.lock:
             self._write_progress(self.xml_progress, 'c')
 
+    def parsed_cache_hit(self, pkey_object):
+        """When the values of an object are retrieved from the parsed data
+        cache, print 'p' to the progress output.
+
+        Parameters
+        ----------
+        pkey_object : str
+            Permanent key of the requested object.
+
+        """
+        with self.lock:
+            self._write_progress(self.xml_progress, 'p')
+
     def xml_stale_hit(self, pkey_object):
         """When a stale XML document is retrieved from the cache, print 'S' to
         the progress output.
@@ -754,6 +913,32 @@ class SimpleStatusHook(AbstractReadHook):
             self._write_progress(self.xml_progress, '.')
 
 
+def _get_wfs_getfeature_hashes(query):
+    """Get the hashes used as key of the WFS GetFeature response of the
+    given query in a log archive.
+
+    Archives saved with earlier versions of pydov used the MD5 hash of the
+    serialised query as key, instead of the hash of its normalised form.
+
+    Parameters
+    ----------
+    query : etree.ElementTree
+        The WFS GetFeature request sent to the WFS server.
+
+    Returns
+    -------
+    tuple of str
+        The hash of the query, followed by its hash in archives saved with
+        earlier versions of pydov.
+
+    """
+    from pydov.util.owsutil import get_wfs_getfeature_request_hash
+
+    legacy_hash = md5(etree.tostring(
+        query, encoding='unicode').encode('utf8')).hexdigest()
+    return get_wfs_getfeature_request_hash(query), legacy_hash
+
+
 class RepeatableLogRecorder(AbstractReadHook, AbstractInjectHook):
     """Class for recording a pydov session into a ZIP archive.
 
@@ -936,9 +1121,10 @@ class RepeatableLogRecorder(AbstractReadHook, AbstractInjectHook):
             The WFS GetFeature response containings the features.
 
         """
+        from pydov.util.owsutil import get_wfs_getfeature_request_hash
+
         with self.lock:
-            q = etree.tostring(query, encoding='unicode')
-            md5_hash = md5(q.encode('utf8')).hexdigest()
+            md5_hash = get_wfs_getfeature_request_hash(query)
             log_path = 'wfs/' + md5_hash + '.log'
 
             if log_path not in self.log_archive_file.namelist():
@@ -966,14 +1152,15 @@ class RepeatableLogRecorder(AbstractReadHook, AbstractInjectHook):
 
         """
         with self.lock:
-            q = etree.tostring(query, encoding='unicode')
-            md5_hash = md5(q.encode('utf8')).hexdigest()
-            log_path = 'wfs/' + md5_hash + '.log'
+            md5_hashes = _get_wfs_getfeature_hashes(query)
+            log_paths = ['wfs/' + h + '.log' for h in md5_hashes]
+            log_paths = [p for p in log_paths
+                         if p in self.log_archive_file.namelist()]
 
-            if log_path not in self.log_archive_file.namelist():
+            if len(log_paths) == 0:
                 return None
 
-            with self.log_archive_file.open(log_path, 'r') as log_file:
+            with self.log_archive_file.open(log_paths[0], 'r') as log_file:
                 tree = log_file.read()
 
         return tree
@@ -1127,17 +1314,18 @@ class RepeatableLogReplayer(AbstractInjectHook):
             a different pydov session than the one it was saved for.
 
         """
-        q = etree.tostring(query, encoding='unicode')
-        md5_hash = md5(q.encode('utf8')).hexdigest()
-        log_path = 'wfs/' + md5_hash + '.log'
+        md5_hashes = _get_wfs_getfeature_hashes(query)
+        log_paths = ['wfs/' + h + '.log' for h in md5_hashes]
+        log_paths = [p for p in log_paths
+                     if p in self.log_archive_file.namelist()]
 
-        if log_path not in self.log_archive_file.namelist():
+        if len(log_paths) == 0:
             raise LogReplayError(
                 'Failed to replay log: no entry for '
-                'WFS result of {}.'.format(md5_hash)
+                'WFS result of {}.'.format(md5_hashes[0])
             )
 
-        with self.log_archive_file.open(log_path, 'r') as log_file:
+        with self.log_archive_file.open(log_paths[0], 'r') as log_file:
             tree = log_file.read()
 
         return tree
@@ -13,7 +13,7 @@ import random
 import string
 
 from owslib.etree import etree
-from owslib.fes2 import Or
+from owslib.fes2 import BinaryLogicOpType, Or, UnaryLogicOpType
 
 
 class EpsgValidator(object):
@@ -128,6 +128,17 @@ class AbstractLocation(EpsgValidator):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
+    def get_extent(self):
+        """Return the extent (bounding box) of the location.
+
+        Returns
+        -------
+        Box or None
+            Extent of this location, or None when the extent is unknown or
+            the location has no area.
+        """
+        return None
+
 
 class AbstractLocationFilter(object):
     """Abstract base class for location filters (f.ex. within, dwithin).
@@ -177,6 +188,19 @@ class AbstractLocationFilter(object):
         """
         raise NotImplementedError('This should be implemented in a subclass.')
 
+    def get_extent(self):
+        """Return the extent (bounding box) containing all features matching
+        this location filter.
+
+        Returns
+        -------
+        Box or None
+            Extent of the location filter, or None when the extent is unknown
+            or unbounded.
+
+        """
+        return None
+
 
 class AbstractBinarySpatialFilter(AbstractLocationFilter):
     """Class representing a binary spatial filter.
@@ -224,6 +248,9 @@ class AbstractBinarySpatialFilter(AbstractLocationFilter):
                                '"set_geometry_column" to set it.')
         return self.element
 
+    def get_extent(self):
+        return self.location.get_extent()
+
 
 class Box(AbstractLocation):
     """Class representing a box location, also known as bounding box,
@@ -306,6 +333,9 @@ class Box(AbstractLocation):
     def get_element(self):
         return self.element
 
+    def get_extent(self):
+        return self
+
 
 class Point(AbstractLocation):
     """Class representing a point location."""
@@ -411,6 +441,37 @@ class GmlObject(AbstractLocation):
     def get_element(self):
         return self.element
 
+    def get_extent(self):
+        srs_name = self.element.attrib.get('srsName')
+        epsg = int(srs_name.split(':')[-1])
+
+        coordinates = []
+        for element in self.element.iter(
+                '{http://www.opengis.net/gml/3.2}pos',
+                '{http://www.opengis.net/gml/3.2}posList'):
+            dimension = int(element.get(
+                'srsDimension', self.element.get('srsDimension', 2)))
+            values = [float(i) for i in element.text.split()]
+            coordinates.extend(
+                values[i:i + 2] for i in range(0, len(values), dimension))
+
+        if len(coordinates) == 0:
+            return None
+
+        if epsg == 4326 and srs_name.startswith('urn:'):
+            # the urn notation uses latitude/longitude axis order
+            coordinates = [(x, y) for y, x in coordinates]
+
+        minx = min(c[0] for c in coordinates)
+        miny = min(c[1] for c in coordinates)
+        maxx = max(c[0] for c in coordinates)
+        maxy = max(c[1] for c in coordinates)
+
+        if maxx <= minx or maxy <= miny:
+            return None
+
+        return Box(minx, miny, maxx, maxy, epsg)
+
 
 class Equals(AbstractBinarySpatialFilter):
     """Class representing a spatial Equals filter.
@@ -454,6 +515,9 @@ class Disjoint(AbstractBinarySpatialFilter):
         """
         super(Disjoint, self).__init__('Disjoint', location)
 
+    def get_extent(self):
+        return None
+
 
 class Touches(AbstractBinarySpatialFilter):
     """Class representing a spatial Touches filter.
@@ -737,6 +801,9 @@ class GmlFilter(AbstractLocationFilter):
     def toXML(self):
         return self.element.toXML()
 
+    def get_extent(self):
+        return get_extent(self.element)
+
 
 class GeometryFilter(GmlFilter):
     """Class for construction a spatial filter expression from any Geometry
@@ -881,3 +948,40 @@ class GeopandasFilter(GmlFilter):
                 gml_blob.seek(0)
                 gml = gml_blob.read()
             return gml
+
+
+def get_extent(location):
+    """Get the extent (bounding box) containing all features matching the
+    given location filter.
+
+    Parameters
+    ----------
+    location : pydov.util.location.AbstractLocationFilter or \
+                owslib.fes2.BinaryLogicOpType<AbstractLocationFilter> or \
+                owslib.fes2.UnaryLogicOpType<AbstractLocationFilter>
+        Location filter limiting the features to retrieve. Can either be a
+        single instance of a subclass of AbstractLocationFilter, or a
+        combination using And, Or, Not of AbstractLocationFilters.
+
+    Returns
+    -------
+    Box or None
+        Extent of the location filter, or None when the extent is unknown or
+        unbounded.
+
+    """
+    if isinstance(location, UnaryLogicOpType):
+        return None
+    elif isinstance(location, BinaryLogicOpType):
+        extents = [get_extent(i) for i in location.operations]
+        if len(extents) == 0 or None in extents or \
+                len(set(e.epsg for e in extents)) > 1:
+            return None
+
+        return Box(min(e.minx for e in extents),
+                   min(e.miny for e in extents),
+                   max(e.maxx for e in extents),
+                   max(e.maxy for e in extents),
+                   extents[0].epsg)
+    else:
+        return location.get_extent()
@@ -1,22 +1,239 @@
 # -*- coding: utf-8 -*-
 """Module grouping network-related utilities and functions."""
 
+import asyncio
+import math
 import os
+import time
+from collections import deque
 from queue import Empty, Queue
-from threading import Thread
+from threading import Condition, Event, Lock, Thread
 
 import requests
 import urllib3
 from requests.adapters import HTTPAdapter
 
 import pydov
+from pydov.util.hooks import HookRunner
 
 request_timeout = 300
 
+# Maximum number of concurrent connections used by the async engine.
+async_max_connections = 200
+
+# Number of persistent worker threads of the shared worker pool. The number
+# of concurrent requests is further limited by the concurrency_limiter.
+worker_threads = 16
+
+_shared_lock = Lock()
+_shared_worker_pool = None
+_shared_async_loop = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive increase, multiplicative decrease (AIMD) controller limiting
+    the number of concurrent requests for XML documents and WFS pages.
+
+    The limit is increased by one after each round of successful requests
+    where the median latency stayed within the tolerance of the lowest
+    observed median latency. It is decreased multiplicatively when a request
+    times out, fails to connect or is answered with a HTTP 429 or 503 status.
+
+    Changes of the limit are reported to the hooks using the
+    concurrency_changed event.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=16,
+                 backoff_factor=0.5, latency_tolerance=2.0, window=200):
+        """Initialisation.
+
+        Parameters
+        ----------
+        initial_limit : int, optional
+            Initial maximum number of concurrent requests, defaults to 4.
+        min_limit : int, optional
+            Lower bound of the limit, defaults to 1.
+        max_limit : int, optional
+            Upper bound of the limit, defaults to 16. Note that the effective
+            number of concurrent requests is also bound by the number of
+            worker threads.
+        backoff_factor : float, optional
+            Factor to multiply the limit with on errors, defaults to 0.5.
+        latency_tolerance : float, optional
+            Maximum ratio of the median latency of a round of requests to
+            the lowest observed median latency, for the limit to be
+            increased. Defaults to 2.
+        window : int, optional
+            Number of latest request latencies to use to calculate the
+            latency percentiles, defaults to 200.
+        """
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+
+        self._active = 0
+        self._condition = Condition()
+        self._async_waiters = []
+        self._latencies = deque(maxlen=window)
+        self._round = []
+        self._baseline = None
+        self._since_decrease = math.inf
+
+    @staticmethod
+    def _percentile(values, percentile):
+        """Calculate the given percentile of the values.
+
+        Parameters
+        ----------
+        values : list of float
+            Values to calculate the percentile of.
+        percentile : float
+            Percentile to calculate, between 0 and 100.
+
+        Returns
+        -------
+        float or None
+            The percentile of the values, or None if there are no values.
+        """
+        if len(values) == 0:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1,
+                          int(len(values) * percentile / 100))]
+
+    def get_latency(self):
+        """Get the observed request latency percentiles.
+
+        Returns
+        -------
+        latency_p50 : float or None
+            The observed median request latency, in seconds.
+        latency_p95 : float or None
+            The observed 95th percentile request latency, in seconds.
+        """
+        with self._condition:
+            latencies = list(self._latencies)
+        return (self._percentile(latencies, 50),
+                self._percentile(latencies, 95))
+
+    def acquire(self):
+        """Wait until a request is allowed to start."""
+        with self._condition:
+            while self._active >= self.limit:
+                self._condition.wait()
+            self._active += 1
+
+    async def acquire_async(self):
+        """Wait asynchronously until a request is allowed to start.
+
+        This should be called from within a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._active < self.limit:
+                    self._active += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    @staticmethod
+    def _wake(waiter):
+        """Wake up a coroutine waiting for a request slot.
+
+        Parameters
+        ----------
+        waiter : asyncio.Future
+            Future the coroutine is waiting for.
+        """
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def release(self, latency=None, success=True):
+        """Mark a request as finished and update the limit accordingly.
+
+        Parameters
+        ----------
+        latency : float, optional
+            Duration of the request in seconds, defaults to None.
+        success : bool, optional
+            Whether the request succeeded, defaults to True. Set this to
+            False when the request timed out, failed to connect or was
+            answered with a HTTP 429 or 503 status.
+        """
+        with self._condition:
+            self._active -= 1
+            self._since_decrease += 1
+            old_limit = self.limit
+
+            if not success:
+                # decrease at most once per round of requests, to not react
+                # multiple times on the same overload
+                if self._since_decrease > self.limit:
+                    self.limit = max(self.min_limit, int(
+                        self.limit * self.backoff_factor))
+                    self._since_decrease = 0
+                    self._baseline = None
+                self._round = []
+            elif latency is not None:
+                self._latencies.append(latency)
+                self._round.append(latency)
+
+                if len(self._round) >= self.limit:
+                    median = self._percentile(self._round, 50)
+                    if self._baseline is None or median < self._baseline:
+                        self._baseline = median
+                    if median <= self._baseline * self.latency_tolerance:
+                        self.limit = min(self.max_limit, self.limit + 1)
+                    self._round = []
+
+            changed = self.limit != old_limit
+            limit = self.limit
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            except RuntimeError:
+                # the event loop was closed
+                pass
+
+        if changed:
+            HookRunner.execute_concurrency_changed(
+                limit, *self.get_latency())
+
+    def __enter__(self):
+        """Acquire a request slot."""
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release the request slot without updating the limit."""
+        self.release()
+
+
+# Controller limiting the number of concurrent requests for XML documents and
+# WFS pages. Set to None to disable limiting.
+concurrency_limiter = AdaptiveConcurrencyLimiter()
+
+# Controller limiting the number of concurrent requests of the async engine,
+# within the connection limit of its session. Set to None to disable limiting.
+async_concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=32, max_limit=async_max_connections)
+
 
 class TimeoutHTTPAdapter(HTTPAdapter):
     """HTTPAdapter which adds a default timeout to requests. Allows timeout
     to be overridden on a per-request basis.
+
+    Requests with a true `limit_concurrency` attribute are limited by the
+    adaptive concurrency_limiter, which is fed with the latency and outcome
+    of each attempt. Their retries are performed one attempt at a time, so
+    the request slot is released while waiting to retry.
     """
 
     def __init__(self, *args, **kwargs):
@@ -26,6 +243,7 @@ class TimeoutHTTPAdapter(HTTPAdapter):
             self.timeout = kwargs["timeout"]
             del kwargs["timeout"]
         super().__init__(*args, **kwargs)
+        self._attempt_adapter = None
 
     def send(self, request, **kwargs):
         """Sends PreparedRequest object. Returns Response object.
@@ -43,7 +261,72 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         timeout = kwargs.get("timeout")
         if timeout is None:
             kwargs["timeout"] = self.timeout
-        return super().send(request, **kwargs)
+
+        limiter = concurrency_limiter
+        if not getattr(request, "limit_concurrency", False) or \
+                limiter is None:
+            return super().send(request, **kwargs)
+
+        if self._attempt_adapter is None:
+            # adapter sending a single attempt, the retries are handled here
+            self._attempt_adapter = HTTPAdapter(max_retries=0)
+
+        retry = self.max_retries
+        while True:
+            limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = self._attempt_adapter.send(request, **kwargs)
+            except (requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError) as error:
+                limiter.release(time.monotonic() - start, success=False)
+                try:
+                    retry = retry.increment(
+                        request.method, request.url, error=error)
+                except urllib3.exceptions.MaxRetryError:
+                    raise error
+                retry.sleep()
+                continue
+            except BaseException:
+                limiter.release()
+                raise
+
+            limiter.release(time.monotonic() - start,
+                            success=response.status_code not in (429, 503))
+            return response
+
+    def close(self):
+        """Dispose of any internal state."""
+        super().close()
+        if self._attempt_adapter is not None:
+            self._attempt_adapter.close()
+
+
+def send_limited(session, method, url, data=None):
+    """Send a request using the given session, limited by the adaptive
+    concurrency_limiter.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session to use to perform the request.
+    method : str
+        HTTP method of the request.
+    url : str
+        URL to request.
+    data : bytes, optional
+        Body of the request, defaults to None.
+
+    Returns
+    -------
+    requests.Response
+        The Response of the request.
+    """
+    prepared = session.prepare_request(
+        requests.Request(method, url, data=data))
+    prepared.limit_concurrency = True
+    return session.send(prepared, **session.merge_environment_settings(
+        prepared.url, {}, None, None, None))
 
 
 class SessionFactory:
@@ -120,6 +403,56 @@ class SessionFactory:
         return session
 
 
+class AsyncSessionFactory:
+    """Class for generating pydov configured aiohttp ClientSessions, used by
+    the async engine to perform HTTP requests concurrently.
+
+    This requires the optional aiohttp dependency.
+    """
+
+    @staticmethod
+    def get_session(max_connections=None):
+        """Request a new async session.
+
+        This should be called from within a running event loop.
+
+        Parameters
+        ----------
+        max_connections : int, optional
+            Maximum number of simultaneous connections of the session.
+            Defaults to None, which means `async_max_connections` is used.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            pydov configured aiohttp ClientSession.
+
+        Raises
+        ------
+        ImportError
+            When the aiohttp package is not installed.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(
+                "The async engine requires the aiohttp package. Install it "
+                "using 'pip install pydov[async]'.")
+
+        connector = aiohttp.TCPConnector(
+            limit=max_connections or async_max_connections)
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=request_timeout),
+            headers={
+                "user-agent": "/".join(
+                    [pydov.__package_name__, pydov.__version__]
+                )
+            },
+            trust_env=True)
+
+
 class LocalSessionThreadPool:
     """Thread pool of LocalSessionThreads used to perform HTTP I/O operations
     in parallel.
@@ -189,6 +522,150 @@ class LocalSessionThreadPool:
             yield self.result_queue.get()
 
 
+class SharedWorkerPool:
+    """Pool of persistent LocalSessionThreads, used to perform HTTP I/O
+    operations in parallel.
+
+    The worker threads and their Sessions are kept alive until the pool is
+    stopped, so connections can be reused across searches. Use
+    `get_shared_worker_pool` to get the process-wide instance.
+    """
+
+    def __init__(self, workers=4):
+        """Initialisation.
+
+        Set up the pool and start all workers.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker threads to use, defaults to 4.
+        """
+        self.workers = []
+        self.input_queue = Queue(maxsize=100)
+
+        self._lock = Lock()
+        self._stopped = False
+
+        for i in range(workers):
+            worker = LocalSessionThread(self.input_queue)
+            worker.daemon = True
+            self.workers.append(worker)
+
+        for w in self.workers:
+            w.start()
+
+    def submit(self, fn, args):
+        """Execute the given function with its arguments in a worker thread.
+
+        This will add the job to the queue and will not wait for the result.
+
+        Parameters
+        ----------
+        fn : function
+            Function to execute. It should take all arguments from args, and
+            after that a single argument with the requests Session.
+        args : tuple
+            Arguments that will be passed to the function.
+
+        Returns
+        -------
+        WorkerResult
+            Result of the job, use its wait() method to wait for the job to
+            complete. If the pool is stopped before the job is executed, the
+            result will have a RuntimeError as error.
+        """
+        r = WorkerResult()
+        with self._lock:
+            if self._stopped:
+                self._cancel(r)
+            else:
+                self.input_queue.put((fn, args, r))
+        return r
+
+    @staticmethod
+    def _cancel(result):
+        """Mark the given job as completed without executing it.
+
+        Parameters
+        ----------
+        result : WorkerResult
+            Result of the job to cancel.
+        """
+        result.set_error(RuntimeError(
+            'The worker pool was stopped before the job was executed.'))
+        result.set_done()
+
+    def stop(self):
+        """Stop all worker threads and close their Sessions.
+
+        Jobs that are still queued are not executed, their results are
+        marked as completed with a RuntimeError as error.
+        """
+        with self._lock:
+            self._stopped = True
+
+        for w in self.workers:
+            w.stop()
+
+        for w in self.workers:
+            w.join()
+            w.session.close()
+
+        while True:
+            try:
+                fn, args, r = self.input_queue.get_nowait()
+            except Empty:
+                break
+            self._cancel(r)
+            self.input_queue.task_done()
+
+
+class SharedSessionThreadPool:
+    """Group of jobs executed in the shared pool of persistent worker
+    threads.
+
+    This has the same interface as the LocalSessionThreadPool, but reuses
+    the worker threads and Sessions of the process-wide SharedWorkerPool
+    instead of starting new ones.
+    """
+
+    def __init__(self):
+        """Initialisation."""
+        self.results = deque()
+
+    def execute(self, fn, args):
+        """Execute the given function with its arguments in a worker thread.
+
+        This will add the job to the queue and will not wait for the result.
+        Use join() to retrieve the result.
+
+        Parameters
+        ----------
+        fn : function
+            Function to execute. It should take all arguments from args, and
+            after that a single argument with the requests Session.
+        args : tuple
+            Arguments that will be passed to the function.
+        """
+        self.results.append(get_shared_worker_pool().submit(fn, args))
+
+    def join(self):
+        """Wait for the jobs of this group to be executed and return their
+        results.
+
+        Yields
+        ------
+        WorkerResult
+            Results of the executed functions in the order they were
+            submitted.
+        """
+        while len(self.results) > 0:
+            r = self.results.popleft()
+            r.wait()
+            yield r
+
+
 class WorkerResult:
     """Class for storing the result of a job execution in the result queue.
 
@@ -201,6 +678,7 @@ class WorkerResult:
         """Initialisation. """
         self.result = None
         self.error = None
+        self._done = Event()
 
     def set_result(self, value):
         """Set the result of this job.
@@ -242,6 +720,14 @@ class WorkerResult:
         """
         return self.error
 
+    def set_done(self):
+        """Mark this job as completed."""
+        self._done.set()
+
+    def wait(self):
+        """Wait for this job to be completed."""
+        self._done.wait()
+
 
 class LocalSessionThread(Thread):
     """Worker thread using a local Session to execute functions. """
@@ -286,11 +772,162 @@ class LocalSessionThread(Thread):
                 else:
                     r.set_result(result)
                 finally:
+                    r.set_done()
                     self.input_queue.task_done()
             except Empty:
                 pass
 
 
+class AsyncSessionLoop:
+    """Asyncio event loop running in a background thread, used to perform
+    HTTP I/O operations concurrently using a single pooled async session.
+
+    Coroutines can be submitted from any thread, their results are made
+    available as concurrent.futures.Future instances.
+    """
+
+    def __init__(self, max_connections=None):
+        """Initialisation.
+
+        Start the event loop in a background thread and create the async
+        session.
+
+        Parameters
+        ----------
+        max_connections : int, optional
+            Maximum number of simultaneous connections of the session.
+            Defaults to None, which means `async_max_connections` is used.
+
+        Raises
+        ------
+        ImportError
+            When the aiohttp package is not installed.
+        """
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+        try:
+            self.session = asyncio.run_coroutine_threadsafe(
+                self._create_session(max_connections), self.loop).result()
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def _run(self):
+        """Run the event loop until it is stopped."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @staticmethod
+    async def _create_session(max_connections):
+        """Create the async session from within the event loop.
+
+        Parameters
+        ----------
+        max_connections : int
+            Maximum number of simultaneous connections of the session.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            pydov configured aiohttp ClientSession.
+        """
+        return AsyncSessionFactory.get_session(max_connections)
+
+    def _stop_loop(self):
+        """Stop the event loop and wait for the background thread to end."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def submit(self, fn, args):
+        """Schedule the given coroutine function with its arguments on the
+        event loop.
+
+        This will not wait for the result, use the returned Future to
+        retrieve it.
+
+        Parameters
+        ----------
+        fn : coroutine function
+            Coroutine function to execute. It should take all arguments from
+            args, and after that a single argument with the aiohttp
+            ClientSession.
+        args : tuple
+            Arguments that will be passed to the function.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future holding the result of the coroutine.
+        """
+        args = list(args)
+        args.append(self.session)
+        return asyncio.run_coroutine_threadsafe(fn(*args), self.loop)
+
+    def stop(self):
+        """Close the async session and stop the event loop."""
+        asyncio.run_coroutine_threadsafe(
+            self.session.close(), self.loop).result()
+        self._stop_loop()
+
+
+def get_shared_worker_pool():
+    """Get the process-wide pool of persistent worker threads, starting it
+    if necessary.
+
+    Returns
+    -------
+    SharedWorkerPool
+        The shared worker pool.
+    """
+    global _shared_worker_pool
+    with _shared_lock:
+        if _shared_worker_pool is None:
+            _shared_worker_pool = SharedWorkerPool(worker_threads)
+        return _shared_worker_pool
+
+
+def get_shared_async_loop():
+    """Get the process-wide async event loop and session used by the async
+    engine, starting it if necessary.
+
+    Returns
+    -------
+    AsyncSessionLoop
+        The shared async event loop.
+
+    Raises
+    ------
+    ImportError
+        When the aiohttp package is not installed.
+    """
+    global _shared_async_loop
+    with _shared_lock:
+        if _shared_async_loop is None:
+            _shared_async_loop = AsyncSessionLoop()
+        return _shared_async_loop
+
+
+def shutdown():
+    """Stop the shared worker threads and async event loop, closing all
+    their sessions.
+
+    They will be started again on next use.
+    """
+    global _shared_worker_pool, _shared_async_loop
+    with _shared_lock:
+        worker_pool, _shared_worker_pool = _shared_worker_pool, None
+        async_loop, _shared_async_loop = _shared_async_loop, None
+
+    if worker_pool is not None:
+        worker_pool.stop()
+
+    if async_loop is not None:
+        async_loop.stop()
+
+
 def proxy_autoconfiguration():
     """Try proxy autoconfiguration via PAC.
 
@@ -1,22 +1,34 @@
 # -*- coding: utf-8 -*-
 """Module grouping utility functions for OWS services."""
+import copy
 import datetime
 import warnings
+from hashlib import md5
+from threading import Lock
 from urllib.parse import urlparse
 import re
+import sys
 
 import numpy as np
+import pandas as pd
 from owslib.etree import etree
-from owslib.fes2 import BinaryLogicOpType, UnaryLogicOpType
+from owslib.fes2 import (BinaryLogicOpType, PropertyIsGreaterThan, SortBy,
+                         SortProperty, UnaryLogicOpType)
+from owslib.iso import MD_Metadata
 from owslib.namespaces import Namespaces
 from owslib.util import nspath_eval
 
 import pydov
 from pydov.util.errors import DataParseWarning
-from pydov.util.net import SessionFactory
+from pydov.util.net import SessionFactory, send_limited
 
 from .hooks import HookRunner
 
+# Lock guarding the copies of (shared) location filters. Location filters
+# are copied before they are serialised, since serialising moves their
+# elements into a new XML tree.
+location_lock = Lock()
+
 
 def __get_namespaces():
     """Get default namespaces from OWSLib, extended with the 'gfc' namespace
@@ -38,6 +50,9 @@ re_datetime = re.compile(
     r'[0-9]{2}:[0-9]{2}:[0-9]{2})'
     r'(\.[0-9]+)?([\+\-][0-9]{2}:?[0-9]{2})?(Z?)')
 
+# minimum number of values to convert a column in bulk
+BULK_CONVERT_MIN_SIZE = 32
+
 
 def has_geom_support():
     try:
@@ -84,6 +99,45 @@ def __get_remote_describefeaturetype(describefeaturetype_url):
     return get_url(describefeaturetype_url)
 
 
+def __get_remote_md(contentmetadata):
+    """Request and parse the remote metadata associated with the layer
+    described in `contentmetadata`, using `get_url` so the metadata can be
+    cached.
+
+    Parameters
+    ----------
+    contentmetadata : owslib.feature.wfs110.ContentMetadata
+        Content metadata associated with a WFS layer, containing the
+        associated `metadataUrls`.
+
+    Returns
+    -------
+    owslib.iso.MD_Metadata or None
+        Parsed remote metadata describing the WFS layer in more detail,
+        in the ISO 19115/19139 format, or None when no metadata could be found
+        or parsed.
+
+    """
+    for remote_md in contentmetadata.metadataUrls:
+        if remote_md.get('url') is None:
+            continue
+
+        try:
+            doc = etree.fromstring(get_url(remote_md['url']))
+        except Exception:
+            continue
+
+        md_element = doc.find(
+            './/' + nspath_eval('gmd:MD_Metadata', __namespaces))
+        if md_element is None:
+            md_element = doc.find(
+                './/' + nspath_eval('gmi:MI_Metadata', __namespaces))
+
+        if md_element is not None:
+            remote_md['metadata'] = MD_Metadata(md_element)
+            return remote_md['metadata']
+
+
 def get_remote_metadata(contentmetadata):
     """Request and parse the remote metadata associated with the layer
     described in `contentmetadata`.
@@ -102,6 +156,9 @@ def get_remote_metadata(contentmetadata):
         or parsed.
 
     """
+    if pydov.metadata_cache is not None:
+        return __get_remote_md(contentmetadata)
+
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", category=FutureWarning)
         contentmetadata.parse_remote_metadata(pydov.util.net.request_timeout)
@@ -296,16 +353,80 @@ def get_namespace(wfs, layer):
     namespace : str
         URI of the namespace associated with the given layer.
 
+    """
+    return parse_namespace(get_remote_describefeaturetype(wfs.url, layer))
+
+
+def get_remote_describefeaturetype(url, layer):
+    """Request the DescribeFeatureType of a layer.
+
+    Parameters
+    ----------
+    url : str
+        Base URL of the WFS service.
+    layer : str
+        Workspace-qualified name of the layer (typename).
+
+    Returns
+    -------
+    bytes
+        Response containing the DescribeFeatureType.
+
     """
     from owslib.feature.schema import _get_describefeaturetype_url
-    url = _get_describefeaturetype_url(url=wfs.url, version='2.0.0',
+    url = _get_describefeaturetype_url(url=url, version='2.0.0',
                                        typename=layer)
-    schema = __get_remote_describefeaturetype(url)
-    tree = etree.fromstring(schema)
+    return __get_remote_describefeaturetype(url)
+
+
+def parse_namespace(describefeaturetype):
+    """Get the namespace of a layer from its DescribeFeatureType.
+
+    Parameters
+    ----------
+    describefeaturetype : bytes
+        Response containing the DescribeFeatureType.
+
+    Returns
+    -------
+    namespace : str
+        URI of the namespace associated with the layer.
+
+    """
+    tree = etree.fromstring(describefeaturetype)
     namespace = tree.attrib.get('targetNamespace', None)
     return namespace
 
 
+def parse_schema(describefeaturetype):
+    """Parse the DescribeFeatureType of a layer into a schema.
+
+    Parameters
+    ----------
+    describefeaturetype : bytes
+        Response containing the DescribeFeatureType.
+
+    Returns
+    -------
+    schema : dict
+        Schema associated with the layer, or None if the DescribeFeatureType
+        does not describe a feature type.
+
+    """
+    from owslib.feature.schema import (XS_NAMESPACE, _construct_schema,
+                                       _get_elements)
+
+    root = etree.fromstring(describefeaturetype)
+
+    type_element = root.find('./{%s}element' % XS_NAMESPACE)
+    if type_element is None:
+        return None
+
+    complex_type = type_element.attrib['type'].split(':')[1]
+    elements = _get_elements(complex_type, root)
+    return _construct_schema(elements, getattr(root, 'nsmap', None))
+
+
 def get_wfs_max_features(capabilities):
     """Get the default maximum number of features the WFS service will return.
 
@@ -382,7 +503,8 @@ def unique_gml_ids(location):
 def wfs_build_getfeature_request(typename, geometry_column=None, location=None,
                                  filter=None, sort_by=None, propertyname=None,
                                  max_features=None, start_index=0,
-                                 crs=None):
+                                 crs=None, result_type=None,
+                                 keyset_property=None, keyset_start=None):
     """Build a WFS 2.0 GetFeature request in XML to be used as payload
     in a WFS 2.0 GetFeature request using POST.
 
@@ -409,6 +531,18 @@ def wfs_build_getfeature_request(typename, geometry_column=None, location=None,
     crs : str
         EPSG code of the CRS of the geometries that will be returned. Defaults
         to None, which means the default CRS of the WFS layer.
+    result_type : str, optional
+        Type of the result to request, either 'results' or 'hits'. Use
+        'hits' to only request the number of matching features. Defaults to
+        None, which means the server default ('results') is used.
+    keyset_property : str, optional
+        Property to use for keyset pagination. The features are sorted on
+        this property, which should uniquely identify a feature. Cannot be
+        combined with ``sort_by``.
+    keyset_start : str, optional
+        Only return the features with a value of ``keyset_property`` greater
+        than this value, i.e. the features following the last feature of the
+        previous page. Requires ``keyset_property`` to be supplied as well.
 
     Raises
     ------
@@ -416,12 +550,15 @@ def wfs_build_getfeature_request(typename, geometry_column=None, location=None,
         If ``bbox`` is given without ``geometry_column``.
         If ``max_features`` has an invalid value.
         If ``start_index`` had an invalid value.
+        If ``keyset_property`` is given together with ``sort_by``.
+        If ``keyset_start`` is given without ``keyset_property``.
 
     TypeError
         If ``crs`` is not a string.
 
     ValueError
         If ``crs`` does not start with 'EPSG'.
+        If ``result_type`` is not one of 'results' or 'hits'.
 
     Returns
     -------
@@ -446,6 +583,19 @@ def wfs_build_getfeature_request(typename, geometry_column=None, location=None,
         raise AttributeError('start_index should be a positive integer or 0')
     xml.set('startIndex', str(start_index))
 
+    if keyset_property is not None and sort_by is not None:
+        raise AttributeError('keyset_property cannot be combined with '
+                             'sort_by')
+
+    if keyset_start is not None and keyset_property is None:
+        raise AttributeError('keyset_start requires keyset_property and it '
+                             'is None')
+
+    if result_type is not None:
+        if result_type not in ('results', 'hits'):
+            raise ValueError("result_type should be 'results' or 'hits'")
+        xml.set('resultType', result_type)
+
     xml.set('{http://www.w3.org/2001/XMLSchema-instance}schemaLocation',
             'http://www.opengis.net/wfs/2.0 '
             'http://schemas.opengis.net/wfs/2.0/wfs.xsd')
@@ -469,38 +619,103 @@ def wfs_build_getfeature_request(typename, geometry_column=None, location=None,
             propertyname_xml.text = property
             query.append(propertyname_xml)
 
-    filter_xml = etree.Element('{http://www.opengis.net/fes/2.0}Filter')
-    filter_parent = filter_xml
-
-    if filter is not None and location is not None:
-        # if both filter and location are specified, we wrap them inside an
-        # ogc:And
-        and_xml = etree.Element('{http://www.opengis.net/fes/2.0}And')
-        filter_xml.append(and_xml)
-        filter_parent = and_xml
+    filters = []
 
     if filter is not None:
         filterrequest = etree.fromstring(filter)
-        filter_parent.append(filterrequest[0])
+        filters.append(filterrequest[0])
 
     if location is not None:
-        location = set_geometry_column(location, geometry_column)
-        location = unique_gml_ids(location)
-        filter_parent.append(location)
+        with location_lock:
+            location = copy.deepcopy(location)
+        location = unique_gml_ids(
+            set_geometry_column(location, geometry_column))
+        filters.append(location)
+
+    if keyset_start is not None:
+        filters.append(PropertyIsGreaterThan(
+            keyset_property, str(keyset_start)).toXML())
+
+    if len(filters) > 0:
+        filter_xml = etree.Element('{http://www.opengis.net/fes/2.0}Filter')
+        filter_parent = filter_xml
+
+        if len(filters) > 1:
+            # if multiple filters are specified, we wrap them inside an
+            # ogc:And
+            and_xml = etree.Element('{http://www.opengis.net/fes/2.0}And')
+            filter_xml.append(and_xml)
+            filter_parent = and_xml
+
+        for f in filters:
+            filter_parent.append(f)
 
-    if filter is not None or location is not None:
         query.append(filter_xml)
 
     if sort_by is not None:
         query.append(etree.fromstring(sort_by))
+    elif keyset_property is not None:
+        query.append(SortBy([SortProperty(keyset_property, 'ASC')]).toXML())
 
     xml.append(query)
     return xml
 
 
+def _normalise_element(element):
+    """Get a normalised representation of the given XML element.
+
+    Element and attribute names are qualified with their namespace URI
+    instead of their prefix, attributes are sorted and whitespace surrounding
+    text is ignored. Comments and processing instructions are left out.
+
+    Parameters
+    ----------
+    element : etree.Element
+        XML element to normalise.
+
+    Returns
+    -------
+    tuple
+        Normalised representation of the element and its children.
+
+    """
+    return (
+        element.tag,
+        tuple(sorted(element.attrib.items())),
+        (element.text or '').strip(),
+        tuple((_normalise_element(child), (child.tail or '').strip())
+              for child in element if isinstance(child.tag, str)))
+
+
+def get_wfs_getfeature_request_hash(get_feature_request):
+    """Get a stable hash of the given WFS GetFeature request.
+
+    The hash is calculated from a normalised form of the request, so
+    requests that only differ in namespace prefixes, the order of the
+    attributes or whitespace get the same hash.
+
+    Parameters
+    ----------
+    get_feature_request : etree.Element
+        XML element representing the WFS GetFeature request.
+
+    Returns
+    -------
+    str
+        Hexadecimal MD5 hash of the normalised request.
+
+    """
+    q = repr(_normalise_element(get_feature_request))
+    return md5(q.encode('utf8')).hexdigest()
+
+
 def wfs_get_feature(baseurl, get_feature_request, session=None):
     """Perform a WFS request using POST.
 
+    Requests for features, like the pages of a search, are limited by the
+    adaptive concurrency limiter. Requests for the number of matching
+    features only (resultType 'hits') are not.
+
     Parameters
     ----------
     baseurl : str
@@ -522,9 +737,11 @@ def wfs_get_feature(baseurl, get_feature_request, session=None):
 
     data = etree.tostring(get_feature_request)
 
-    request = session.post(baseurl, data)
-    request.encoding = 'utf-8'
-    return request.text.encode('utf8')
+    if get_feature_request.get('resultType') == 'hits':
+        request = session.post(baseurl, data)
+    else:
+        request = send_limited(session, 'POST', baseurl, data)
+    return request.content
 
 
 def get_wfs_capabilities(url):
@@ -559,10 +776,12 @@ def get_url(url):
     """
     response = HookRunner.execute_inject_meta_response(url)
 
+    if response is None and pydov.metadata_cache is not None:
+        response = pydov.metadata_cache.get(url)
+
     if response is None:
         request = pydov.session.get(url)
-        request.encoding = 'utf-8'
-        response = request.text.encode('utf8')
+        response = request.content
 
     HookRunner.execute_meta_received(url, response)
 
@@ -601,6 +820,114 @@ def _strtobool(val):
             "Cannot convert truth value %r to boolean." % (val,))
 
 
+def _convert_string(x):
+    # intern the values, as the same values are repeated in many records
+    return sys.intern(x.strip())
+
+
+def _convert_date(x):
+    # Patch for Zulu-time issue of geoserver for WFS 1.1.0
+    if x.endswith('Z'):
+        return datetime.datetime.strptime(x, '%Y-%m-%dZ').date() \
+            + datetime.timedelta(days=1)
+    else:
+        return datetime.datetime.strptime(x, '%Y-%m-%d').date()
+
+
+def _convert_datetime(x):
+    x_match = re_datetime.search(x)
+    if x_match is None:
+        raise ValueError(f'Cannot parse datetime from value "{x}"')
+    x_datetime, x_millisecs, x_tz, x_zulu = x_match.groups()
+
+    fmt = '%Y-%m-%dT%H:%M:%S'
+    val = x_datetime
+
+    if x_millisecs is not None:
+        x_millisecs = int(x_millisecs[1:])
+        fmt += '.%f'
+        val += f'.{x_millisecs:0>6}'
+
+    if x_tz is not None:
+        fmt += '%z'
+        val += x_tz
+
+    dtime = datetime.datetime.strptime(val, fmt)
+    if x_zulu == 'Z':
+        dtime += datetime.timedelta(hours=1)
+    return dtime
+
+
+def _convert_geometry(x):
+    if isinstance(x, etree._Element):
+        if has_geom_support():
+            import shapely.geometry
+            import pygml
+            return shapely.geometry.shape(
+                pygml.parse(etree.tostring(x[0]).decode('utf8')))
+        else:
+            # this shouldn't happen
+            return etree.tostring(x[0]).decode('utf8')
+    return np.nan
+
+
+def _convert_none(x):
+    return x
+
+
+__typeconverters = {
+    'string': _convert_string,
+    'integer': int,
+    'float': float,
+    'date': _convert_date,
+    'datetime': _convert_datetime,
+    'boolean': _strtobool,
+    'geometry': _convert_geometry
+}
+
+__typeconverter_cache = {}
+
+
+def get_typeconverter(returntype):
+    """Get the function to parse text to the given returntype.
+
+    The function is built once per returntype and reused afterwards.
+
+    Parameters
+    ----------
+    returntype : str
+        Parse the text to this output datatype. One of
+        `string`, `float`, `integer`, `date`, `datetime`, `boolean`,
+        `geometry`. Other values return the text as is.
+
+    Returns
+    -------
+    function
+        Function converting a single text value to the type described by
+        `returntype`, returning NaN and emitting a DataParseWarning if the
+        text cannot be converted.
+
+    """
+    converter = __typeconverter_cache.get(returntype)
+    if converter is not None:
+        return converter
+
+    convert = __typeconverters.get(returntype, _convert_none)
+
+    def converter(text):
+        try:
+            return convert(text)
+        except ValueError as e:
+            warnings.warn(
+                f"Failed to convert data to correct datatype: {e}. Resulting "
+                "dataframe will be incomplete.",
+                DataParseWarning)
+            return np.nan
+
+    __typeconverter_cache[returntype] = converter
+    return converter
+
+
 def typeconvert(text, returntype):
     """Parse the text to the given returntype.
 
@@ -619,70 +946,144 @@ def typeconvert(text, returntype):
         `returntype`.
 
     """
-    if returntype == 'string':
-        def typeconvert(x):
-            return u'' + (x.strip())
-    elif returntype == 'integer':
-        def typeconvert(x):
-            return int(x)
-    elif returntype == 'float':
-        def typeconvert(x):
-            return float(x)
-    elif returntype == 'date':
-        def typeconvert(x):
-            # Patch for Zulu-time issue of geoserver for WFS 1.1.0
-            if x.endswith('Z'):
-                return datetime.datetime.strptime(x, '%Y-%m-%dZ').date() \
-                    + datetime.timedelta(days=1)
+    return get_typeconverter(returntype)(text)
+
+
+def _convert_column_float(values):
+    # pd.to_numeric finds the valid values, but does not parse them with
+    # full precision: convert the valid values with numpy instead
+    texts = pd.Series(values, dtype=object)
+    valid = pd.to_numeric(texts, errors='coerce').notna().to_numpy()
+
+    result = np.full(len(values), None, dtype=object)
+    result[valid] = texts[valid].to_numpy().astype(float)
+    return result.tolist()
+
+
+def _convert_column_integer(values):
+    # only plain integers are converted in bulk, others (like '1.0', which
+    # pd.to_numeric would accept) fall back to the conversion of the single
+    # values
+    texts = pd.Series(values, dtype=object)
+    plain = texts.str.fullmatch(r'\s*[+-]?[0-9]+\s*').to_numpy(dtype=bool)
+
+    parsed = pd.to_numeric(texts[plain], errors='coerce')
+    if parsed.dtype.kind in 'iu':
+        result = np.full(len(values), None, dtype=object)
+        result[plain] = parsed.tolist()
+        return result.tolist()
+
+    # integers outside the range of int64 and uint64
+    return [None] * len(values)
+
+
+def _convert_column_string(values):
+    return [sys.intern(x.strip()) for x in values]
+
+
+__booleans = {
+    'y': True, 'yes': True, 't': True, 'true': True, 'on': True, '1': True,
+    'n': False, 'no': False, 'f': False, 'false': False, 'off': False,
+    '0': False
+}
+
+
+def _convert_column_boolean(values):
+    return [__booleans.get(x.lower()) for x in values]
+
+
+def _convert_column_temporal(values, pattern, fmt, zulu_offset):
+    series = pd.Series(values, dtype=object)
+    valid = series.str.fullmatch(pattern)
+    zulu = valid & series.str.endswith('Z')
+
+    parsed = pd.to_datetime(
+        series.where(valid).where(~zulu, series.str[:-1]),
+        format=fmt, errors='coerce')
+    return parsed.where(~zulu, parsed + zulu_offset)
+
+
+def _convert_column_date(values):
+    # Patch for Zulu-time issue of geoserver for WFS 1.1.0
+    parsed = _convert_column_temporal(
+        values, r'[0-9]{4}-[0-9]{2}-[0-9]{2}Z?', '%Y-%m-%d',
+        pd.Timedelta(days=1))
+    return [None if x is pd.NaT else x for x in parsed.dt.date]
+
+
+def _convert_column_datetime(values):
+    # only the datetimes without milliseconds or timezone are converted in
+    # bulk, the others fall back to the conversion of the single values
+    parsed = _convert_column_temporal(
+        values, r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}Z?',
+        '%Y-%m-%dT%H:%M:%S', pd.Timedelta(hours=1))
+    return [None if x is pd.NaT else x for x in parsed.dt.to_pydatetime()]
+
+
+__column_typeconverters = {
+    'string': _convert_column_string,
+    'integer': _convert_column_integer,
+    'float': _convert_column_float,
+    'date': _convert_column_date,
+    'datetime': _convert_column_datetime,
+    'boolean': _convert_column_boolean
+}
+
+
+def typeconvert_column(values, returntype):
+    """Parse a column of texts to the given returntype at once.
+
+    Columns of at least `BULK_CONVERT_MIN_SIZE` values are converted in
+    bulk where possible, values that cannot be converted in bulk are
+    converted one by one. Instead of a warning per value, a single
+    DataParseWarning is emitted with the number of values that could not
+    be converted.
+
+    Parameters
+    ----------
+    values : list of str
+        Texts to convert, None for missing values.
+    returntype : str
+        Parse the texts to this output datatype. One of
+        `string`, `float`, `integer`, `date`, `datetime`, `boolean`,
+        `geometry`. Other values return the texts as is.
+
+    Returns
+    -------
+    list
+        List of the converted values, with NaN for missing values and
+        values that could not be converted.
+
+    """
+    result = [np.nan] * len(values)
+    pending = [i for i, x in enumerate(values) if x is not None]
+
+    convert_column = __column_typeconverters.get(returntype)
+    if convert_column is not None and \
+            len(pending) >= BULK_CONVERT_MIN_SIZE:
+        converted = convert_column([values[i] for i in pending])
+
+        remaining = []
+        for i, x in zip(pending, converted):
+            if x is None:
+                remaining.append(i)
             else:
-                return datetime.datetime.strptime(x, '%Y-%m-%d').date()
-    elif returntype == 'datetime':
-        def typeconvert(x):
-            x_match = re_datetime.search(x)
-            if x_match is None:
-                raise ValueError(f'Cannot parse datetime from value "{x}"')
-            x_datetime, x_millisecs, x_tz, x_zulu = x_match.groups()
-
-            fmt = '%Y-%m-%dT%H:%M:%S'
-            val = x_datetime
-
-            if x_millisecs is not None:
-                x_millisecs = int(x_millisecs[1:])
-                fmt += '.%f'
-                val += f'.{x_millisecs:0>6}'
-
-            if x_tz is not None:
-                fmt += '%z'
-                val += x_tz
-
-            dtime = datetime.datetime.strptime(val, fmt)
-            if x_zulu == 'Z':
-                dtime += datetime.timedelta(hours=1)
-            return dtime
-    elif returntype == 'boolean':
-        def typeconvert(x):
-            return _strtobool(x)
-    elif returntype == 'geometry':
-        def typeconvert(x):
-            if isinstance(x, etree._Element):
-                if has_geom_support():
-                    import shapely.geometry
-                    import pygml
-                    return shapely.geometry.shape(
-                        pygml.parse(etree.tostring(x[0]).decode('utf8')))
-                else:
-                    # this shouldn't happen
-                    return etree.tostring(x[0]).decode('utf8')
-            return np.nan
-    else:
-        def typeconvert(x):
-            return x
+                result[i] = x
+        pending = remaining
 
-    try:
-        return typeconvert(text)
-    except ValueError as e:
+    convert = __typeconverters.get(returntype, _convert_none)
+    failures = []
+    for i in pending:
+        try:
+            result[i] = convert(values[i])
+        except ValueError as e:
+            failures.append(e)
+
+    if len(failures) > 0:
         warnings.warn(
-            f"Failed to convert data to correct datatype: {e}. Resulting "
-            "dataframe will be incomplete.",
+            f"Failed to convert {len(failures)} value(s) to datatype "
+            f"'{returntype}', e.g.: {failures[0]}. Resulting dataframe will "
+            "be incomplete.",
             DataParseWarning)
-        return np.nan
+
+    return result
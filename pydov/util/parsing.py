@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Module grouping the functions to parse XML documents in worker
+processes."""
+import multiprocessing
+import pickle
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+import pydov
+
+_shared_lock = Lock()
+_shared_process_pool = None
+_shared_process_pool_size = None
+
+# types rebuilt in this (worker) process, by their pickled specification
+_types = {}
+
+
+def _is_importable(datatype):
+    """Check whether the given class can be pickled by reference.
+
+    Parameters
+    ----------
+    datatype : type
+        Class to check.
+
+    Returns
+    -------
+    bool
+        True if the class is available by its name in its module, False
+        otherwise (i.e. for classes created at runtime).
+
+    """
+    module = sys.modules.get(datatype.__module__)
+    return getattr(module, datatype.__qualname__, None) is datatype
+
+
+def _get_spec(datatype):
+    """Get the specification to rebuild the given type in another process.
+
+    Parameters
+    ----------
+    datatype : subclass of AbstractDovType or AbstractDovSubType
+        Type to get the specification of.
+
+    Returns
+    -------
+    tuple
+        Tuple of the nearest importable (super)class, the list of fields and
+        the specifications of the subtypes.
+
+    """
+    base = next(c for c in datatype.__mro__ if _is_importable(c))
+    return (base, list(datatype.fields),
+            [_get_spec(st) for st in datatype.subtypes])
+
+
+def _build_type(spec):
+    """Rebuild a type from its specification.
+
+    Parameters
+    ----------
+    spec : tuple
+        Specification of the type, see `_get_spec`.
+
+    Returns
+    -------
+    type
+        New subclass of the base class of the specification, with the
+        fields and subtypes of the specification.
+
+    """
+    base, fields, subtypes = spec
+    return type(base.__name__, (base,), {
+        'fields': fields,
+        'subtypes': [_build_type(st) for st in subtypes]
+    })
+
+
+def get_type_spec(datatype):
+    """Get the pickled specification to rebuild the given type in a worker
+    process.
+
+    Parameters
+    ----------
+    datatype : subclass of AbstractDovType
+        Type to get the specification of.
+
+    Returns
+    -------
+    bytes or None
+        Pickled specification of the type, or None if the type cannot be
+        pickled (for example when it uses a lambda function as `split_fn`).
+
+    """
+    try:
+        return pickle.dumps(_get_spec(datatype))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+
+
+def parse_df_array(spec, pkey, data, xml, return_fields, columns=False,
+                   parsed_cache=None):
+    """Parse the XML document of a DOV object and return its dataframe rows
+    or columns.
+
+    This is the function executed in the worker processes.
+
+    Parameters
+    ----------
+    spec : bytes
+        Pickled specification of the type, see `get_type_spec`.
+    pkey : str
+        Permanent key of the DOV object.
+    data : dict
+        Data of the DOV object that is already available, i.e. from the
+        WFS.
+    xml : bytes
+        Raw XML document of the DOV object.
+    return_fields : ReturnFieldList
+        List of fields to include in the data array.
+    columns : bool, optional
+        Whether to return the columns of the DOV object (see
+        `AbstractDovType.get_df_columns`) instead of its rows. Defaults to
+        False.
+    parsed_cache : pydov.util.caching.ParsedDataCache, optional
+        Cache to save the parsed values in, see `pydov.parsed_cache`.
+        Defaults to None.
+
+    Returns
+    -------
+    tuple
+        Tuple of the list of rows (or the columns) of the DOV object and the
+        list of warnings (category and message) that were emitted while
+        parsing.
+
+    """
+    datatype = _types.get(spec)
+    if datatype is None:
+        datatype = _types[spec] = _build_type(pickle.loads(spec))
+
+    pydov.parsed_cache = parsed_cache
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+
+        instance = datatype(pkey)
+        instance.data.update(data)
+        instance._xml_data = xml
+        if columns:
+            output = instance.get_df_columns(return_fields)
+        else:
+            output = instance.get_df_array(return_fields)
+
+    return output, [(w.category, str(w.message)) for w in caught]
+
+
+def get_shared_process_pool():
+    """Get the process-wide pool of worker processes to parse XML documents
+    in, starting it if necessary.
+
+    The pool has `pydov.parse_processes` worker processes, and is restarted
+    when this setting changes. Worker processes are started using 'spawn'.
+
+    Returns
+    -------
+    concurrent.futures.ProcessPoolExecutor
+        The shared process pool.
+
+    """
+    global _shared_process_pool, _shared_process_pool_size
+    with _shared_lock:
+        if _shared_process_pool is not None and \
+                _shared_process_pool_size != pydov.parse_processes:
+            _shared_process_pool.shutdown(wait=False, cancel_futures=True)
+            _shared_process_pool = None
+
+        if _shared_process_pool is None:
+            _shared_process_pool = ProcessPoolExecutor(
+                max_workers=pydov.parse_processes,
+                mp_context=multiprocessing.get_context('spawn'))
+            _shared_process_pool_size = pydov.parse_processes
+
+        return _shared_process_pool
+
+
+def shutdown():
+    """Stop the shared worker processes.
+
+    They will be started again on next use.
+    """
+    global _shared_process_pool
+    with _shared_lock:
+        process_pool, _shared_process_pool = _shared_process_pool, None
+
+    if process_pool is not None:
+        process_pool.shutdown()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Module grouping classes to split large spatial searches into tiles."""
+import math
+
+from pydov.util.location import Box
+from pydov.util.net import get_shared_worker_pool
+
+
+class TilePlanner(object):
+    """Class to plan the spatial tiles to split a large WFS search in.
+
+    Deep paging through the results of a WFS search gets slower as the offset
+    grows. Instead, the extent of the search can be split into tiles that
+    can each be retrieved in a single (or a few) WFS requests, which are
+    executed in parallel.
+
+    The tiles are sized adaptively: starting from the full extent, the
+    number of matching features is requested for each tile, and tiles with
+    too many features are split further proportional to their feature count.
+
+    """
+
+    def __init__(self, max_features_per_tile=None, max_depth=4,
+                 max_splits=8):
+        """Initialisation.
+
+        Parameters
+        ----------
+        max_features_per_tile : int, optional
+            Maximum number of features in a single tile. Defaults to None,
+            which means the maximum number of features the WFS server returns
+            in a single request is used.
+        max_depth : int, optional
+            Maximum number of times a tile is split. Tiles that still contain
+            too many features at this depth are retrieved using paging.
+            Defaults to 4.
+        max_splits : int, optional
+            Maximum number of parts to split a tile in along each axis.
+            Defaults to 8.
+
+        """
+        self.max_features_per_tile = max_features_per_tile
+        self.max_depth = max_depth
+        self.max_splits = max_splits
+
+    def split(self, tile, number_matched, max_features_per_tile):
+        """Split the tile in smaller tiles, proportional to the number of
+        features in the tile.
+
+        Parameters
+        ----------
+        tile : pydov.util.location.Box
+            Tile to split.
+        number_matched : int
+            Number of features matched in the tile.
+        max_features_per_tile : int
+            Maximum number of features in a single tile.
+
+        Returns
+        -------
+        list of pydov.util.location.Box
+            List of tiles covering the given tile.
+
+        """
+        splits = math.ceil(math.sqrt(number_matched / max_features_per_tile))
+        splits = min(max(splits, 2), self.max_splits)
+
+        dx = (tile.maxx - tile.minx) / splits
+        dy = (tile.maxy - tile.miny) / splits
+
+        tiles = []
+        for i in range(splits):
+            for j in range(splits):
+                tiles.append(Box(
+                    tile.minx + i * dx, tile.miny + j * dy,
+                    tile.maxx if i == splits - 1 else tile.minx + (i+1) * dx,
+                    tile.maxy if j == splits - 1 else tile.miny + (j+1) * dy,
+                    tile.epsg))
+        return tiles
+
+    def plan(self, extent, get_number_matched, max_features_per_tile):
+        """Plan the tiles to split the given extent in.
+
+        The number of matching features of all tiles of the same depth is
+        requested in parallel.
+
+        Parameters
+        ----------
+        extent : pydov.util.location.Box
+            Extent of the search.
+        get_number_matched : function
+            Function returning the number of features matching the search in
+            the given tile, or None if unknown. It is called in the shared
+            worker pool with the tile (pydov.util.location.Box) and a
+            requests.Session as arguments.
+        max_features_per_tile : int
+            Maximum number of features in a single tile, if no maximum was
+            set on initialisation of the planner.
+
+        Returns
+        -------
+        list of tuple or None
+            List of tuples (tile, number_matched) of the tiles containing
+            features, or None if the number of features in a tile could not
+            be determined.
+
+        """
+        if self.max_features_per_tile is not None:
+            max_features_per_tile = self.max_features_per_tile
+
+        worker_pool = get_shared_worker_pool()
+        tiles = []
+        level = [extent]
+
+        for depth in range(self.max_depth + 1):
+            results = [worker_pool.submit(get_number_matched, (tile,))
+                       for tile in level]
+
+            next_level = []
+            for tile, result in zip(level, results):
+                result.wait()
+                if result.get_error():
+                    raise result.get_error()
+
+                number_matched = result.get_result()
+                if number_matched is None:
+                    return None
+                elif number_matched == 0:
+                    continue
+                elif number_matched <= max_features_per_tile or \
+                        depth == self.max_depth:
+                    tiles.append((tile, number_matched))
+                else:
+                    next_level.extend(self.split(
+                        tile, number_matched, max_features_per_tile))
+
+            level = next_level
+
+        return tiles
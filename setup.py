@@ -22,6 +22,12 @@ with open('requirements_geom.txt') as f:
     requirements_geom = f.read().splitlines()
 with open('requirements_proxy.txt') as f:
     requirements_proxy = f.read().splitlines()
+with open('requirements_async.txt') as f:
+    requirements_async = f.read().splitlines()
+with open('requirements_arrow.txt') as f:
+    requirements_arrow = f.read().splitlines()
+with open('requirements_zstd.txt') as f:
+    requirements_zstd = f.read().splitlines()
 
 setup(
     name='pydov',
@@ -61,6 +67,9 @@ setup(
         'docs': requirements_doc,
         'devs': requirements_dev,
         'geom': requirements_geom,
-        'proxy': requirements_proxy
+        'proxy': requirements_proxy,
+        'async': requirements_async,
+        'arrow': requirements_arrow,
+        'zstd': requirements_zstd
     }
 )
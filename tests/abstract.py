@@ -12,8 +12,10 @@ from owslib.fes2 import PropertyIsEqualTo, SortBy, SortProperty
 from pandas import DataFrame
 
 import pydov
-from pydov.types.abstract import AbstractDovType, AbstractField
+from pydov.types.abstract import AbstractDovType, AbstractField, DataRecord
+from pydov.types.fields import XmlField
 from pydov.search.fields import FieldMetadata, FieldMetadataList, ReturnField, ReturnFieldList
+from pydov.util.caching import ParsedDataCache
 from pydov.util.codelists import AbstractCodeList
 from pydov.util.dovutil import build_dov_url
 from pydov.util.errors import InvalidFieldError
@@ -521,6 +523,71 @@ class AbstractTestSearch(object):
                 elif field_datatype == 'boolean':
                     assert bool in datatypes
 
+    def test_search_typed(self, mp_wfs, mp_get_schema,
+                          mp_remote_describefeaturetype, mp_remote_md,
+                          mp_remote_fc, mp_remote_codelist,
+                          mp_remote_wfs_feature, mp_dov_xml):
+        """Test the search method with typed output.
+
+        Test whether the columns have the extension datatypes matching the
+        datatypes of the fields, and whether the values are unchanged.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue.
+        mp_remote_codelist : pytest.fixture
+            Monkeypatch the call to get the remote codelists.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+
+        """
+        df = self.search_instance.search(
+            query=self.valid_query_single)
+        df_typed = self.search_instance.search(
+            query=self.valid_query_single, typed=True)
+
+        assert list(df_typed) == list(df)
+        assert len(df_typed) == len(df)
+
+        fields = self.search_instance.get_fields()
+
+        for field in list(df):
+            if fields[field]['multivalue']:
+                assert df_typed[field].dtype == df[field].dtype
+                continue
+
+            field_datatype = fields[field]['type']
+            dtype = df_typed[field].dtype
+
+            if field_datatype == 'integer':
+                assert dtype == 'Int64'
+            elif field_datatype == 'boolean':
+                assert dtype == 'boolean'
+            elif field_datatype in ('date', 'datetime'):
+                assert pd.api.types.is_datetime64_any_dtype(dtype)
+            elif field_datatype == 'string' and \
+                    isinstance(dtype, pd.CategoricalDtype):
+                if 'codelist' in fields[field]:
+                    codes = fields[field]['codelist'].get_values()
+                    assert set(codes or []).issubset(dtype.categories)
+
+            assert list(df_typed[field].isna()) == list(df[field].isna())
+
+            if field_datatype in ('string', 'integer', 'boolean'):
+                assert [v for v in df_typed[field].dropna()] == \
+                    [v for v in df[field].dropna()]
+
     def test_search_returnfields(self, mp_remote_wfs_feature):
         """Test the search method with the query parameter and a selection of
         return fields.
@@ -1202,7 +1269,7 @@ class AbstractTestTypes(object):
             assert feature.pkey.startswith(
                 build_dov_url('data/{}/'.format(feature.typename)))
 
-        assert isinstance(feature.data, dict)
+        assert isinstance(feature.data, DataRecord)
         assert isinstance(feature.subdata, dict)
 
     def test_get_df_array(self, wfs_feature, mp_dov_xml):
@@ -1258,6 +1325,160 @@ class AbstractTestTypes(object):
                 else:
                     _test_data_type(field, value)
 
+    def test_get_df_array_parse_once(self, wfs_feature, mp_dov_xml,
+                                     monkeypatch):
+        """Test whether the XML document is parsed only once for the main
+        type and all its (nested) subtypes.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        if not self.datatype_class._requires_xml():
+            pytest.skip('Type without fields from the XML document.')
+
+        parsed = []
+        parse_dov_xml = pydov.types.abstract.parse_dov_xml
+
+        def _parse_dov_xml(xml_data):
+            parsed.append(xml_data)
+            return parse_dov_xml(xml_data)
+
+        monkeypatch.setattr(pydov.types.abstract, 'parse_dov_xml',
+                            _parse_dov_xml)
+
+        feature = self.datatype_class.from_wfs_element(
+            wfs_feature, self.namespace)
+        feature.get_df_array()
+
+        assert len(parsed) == 1
+
+    def test_get_df_columns(self, wfs_feature, mp_dov_xml):
+        """Test the get_df_columns method.
+
+        Test whether the columns are equal to the rows of the get_df_array
+        method.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+
+        """
+        if not self.datatype_class._supports_df_columns():
+            return
+
+        fields = self.datatype_class._get_df_field_names()
+
+        feature = self.datatype_class.from_wfs_element(
+            wfs_feature, self.namespace)
+        count, columns = feature.get_df_columns()
+
+        feature = self.datatype_class.from_wfs_element(
+            wfs_feature, self.namespace)
+        rows = feature.get_df_array()
+
+        assert count == len(rows)
+        assert list(columns) == fields
+        pd.testing.assert_frame_equal(
+            DataFrame(data=columns, columns=fields).infer_objects(),
+            DataFrame(data=rows, columns=fields))
+
+    def test_parsed_cache(self, wfs_feature, mp_dov_xml, monkeypatch,
+                          tmp_path):
+        """Test the parsed data cache.
+
+        Test whether the rows and columns are the same with and without the
+        parsed data cache, and whether the XML document is not requested
+        once the parsed values are cached.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the WFS layer.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        tmp_path : pytest.fixture
+            Fixture providing a temporary directory.
+
+        """
+        def get_rows():
+            return self.datatype_class.from_wfs_element(
+                wfs_feature, self.namespace).get_df_array()
+
+        def get_columns():
+            fields = self.datatype_class._get_df_field_names()
+            count, columns = self.datatype_class.from_wfs_element(
+                wfs_feature, self.namespace).get_df_columns()
+            return DataFrame(data=columns, columns=fields).infer_objects()
+
+        supports_columns = self.datatype_class._supports_df_columns()
+
+        ref_rows = get_rows()
+        if supports_columns:
+            ref_columns = get_columns()
+
+        monkeypatch.setattr(pydov, 'parsed_cache',
+                            ParsedDataCache(cachedir=str(tmp_path)))
+        assert str(get_rows()) == str(ref_rows)
+
+        def get_xml_data(*args, **kwargs):
+            raise AssertionError('The XML document should not be requested.')
+
+        monkeypatch.setattr(self.datatype_class, '_get_xml_data',
+                            get_xml_data)
+        assert str(get_rows()) == str(ref_rows)
+        if supports_columns:
+            pd.testing.assert_frame_equal(get_columns(), ref_columns)
+
+        extended = self.datatype_class.with_extra_fields([
+            XmlField(name='extra_parsed_field', source_xpath='/extra',
+                     datatype='string')])
+        assert extended._get_parsed_fingerprint() != \
+            self.datatype_class._get_parsed_fingerprint()
+
+    def test_extraction_plan(self, wfs_feature):
+        """Test whether the extraction plans are built once per type class
+        and are not shared with new classes with extra fields.
+
+        Parameters
+        ----------
+        wfs_feature : pytest.fixture returning etree.Element
+            Fixture providing an XML element representing a single record of
+            the WFS layer.
+
+        """
+        self.datatype_class.from_wfs_element(wfs_feature, self.namespace)
+        wfs_plan = self.datatype_class._get_wfs_plan(self.namespace)
+        xml_plan = self.datatype_class._get_xml_plan()
+
+        self.datatype_class.from_wfs_element(wfs_feature, self.namespace)
+        assert self.datatype_class._get_wfs_plan(self.namespace) is wfs_plan
+        assert self.datatype_class._get_xml_plan() is xml_plan
+
+        extended = self.datatype_class.with_extra_fields([
+            XmlField(name='extra_plan_field', source_xpath='/extra',
+                     datatype='string')])
+        extended_plan = extended._get_xml_plan()
+
+        assert extended_plan is not xml_plan
+        assert 'extra_plan_field' in extended_plan['names']
+        assert 'extra_plan_field' not in xml_plan['names']
+        assert self.datatype_class._get_xml_plan() is xml_plan
+
     def test_get_df_array_wrongreturnfields(self, wfs_feature):
         """Test the get_df_array specifying a nonexistent return field.
 
@@ -1347,6 +1568,34 @@ class AbstractTestTypes(object):
             for feature in features:
                 assert isinstance(feature, self.datatype_class)
 
+    def test_from_wfs_columns(self, wfs_getfeature):
+        """Test the from_wfs_columns method to build the columns of the
+        output dataframe directly from a WFS response.
+
+        Test whether the columns are equal to the rows of the instances built
+        by the from_wfs method.
+
+        Parameters
+        ----------
+        wfs_getfeature : pytest.fixture returning str
+            Fixture providing a WFS GetFeature response.
+
+        """
+        fields = [f['name'] for f in self.datatype_class.get_fields(
+            source=('wfs',)).values() if f['type'] != 'geometry'
+            and not f.get('wfs_injected', False)]
+        return_fields = ReturnFieldList.from_field_names(*fields)
+
+        columns = self.datatype_class.from_wfs_columns(
+            wfs_getfeature, self.namespace, return_fields)
+        rows = [r for f in self.datatype_class.from_wfs(
+            wfs_getfeature, self.namespace)
+            for r in f.get_df_array(return_fields)]
+
+        assert list(columns) == fields
+        assert DataFrame(data=columns, columns=fields).equals(
+            DataFrame(data=rows, columns=fields))
+
     def test_missing_pkey(self):
         """Test initialising an object type with a pkey of 'None'.
 
@@ -1,3 +1,4 @@
+from hashlib import md5
 import json
 import re
 import shutil
@@ -8,9 +9,11 @@ import tempfile
 import os
 import pydov
 
+from owslib.etree import etree
 from pydov.search.boring import BoringSearch
 from pydov.util.errors import LogReplayError
 from pydov.util.hooks import Hooks, RepeatableLogRecorder, RepeatableLogReplayer
+from pydov.util.owsutil import wfs_build_getfeature_request
 from tests.abstract import ServiceCheck
 
 
@@ -229,3 +232,34 @@ class TestRepeatableLogReplayer(object):
         with pytest.raises(LogReplayError):
             bs = BoringSearch()
             bs.search(max_features=2)
+
+    def test_replay_legacy_key(self, temp_directory):
+        """Test whether an archive saved with an earlier version of pydov,
+        using the hash of the serialised query as key, can be replayed.
+
+        Parameters
+        ----------
+        temp_directory : pytest.fixture
+            Fixture providing a temporary directory.
+        """
+        query = wfs_build_getfeature_request(
+            'dov-pub:Boringen', max_features=1)
+        legacy_hash = md5(etree.tostring(
+            query, encoding='unicode').encode('utf8')).hexdigest()
+
+        os.makedirs(temp_directory)
+        log_archive = os.path.join(temp_directory, 'legacy.zip')
+        with zipfile.ZipFile(log_archive, 'w') as z:
+            z.writestr('wfs/' + legacy_hash + '.log', '<features/>')
+
+        replayer = RepeatableLogReplayer(log_archive)
+        try:
+            assert replayer.inject_wfs_getfeature_response(query) == \
+                b'<features/>'
+
+            with pytest.raises(LogReplayError):
+                replayer.inject_wfs_getfeature_response(
+                    wfs_build_getfeature_request(
+                        'dov-pub:Boringen', max_features=2))
+        finally:
+            replayer._pydov_exit()
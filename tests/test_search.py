@@ -1,6 +1,9 @@
 """Module grouping common tests for all search modules."""
 
 import datetime
+import re
+import warnings
+
 import numpy as np
 import pytest
 
@@ -20,9 +23,9 @@ from pydov.search.interpretaties import (
     LithologischeBeschrijvingenSearch, QuartairStratigrafieSearch)
 from pydov.search.sondering import SonderingSearch
 from pydov.search.observatie import ObservatieSearch
-from pydov.util.errors import InvalidSearchParameterError
+from pydov.util.errors import DataParseWarning, InvalidSearchParameterError
 from pydov.util.location import Point, WithinDistance
-from pydov.util.owsutil import typeconvert
+from pydov.util.owsutil import typeconvert, typeconvert_column
 from tests.abstract import ServiceCheck
 
 search_objects = [
@@ -239,3 +242,128 @@ def test_typeconvert_datetime():
     assert x == datetime.datetime(
         2023, 2, 7, 9, 19, 24, 123456,
         datetime.timezone(datetime.timedelta(hours=1)))
+
+
+@pytest.mark.parametrize('returntype,values', [
+    ('date', ['2023-02-07', '2023-02-07Z', '1999-12-31', None]),
+    ('datetime', ['2023-02-07T09:19:24', '2023-02-07T09:19:24Z',
+                  '2023-02-07T09:19:24.123+01:00', None]),
+    ('integer', ['1', '-12', ' 3', None]),
+    ('float', ['1.1', '-1e-3', '0.30000000000000004', None]),
+    ('boolean', ['true', 'False', '1', 'off', None]),
+    ('string', [' a ', 'b', '', None])])
+def test_typeconvert_column(returntype, values):
+    """Test whether converting a column in bulk returns the same values as
+    converting every single value.
+
+    Parameters
+    ----------
+    returntype : str
+        Datatype to convert to.
+    values : list of str
+        Values to convert.
+
+    """
+    values = values * 20
+    expected = [np.nan if v is None else typeconvert(v, returntype)
+                for v in values]
+
+    converted = typeconvert_column(values, returntype)
+
+    assert len(converted) == len(expected)
+    for x, y in zip(converted, expected):
+        assert type(x) is type(y)
+        assert x == y or (np.isnan(x) and np.isnan(y))
+
+
+def test_typeconvert_column_warning():
+    """Test whether the values that cannot be converted result in a single
+    DataParseWarning with the number of failures."""
+    values = ['2023-02-07', '10000-01-01', 'invalid'] * 20
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        converted = typeconvert_column(values, 'date')
+
+    assert len(w) == 1
+    assert issubclass(w[0].category, DataParseWarning)
+    assert 'Failed to convert 40 value(s)' in str(w[0].message)
+
+    assert converted[0] == datetime.date(2023, 2, 7)
+    assert np.isnan(converted[1])
+    assert np.isnan(converted[2])
+
+
+@pytest.mark.parametrize('returntype,values,expected,example', [
+    ('integer', ['1', '2.5', 'x', None], [1, np.nan, np.nan, np.nan],
+     "'2.5'"),
+    ('float', ['1.5', '1e-3', 'x', None], [1.5, 0.001, np.nan, np.nan],
+     "'x'")])
+def test_typeconvert_column_numeric_warning(returntype, values, expected,
+                                            example):
+    """Test whether the values of a numeric column that cannot be converted
+    result in a single DataParseWarning with an example error, while the
+    other values are converted.
+
+    Parameters
+    ----------
+    returntype : str
+        Datatype to convert to.
+    values : list of str
+        Values to convert.
+    expected : list
+        Expected converted values.
+    example : str
+        Value expected in the example error of the warning.
+
+    """
+    failures = len([v for v in values if v is not None]) - \
+        len([x for x in expected if not np.isnan(x)])
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        converted = typeconvert_column(values * 20, returntype)
+
+    assert len(w) == 1
+    assert issubclass(w[0].category, DataParseWarning)
+    assert f'Failed to convert {failures * 20} value(s)' in str(w[0].message)
+    assert 'e.g.: ' in str(w[0].message)
+    assert example in str(w[0].message)
+
+    for x, y in zip(converted, expected * 20):
+        assert x == y or (np.isnan(x) and np.isnan(y))
+
+
+@pytest.mark.parametrize('returntype,values', [
+    ('integer', ['1.0', '1e3', '5', ' -7 ', 'x', None]),
+    ('float', ['1.0', '1e3', '5', ' -7 ', 'x', 'nan', None])])
+def test_typeconvert_column_size(returntype, values):
+    """Test whether converting a short column (converted value by value)
+    and a long column (converted in bulk) returns the same values and the
+    same number of failures.
+
+    Parameters
+    ----------
+    returntype : str
+        Datatype to convert to.
+    values : list of str
+        Values to convert.
+
+    """
+    def convert(values):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            converted = typeconvert_column(values, returntype)
+        return converted, [str(i.message) for i in w]
+
+    short, short_warnings = convert(values)
+    long, long_warnings = convert(values * 20)
+
+    for x, y in zip(long, short * 20):
+        assert type(x) is type(y)
+        assert x == y or (np.isnan(x) and np.isnan(y))
+
+    assert len(short_warnings) == len(long_warnings) == 1
+    failures = re.search(r'Failed to convert (\d+) value', short_warnings[0])
+    assert f'Failed to convert {int(failures.group(1)) * 20} value' in \
+        long_warnings[0]
@@ -0,0 +1,171 @@
+"""Module grouping tests for the Arrow and Parquet output of searches."""
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from owslib.fes2 import PropertyIsEqualTo
+
+from pydov.search.fields import ReturnFieldList
+from pydov.search.grondwaterfilter import GrondwaterFilterSearch
+from pydov.util.dovutil import build_dov_url
+
+location_md_metadata = 'tests/data/types/grondwaterfilter/md_metadata.xml'
+location_fc_featurecatalogue = \
+    'tests/data/types/grondwaterfilter/fc_featurecatalogue.xml'
+location_wfs_describefeaturetype = \
+    'tests/data/types/grondwaterfilter/wfsdescribefeaturetype.xml'
+location_wfs_getfeature = 'tests/data/types/grondwaterfilter/wfsgetfeature.xml'
+location_wfs_feature = 'tests/data/types/grondwaterfilter/feature.xml'
+location_dov_xml = 'tests/data/types/grondwaterfilter/grondwaterfilter.xml'
+location_codelists = 'tests/data/types/grondwaterfilter'
+
+query = PropertyIsEqualTo(propertyname='filterfiche',
+                          literal=build_dov_url('data/filter/2003-004471'))
+
+
+def to_pylist(series):
+    """Get the values of a dataframe column, with None for missing values.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        Column of a dataframe.
+
+    Returns
+    -------
+    list
+        List of the values of the column.
+
+    """
+    return [None if v != v else v for v in series.astype(object)]
+
+
+@pytest.fixture
+def mp_search(mp_wfs, mp_get_schema, mp_remote_describefeaturetype,
+              mp_remote_md, mp_remote_fc, mp_remote_codelist,
+              mp_remote_wfs_feature, mp_dov_xml):
+    """Fixture to monkeypatch all remote calls of a search.
+
+    Yields
+    ------
+    pydov.search.grondwaterfilter.GrondwaterFilterSearch
+        Search instance.
+
+    """
+    yield GrondwaterFilterSearch()
+
+
+class TestSearchArrow(object):
+    """Class grouping tests for the Arrow and Parquet output of
+    searches."""
+
+    @pytest.mark.parametrize('return_fields', [
+        None, ('pkey_filter', 'filternummer', 'x', 'y')])
+    def test_search_arrow(self, mp_search, return_fields):
+        """Test the search method with Arrow output.
+
+        Test whether the table has the same columns and values as the
+        dataframe and whether the datatypes of the columns match the
+        datatypes of the fields.
+
+        Parameters
+        ----------
+        mp_search : pytest.fixture
+            Search instance with the remote calls monkeypatched.
+        return_fields : tuple of str or None
+            Fields to return.
+
+        """
+        if return_fields is not None:
+            return_fields = ReturnFieldList.from_field_names(*return_fields)
+
+        df = mp_search.search(query=query, return_fields=return_fields)
+        table = mp_search.search(query=query, return_fields=return_fields,
+                                 output='arrow')
+
+        assert isinstance(table, pa.Table)
+        assert table.column_names == list(df)
+        assert table.num_rows == len(df)
+
+        fields = mp_search.get_fields()
+        types = {
+            'string': pa.string(),
+            'float': pa.float64(),
+            'integer': pa.int64(),
+            'date': pa.date32(),
+            'boolean': pa.bool_()
+        }
+
+        for name in table.column_names:
+            assert table.schema.field(name).type == \
+                types[fields[name]['type']]
+            assert table.column(name).to_pylist() == to_pylist(df[name])
+
+    def test_search_to_parquet(self, mp_search, tmp_path):
+        """Test the search_to_parquet method.
+
+        Test whether the Parquet file contains the same table as the Arrow
+        output of the search method.
+
+        Parameters
+        ----------
+        mp_search : pytest.fixture
+            Search instance with the remote calls monkeypatched.
+        tmp_path : pathlib.Path
+            Temporary directory.
+
+        """
+        path = tmp_path / 'grondwaterfilter.parquet'
+
+        rows = mp_search.search_to_parquet(path, query=query)
+        table = mp_search.search(query=query, output='arrow')
+
+        assert rows == table.num_rows
+        assert pq.read_table(path).equals(table)
+
+    def test_search_to_parquet_chunks(self, mp_search, tmp_path):
+        """Test the search_to_parquet method with a chunk size.
+
+        Test whether each chunk is written as a row group.
+
+        Parameters
+        ----------
+        mp_search : pytest.fixture
+            Search instance with the remote calls monkeypatched.
+        tmp_path : pathlib.Path
+            Temporary directory.
+
+        """
+        path = tmp_path / 'grondwaterfilter.parquet'
+        chunks = list(mp_search.search_iter(query=query, chunk_size=1))
+
+        mp_search.search_to_parquet(path, query=query, chunk_size=1)
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == len(chunks)
+        assert [parquet_file.metadata.row_group(i).num_rows
+                for i in range(len(chunks))] == [len(c) for c in chunks]
+
+    def test_search_to_parquet_wrong_chunk_size(self, tmp_path):
+        """Test the search_to_parquet method with an invalid chunk size.
+
+        Test whether a ValueError is raised.
+
+        Parameters
+        ----------
+        tmp_path : pathlib.Path
+            Temporary directory.
+
+        """
+        with pytest.raises(ValueError):
+            GrondwaterFilterSearch().search_to_parquet(
+                tmp_path / 'grondwaterfilter.parquet', query=query,
+                chunk_size=0)
+
+    def test_search_wrong_output(self):
+        """Test the search method with an unknown output.
+
+        Test whether a ValueError is raised.
+
+        """
+        with pytest.raises(ValueError):
+            GrondwaterFilterSearch().search(query=query, output='csv')
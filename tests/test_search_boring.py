@@ -1,6 +1,7 @@
 """Module grouping tests for the boring search module."""
 import datetime
 
+import pandas as pd
 import pytest
 
 from owslib.fes2 import PropertyIsEqualTo
@@ -8,6 +9,9 @@ from owslib.fes2 import PropertyIsEqualTo
 from pydov.search.boring import BoringSearch
 from pydov.types.boring import Boring, MethodeXyz
 from pydov.search.fields import GeometryReturnField, ReturnFieldList
+from pydov.util.codelists import AbstractResolvableCodeList
+from pydov.util.errors import (CodelistFetchWarning, DataTypeWarning,
+                               RemoteFetchError)
 from tests.abstract import AbstractTestSearch, ServiceCheck
 
 location_md_metadata = 'tests/data/types/boring/md_metadata.xml'
@@ -201,6 +205,145 @@ class TestBoringSearch(AbstractTestSearch):
 
         assert sorted(list(df)) == sorted(search_type.get_field_names())
 
+    def test_search_typed_maxfeatures_only(self, mp_wfs, mp_get_schema,
+                                           mp_remote_describefeaturetype,
+                                           mp_remote_md, mp_remote_fc,
+                                           mp_remote_codelist,
+                                           mp_remote_wfs_feature, mp_dov_xml):
+        """Test the search method with typed output and only the
+        max_features parameter on a new search instance.
+
+        Test whether the fields are initialised before converting the
+        datatypes of the columns.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue.
+        mp_remote_codelist : pytest.fixture
+            Monkeypatch the call to get remote codelists.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+
+        """
+        search_instance = self.search_class()
+
+        df = search_instance.search(max_features=10, typed=True)
+
+        assert len(df) > 0
+        assert df.diepte_boring_tot.dtype == 'float64'
+        assert df.boorgatmeting.dtype == 'boolean'
+
+    def test_search_typed_codelist_error(self, monkeypatch, mp_wfs,
+                                         mp_get_schema,
+                                         mp_remote_describefeaturetype,
+                                         mp_remote_md, mp_remote_fc,
+                                         mp_remote_codelist,
+                                         mp_remote_wfs_feature, mp_dov_xml):
+        """Test the search method with typed output when the codelists
+        cannot be resolved.
+
+        Test whether a CodelistFetchWarning is emitted and the search result
+        is returned, with the categories based on the values.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue.
+        mp_remote_codelist : pytest.fixture
+            Monkeypatch the call to get remote codelists.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+
+        """
+        def get_values(self):
+            raise RemoteFetchError('Failed to fetch the codelist.')
+
+        monkeypatch.setattr(AbstractResolvableCodeList, 'get_values',
+                            get_values)
+
+        search_instance = self.search_class(
+            objecttype=Boring.with_extra_fields(MethodeXyz))
+
+        with pytest.warns(CodelistFetchWarning):
+            df = search_instance.search(
+                query=self.valid_query_single, typed=True)
+
+        assert len(df) > 0
+        assert isinstance(df.methode_xy.dtype, pd.CategoricalDtype)
+        assert list(df.methode_xy.cat.categories) == \
+            sorted(df.methode_xy.dropna().unique())
+
+    def test_search_typed_conversion_error(self, monkeypatch, mp_wfs,
+                                           mp_get_schema,
+                                           mp_remote_describefeaturetype,
+                                           mp_remote_md, mp_remote_fc,
+                                           mp_remote_codelist,
+                                           mp_remote_wfs_feature, mp_dov_xml):
+        """Test the search method with typed output when a column cannot be
+        converted to the datatype of its field.
+
+        Test whether a DataTypeWarning is emitted and the column is returned
+        as is.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue.
+        mp_remote_codelist : pytest.fixture
+            Monkeypatch the call to get remote codelists.
+        mp_remote_wfs_feature : pytest.fixture
+            Monkeypatch the call to get WFS features.
+        mp_dov_xml : pytest.fixture
+            Monkeypatch the call to get the remote XML data.
+
+        """
+        search_instance = self.search_class()
+        fields = search_instance.get_fields()
+        field = dict(fields['boornummer'])
+        field['type'] = 'integer'
+        monkeypatch.setitem(search_instance._fields, 'boornummer', field)
+
+        with pytest.warns(DataTypeWarning, match='boornummer'):
+            df = search_instance.search(
+                query=self.valid_query_single, typed=True)
+
+        assert df.boornummer.dtype != 'Int64'
+        assert df.boornummer[0] == 'GEO-04/169-BNo-B1'
+        assert df.diepte_boring_tot.dtype == 'float64'
+
     @pytest.mark.online
     @pytest.mark.skipif(not ServiceCheck.service_ok(),
                         reason="DOV service is unreachable")
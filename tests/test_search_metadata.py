@@ -0,0 +1,162 @@
+"""Module grouping tests for the concurrent initialisation of the metadata
+of search classes."""
+
+from owslib.etree import etree
+from owslib.iso import MD_Metadata
+import pytest
+
+import pydov
+from pydov.search.abstract import AbstractSearch
+from pydov.search.boring import BoringSearch
+from pydov.search.sondering import SonderingSearch
+from pydov.util import owsutil
+
+
+def read(path):
+    """Read the file at the given path.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to read.
+
+    Returns
+    -------
+    bytes
+        Contents of the file.
+
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def get_datatype(url):
+    """Get the datatype of the test data to use for the given URL.
+
+    Parameters
+    ----------
+    url : str
+        Requested URL.
+
+    Returns
+    -------
+    str
+        Name of the datatype of the test data.
+
+    """
+    return 'sondering' if 'Sondering' in url else 'boring'
+
+
+@pytest.fixture
+def mp_metadata(monkeypatch, wfs_capabilities):
+    """Monkeypatch the remote metadata requests of the Boring and Sondering
+    layers.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+    wfs_capabilities : pytest.fixture
+        Fixture providing WFS capabilities response.
+
+    Returns
+    -------
+    dict
+        Dictionary with the requested URLs or layers per type of metadata.
+
+    """
+    requested = {'capabilities': [], 'describefeaturetype': [],
+                 'md_metadata': [], 'fc_featurecatalogue': []}
+
+    def _get_wfs_capabilities(url):
+        requested['capabilities'].append(url)
+        return wfs_capabilities
+
+    def _get_remote_describefeaturetype(url):
+        requested['describefeaturetype'].append(url)
+        return read('tests/data/types/{}/wfsdescribefeaturetype.xml'.format(
+            get_datatype(url)))
+
+    def _get_remote_metadata(contentmetadata):
+        requested['md_metadata'].append(contentmetadata.id)
+        return MD_Metadata(etree.fromstring(read(
+            'tests/data/types/{}/md_metadata.xml'.format(
+                get_datatype(contentmetadata.id)))).find(
+            './{http://www.isotc211.org/2005/gmd}MD_Metadata'))
+
+    def _get_remote_fc(url):
+        requested['fc_featurecatalogue'].append(url)
+        datatype = 'boring' if 'c0cbd397' in url else 'sondering'
+        return read('tests/data/types/{}/fc_featurecatalogue.xml'.format(
+            datatype))
+
+    monkeypatch.setattr(owsutil, 'get_wfs_capabilities',
+                        _get_wfs_capabilities)
+    monkeypatch.setattr(owsutil, '__get_remote_describefeaturetype',
+                        _get_remote_describefeaturetype)
+    monkeypatch.setattr(owsutil, 'get_remote_metadata', _get_remote_metadata)
+    monkeypatch.setattr(owsutil, '__get_remote_fc', _get_remote_fc)
+    return requested
+
+
+class TestInitMetadata(object):
+    """Class grouping tests for the initialisation of the metadata."""
+
+    def test_get_fields(self, monkeypatch, mp_metadata):
+        """Test whether every metadata document is requested once and the
+        fields are built a single time.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_metadata : pytest.fixture
+            Monkeypatch of the remote metadata requests.
+
+        """
+        built = []
+        build_fields = AbstractSearch._build_fields
+
+        def _build_fields(self, wfs_schema, feature_catalogue):
+            built.append(self)
+            return build_fields(self, wfs_schema, feature_catalogue)
+
+        monkeypatch.setattr(AbstractSearch, '_build_fields', _build_fields)
+
+        search = BoringSearch()
+        fields = search.get_fields()
+        search._init_namespace()
+
+        assert fields['diepte_boring_tot']['type'] == 'float'
+        assert fields['diepte_boring_tot']['definition'] is not None
+        assert search._wfs_namespace == \
+            'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+        assert len(built) == 1
+        for requested in mp_metadata.values():
+            assert len(requested) == 1
+
+    def test_warm_up(self, mp_metadata):
+        """Test whether multiple search classes are initialised at once,
+        sharing the capabilities of their WFS endpoint.
+
+        Parameters
+        ----------
+        mp_metadata : pytest.fixture
+            Monkeypatch of the remote metadata requests.
+
+        """
+        sondering_search = SonderingSearch()
+        searches = pydov.warm_up([BoringSearch, sondering_search])
+
+        assert isinstance(searches[0], BoringSearch)
+        assert searches[1] is sondering_search
+        assert searches[0]._wfs is searches[1]._wfs
+
+        assert 'diepte_boring_tot' in searches[0].get_fields()
+        assert 'diepte_sondering_tot' in searches[1].get_fields()
+
+        assert len(mp_metadata['capabilities']) == 1
+        assert len(mp_metadata['describefeaturetype']) == 2
+        assert len(mp_metadata['md_metadata']) == 2
+        assert len(mp_metadata['fc_featurecatalogue']) == 2
@@ -1,12 +1,21 @@
+import copy
 import pydov
 import pytest
 import os
 import re
+import warnings
+
+import pandas as pd
+from pandas.api.types import union_categoricals
 
 from owslib.etree import etree
 from owslib.fes2 import PropertyIsGreaterThanOrEqualTo
 from pydov.search.boring import BoringSearch
 from pydov.util import owsutil
+from pydov.util.codelists import AbstractCodeList, CodeListItem
+from pydov.util.hooks import AbstractReadHook, Hooks
+from pydov.util.location import Box, Within
+from pydov.util.tiling import TilePlanner
 
 location_md_metadata = 'tests/data/types/boring/md_metadata.xml'
 location_fc_featurecatalogue = \
@@ -80,6 +89,8 @@ def mp_remote_wfs_paged_feature(monkeypatch, request):
 
     This patch uses both the start_index as well as the max_features from the
     WFS request to ensure the right page and number of results are returned.
+    Requests with resultType 'hits' return the number of matched features
+    only.
 
     Parameters
     ----------
@@ -90,6 +101,12 @@ def mp_remote_wfs_paged_feature(monkeypatch, request):
 
     """
     def __get_remote_wfs_feature(*args, **kwargs):
+        if kwargs['get_feature_request'].get('resultType') == 'hits':
+            return (
+                '<wfs:FeatureCollection '
+                'xmlns:wfs="http://www.opengis.net/wfs/2.0" '
+                'numberMatched="20" numberReturned="0"/>').encode('utf-8')
+
         start_index = int(kwargs['get_feature_request'].get('startIndex'))
 
         count = kwargs['get_feature_request'].get('count')
@@ -125,6 +142,82 @@ def mp_remote_wfs_paged_feature(monkeypatch, request):
                         __get_remote_wfs_feature)
 
 
+@pytest.fixture
+def mp_remote_wfs_filtered_feature(monkeypatch):
+    """Monkeypatch the call to get WFS features, with support for spatial
+    tiles and keyset pagination.
+
+    The features of all pages are filtered on the tile in the WFS request,
+    enlarged with a margin so features near the border of a tile are returned
+    for multiple tiles. When the WFS request is sorted, the features are
+    sorted and filtered on the key in the request. Both the start_index and
+    the max_features from the WFS request are taken into account.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    members = []
+    for i in range(2):
+        file_path = location_wfs_getfeature.replace('.xml', f'_{i}.xml')
+        members.extend(etree.parse(file_path).getroot().findall(
+            './/{http://www.opengis.net/wfs/2.0}member'))
+
+    def in_tile(member, tile, margin=2000):
+        x = float(member[0].findtext(
+            './{http://dov.vlaanderen.be/ocdov/dov-pub}X_mL72'))
+        y = float(member[0].findtext(
+            './{http://dov.vlaanderen.be/ocdov/dov-pub}Y_mL72'))
+        minx, miny = [float(i) for i in tile[0].text.split()]
+        maxx, maxy = [float(i) for i in tile[1].text.split()]
+        return (minx - margin <= x <= maxx + margin
+                and miny - margin <= y <= maxy + margin)
+
+    def __get_remote_wfs_feature(*args, **kwargs):
+        request = kwargs['get_feature_request']
+        tiles = request.findall('.//{http://www.opengis.net/gml/3.2}Envelope')
+
+        matched = [m for m in members if len(tiles) < 2
+                   or in_tile(m, tiles[-1])]
+
+        sort_by = request.findtext(
+            './/{http://www.opengis.net/fes/2.0}SortBy//'
+            '{http://www.opengis.net/fes/2.0}ValueReference')
+        if sort_by is not None:
+            def key(member):
+                return member[0].findtext(
+                    f'./{{http://dov.vlaanderen.be/ocdov/dov-pub}}{sort_by}')
+
+            matched = sorted(matched, key=key)
+            key_start = request.findtext(
+                './/{http://www.opengis.net/fes/2.0}PropertyIsGreaterThan/'
+                '{http://www.opengis.net/fes/2.0}Literal')
+            if key_start is not None:
+                matched = [m for m in matched if key(m) > key_start]
+
+        tree = etree.Element('{http://www.opengis.net/wfs/2.0}'
+                             'FeatureCollection')
+        tree.set('numberMatched', str(len(matched)))
+
+        if request.get('resultType') == 'hits':
+            tree.set('numberReturned', '0')
+        else:
+            start_index = int(request.get('startIndex'))
+            count = min(int(request.get('count', page_size)), page_size)
+            returned = matched[start_index:start_index + count]
+            tree.set('numberReturned', str(len(returned)))
+            for member in returned:
+                tree.append(copy.deepcopy(member))
+
+        return etree.tostring(tree)
+
+    monkeypatch.setattr(pydov.util.owsutil,
+                        'wfs_get_feature',
+                        __get_remote_wfs_feature)
+
+
 class TestSearchWfsPaging(object):
     """Class grouping tests regarding WFS paging."""
 
@@ -199,3 +292,403 @@ class TestSearchWfsPaging(object):
         s = BoringSearch()
         df = s.search(return_fields=['pkey_boring'], max_features=15)
         assert len(df) == 15
+
+    def test_search_iter_pages(
+            self, mp_wfs, mp_get_schema, mp_remote_describefeaturetype,
+            mp_wfs_max_features, mp_remote_wfs_paged_feature):
+        """Test the search_iter method yielding one chunk per WFS page.
+
+        Test whether the chunks are equal to the WFS pages and the search
+        output.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_paged_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for paging.
+
+        """
+        s = BoringSearch()
+        query = PropertyIsGreaterThanOrEqualTo('diepte_tot_m', '0')
+
+        chunks = list(s.search_iter(query=query,
+                                    return_fields=['pkey_boring']))
+        assert [len(c) for c in chunks] == [page_size, page_size]
+
+        df = s.search(query=query, return_fields=['pkey_boring'])
+        assert pd.concat(chunks, ignore_index=True).equals(df)
+
+    def test_search_iter_chunk_size(
+            self, mp_wfs, mp_get_schema, mp_remote_describefeaturetype,
+            mp_wfs_max_features, mp_remote_wfs_paged_feature):
+        """Test the search_iter method using a chunk_size.
+
+        Test whether the number of features in the chunks is correct.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_paged_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for paging.
+
+        """
+        s = BoringSearch()
+        chunks = list(s.search_iter(return_fields=['pkey_boring'],
+                                    max_features=15, chunk_size=4))
+        assert [len(c) for c in chunks] == [4, 4, 4, 3]
+        assert list(chunks[0]) == ['pkey_boring']
+
+    def test_search_validation_once(
+            self, monkeypatch, mp_wfs, mp_get_schema,
+            mp_remote_describefeaturetype, mp_wfs_max_features,
+            mp_remote_wfs_paged_feature):
+        """Test whether the search parameters are validated once per search.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_paged_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for paging.
+
+        """
+        validations = []
+        pre_search_validation = BoringSearch._pre_search_validation
+
+        def validate(self, *args):
+            validations.append(args)
+            return pre_search_validation(self, *args)
+
+        monkeypatch.setattr(BoringSearch, '_pre_search_validation', validate)
+
+        s = BoringSearch()
+        s.search(return_fields=['pkey_boring'], max_features=15)
+        assert len(validations) == 1
+
+        list(s.search_iter(return_fields=['pkey_boring'], max_features=15))
+        assert len(validations) == 2
+
+    def test_search_iter_typed(
+            self, mp_wfs, mp_get_schema, mp_remote_describefeaturetype,
+            mp_remote_md, mp_remote_fc, mp_wfs_max_features,
+            mp_remote_wfs_paged_feature):
+        """Test the search_iter method with typed output.
+
+        Test whether the chunks have the same datatypes, and whether their
+        values are equal to the typed search output.
+
+        Parameters
+        ----------
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_get_schema : pytest.fixture
+            Monkeypatch the call to a remote OWSLib schema.
+        mp_remote_describefeaturetype : pytest.fixture
+            Monkeypatch the call to a remote DescribeFeatureType.
+        mp_remote_md : pytest.fixture
+            Monkeypatch the call to get the remote metadata.
+        mp_remote_fc : pytest.fixture
+            Monkeypatch the call to get the remote feature catalogue.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_paged_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for paging.
+
+        """
+        s = BoringSearch()
+        return_fields = ['pkey_boring', 'diepte_boring_tot',
+                         'datum_aanvang']
+
+        chunks = list(s.search_iter(return_fields=return_fields,
+                                    max_features=15, chunk_size=4,
+                                    typed=True))
+        assert [len(c) for c in chunks] == [4, 4, 4, 3]
+
+        for chunk in chunks:
+            assert list(chunk.dtypes) == list(chunks[0].dtypes)
+        assert pd.api.types.is_datetime64_any_dtype(
+            chunks[0].datum_aanvang.dtype)
+
+        df = s.search(return_fields=return_fields, max_features=15,
+                      typed=True)
+        assert pd.concat(chunks, ignore_index=True).equals(df)
+
+    def test_search_iter_typed_codelist(self):
+        """Test the conversion of the columns of chunks with typed output
+        for a field with a codelist.
+
+        Test whether values that are not in the codelist are kept and added
+        to the categories of their chunk, and whether the chunks can be
+        combined using union_categoricals.
+
+        """
+        codelist = AbstractCodeList()
+        codelist.add_items([CodeListItem('a', 'A'), CodeListItem('b', 'B')])
+        field = {'name': 'code', 'type': 'string', 'codelist': codelist}
+
+        s = BoringSearch()
+        chunks = []
+        for values in (['a', 'x', 'b'], ['b', 'y', None], ['a', None, 'b']):
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                chunks.append(s._convert_dtype(
+                    pd.Series(values, name='code'), field, chunked=True))
+
+        assert list(chunks[0].cat.categories) == ['a', 'b', 'x']
+        assert list(chunks[1].cat.categories) == ['a', 'b', 'y']
+        assert list(chunks[2].cat.categories) == ['a', 'b']
+
+        df = union_categoricals(chunks)
+        assert list(df.categories) == ['a', 'b', 'x', 'y']
+        assert list(pd.Series(df).astype(object).where(df.notna(), None)) \
+            == ['a', 'x', 'b', 'b', 'y', None, 'a', None, 'b']
+
+    def test_search_iter_chunk_size_invalid(self):
+        """Test the search_iter method using an invalid chunk_size.
+
+        Test whether a ValueError is raised.
+
+        """
+        s = BoringSearch()
+        with pytest.raises(ValueError):
+            next(s.search_iter(max_features=15, chunk_size=0))
+
+    @pytest.mark.parametrize('max_features', [None, 5, 15])
+    def test_hits_probe(
+            self, monkeypatch, mp_wfs, mp_get_schema,
+            mp_remote_describefeaturetype, mp_wfs_max_features,
+            mp_remote_wfs_paged_feature, max_features):
+        """Test a search requesting the number of matching features upfront.
+
+        Test whether the expected total is reported to the hooks before the
+        features are received and whether the output equals the one without
+        the hits probe.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_paged_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for paging.
+        max_features : int
+            Maximum number of features to request.
+
+        """
+        events = []
+
+        class HitsHook(AbstractReadHook):
+            def wfs_search_hits(self, number_matched, number_expected,
+                                number_pages):
+                events.append(('hits', number_expected, number_pages))
+
+            def wfs_search_result(self, number_matched, number_returned):
+                events.append(('result', number_returned))
+
+        query = PropertyIsGreaterThanOrEqualTo('diepte_tot_m', '0')
+        s = BoringSearch()
+        df = s.search(query=query, return_fields=['pkey_boring'],
+                      max_features=max_features)
+
+        monkeypatch.setattr(pydov, 'wfs_hits_probe', True)
+        monkeypatch.setattr(pydov, 'hooks', Hooks((HitsHook(),)))
+        df_hits = s.search(query=query, return_fields=['pkey_boring'],
+                           max_features=max_features)
+
+        expected = max_features or 20
+        assert df_hits.equals(df)
+        assert events[0] == ('hits', expected, -(-expected // page_size))
+        assert len(events) == events[0][2] + 1
+
+    def test_tiled(
+            self, monkeypatch, mp_wfs, mp_get_schema,
+            mp_remote_describefeaturetype, mp_wfs_max_features,
+            mp_remote_wfs_filtered_feature):
+        """Test a spatial search split in tiles.
+
+        Test whether the features are split in multiple tiles and the output
+        contains all features exactly once.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_filtered_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for spatial tiles and keyset pagination.
+
+        """
+        events = []
+
+        class ResultHook(AbstractReadHook):
+            def wfs_search_result(self, number_matched, number_returned):
+                events.append(number_returned)
+
+        location = Within(Box(91000, 170000, 159000, 189000, epsg=31370))
+        s = BoringSearch()
+        df = s.search(location=location, return_fields=['pkey_boring'])
+
+        monkeypatch.setattr(pydov, 'tile_planner', TilePlanner())
+        monkeypatch.setattr(pydov, 'hooks', Hooks((ResultHook(),)))
+        df_tiled = s.search(location=location, return_fields=['pkey_boring'])
+
+        assert len(df) == 20
+        assert len(events) > 2
+        assert sum(events) > 20
+        assert sorted(df_tiled.pkey_boring) == sorted(df.pkey_boring)
+
+    @pytest.mark.parametrize('max_features', [None, 5, 15])
+    def test_keyset(
+            self, monkeypatch, mp_wfs, mp_get_schema,
+            mp_remote_describefeaturetype, mp_wfs_max_features,
+            mp_remote_wfs_filtered_feature, max_features):
+        """Test a search using keyset pagination.
+
+        Test whether the features are requested in pages sorted on the
+        permanent key and the output contains all features exactly once.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_filtered_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for spatial tiles and keyset pagination.
+        max_features : int
+            Maximum number of features to request.
+
+        """
+        events = []
+
+        class ResultHook(AbstractReadHook):
+            def wfs_search_result(self, number_matched, number_returned):
+                events.append(number_returned)
+
+        query = PropertyIsGreaterThanOrEqualTo('diepte_tot_m', '0')
+        s = BoringSearch()
+        df = s.search(query=query, return_fields=['pkey_boring'])
+
+        monkeypatch.setattr(pydov, 'wfs_keyset_paging', True)
+        monkeypatch.setattr(pydov, 'hooks', Hooks((ResultHook(),)))
+        df_keyset = s.search(query=query, return_fields=['pkey_boring'],
+                             max_features=max_features)
+
+        expected = max_features or 20
+        assert list(df_keyset.pkey_boring) == \
+            sorted(df.pkey_boring)[:expected]
+        assert events == [min(page_size, expected - i)
+                          for i in range(0, expected, page_size)]
+
+    @pytest.mark.parametrize('number_matched', ['unknown', None])
+    @pytest.mark.parametrize('paging', ['offset', 'hits', 'keyset'])
+    @pytest.mark.parametrize('max_features', [None, 5, 15, 20])
+    def test_number_matched_unknown(
+            self, monkeypatch, mp_wfs, mp_get_schema,
+            mp_remote_describefeaturetype, mp_wfs_max_features,
+            mp_remote_wfs_filtered_feature, number_matched, paging,
+            max_features):
+        """Test a search where the server doesn't report the number of
+        matched features.
+
+        Test whether the next pages are requested until a page comes back
+        short and the output equals the one where the number of matched
+        features is known.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_wfs : pytest.fixture
+            Monkeypatch the call to the remote GetCapabilities request.
+        mp_wfs_max_features : pytest.fixture
+            Monkeypatch the call to get the maximum features from the
+            capabilities.
+        mp_remote_wfs_filtered_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS GetFeature, with support
+            for spatial tiles and keyset pagination.
+        number_matched : str
+            Value of the numberMatched attribute in the WFS responses, or
+            None to leave it out.
+        paging : str
+            Paging strategy to use: 'offset', 'hits' or 'keyset'.
+        max_features : int
+            Maximum number of features to request.
+
+        """
+        query = PropertyIsGreaterThanOrEqualTo('diepte_tot_m', '0')
+        s = BoringSearch()
+        df = s.search(query=query, return_fields=['pkey_boring'])
+
+        get_feature = pydov.util.owsutil.wfs_get_feature
+        requests = []
+
+        def __get_remote_wfs_feature(*args, **kwargs):
+            tree = etree.fromstring(get_feature(*args, **kwargs))
+            if number_matched is None:
+                del tree.attrib['numberMatched']
+            else:
+                tree.set('numberMatched', number_matched)
+            if kwargs['get_feature_request'].get('resultType') != 'hits':
+                requests.append(int(tree.get('numberReturned')))
+            return etree.tostring(tree)
+
+        monkeypatch.setattr(pydov.util.owsutil, 'wfs_get_feature',
+                            __get_remote_wfs_feature)
+        monkeypatch.setattr(pydov, 'wfs_hits_probe', paging == 'hits')
+        monkeypatch.setattr(pydov, 'wfs_keyset_paging', paging == 'keyset')
+
+        df_unknown = s.search(query=query, return_fields=['pkey_boring'],
+                              max_features=max_features)
+
+        expected = max_features or 20
+        if paging == 'keyset':
+            assert list(df_unknown.pkey_boring) == \
+                sorted(df.pkey_boring)[:expected]
+        else:
+            assert list(df_unknown.pkey_boring) == \
+                list(df.pkey_boring)[:expected]
+
+        # pages are requested until a short or empty page, or until the
+        # maximum number of features is reached
+        pages = [min(page_size, expected - i)
+                 for i in range(0, expected, page_size)]
+        if max_features is None:
+            pages.append(0)
+        assert requests == pages
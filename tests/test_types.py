@@ -1,5 +1,7 @@
 """Module grouping tests for the boring search module."""
 
+import pickle
+
 import pytest
 
 from pydov.types.bodemsite import Bodemsite
@@ -22,7 +24,11 @@ from pydov.types.interpretaties import (
     InformeleHydrogeologischeStratigrafie,
 )
 from pydov.types.sondering import Sondering
-from pydov.types.abstract import AbstractDovFieldSet, AbstractDovSubType
+from pydov.types.abstract import (
+    AbstractDovFieldSet,
+    AbstractDovSubType,
+    DataRecord,
+)
 
 
 type_objects = [
@@ -172,3 +178,67 @@ def test_get_subtypes(objecttype):
             assert 'definition' in fs
             assert isinstance(fs['definition'], str)
             assert 'following fields:' in fs['definition']
+
+
+@pytest.mark.parametrize("objecttype", type_objects)
+def test_data_record_schema(objecttype):
+    """Test whether the instances of a type share the schema of their data
+    records, and do not have an instance dictionary for it.
+
+    """
+    first = objecttype('https://www.dov.vlaanderen.be/data/x/1')
+    second = objecttype('https://www.dov.vlaanderen.be/data/x/2')
+
+    assert isinstance(first.data, DataRecord)
+    assert first.data._schema is second.data._schema
+    assert first.data._values is not second.data._values
+    assert not hasattr(first.data, '__dict__')
+    assert not hasattr(first, '__dict__')
+
+
+@pytest.mark.parametrize("objecttype", type_objects)
+def test_slots(objecttype):
+    """Test whether the instances of a type, its subtypes and the types
+    built with other subtypes or extra fields have no instance dictionary.
+
+    """
+    pkey = 'https://www.dov.vlaanderen.be/data/x/1'
+
+    for st in objecttype.get_subtypes().values():
+        assert not hasattr(st['class'](), '__dict__')
+        assert not hasattr(
+            objecttype.with_subtype(st['class'])(pkey), '__dict__')
+
+    for fs in objecttype.get_fieldsets().values():
+        assert not hasattr(
+            objecttype.with_extra_fields(fs['class'])(pkey), '__dict__')
+
+
+def test_data_record():
+    """Test whether a DataRecord behaves like a dictionary."""
+    record = DataRecord({'a': 0, 'b': 1}, 'x')
+
+    assert dict(record) == {'a': 'x', 'b': 'x'}
+    assert record.get('a') == 'x'
+    assert record.get('c', 1) == 1
+
+    record['b'] = 2
+    record['c'] = 3
+    assert dict(record) == {'a': 'x', 'b': 2, 'c': 3}
+    assert len(record) == 3
+    assert 'c' in record
+
+    del record['a']
+    del record['c']
+    assert dict(record) == {'b': 2}
+    assert 'a' not in record
+    assert record.get('a') is None
+    with pytest.raises(KeyError):
+        record['a']
+    with pytest.raises(KeyError):
+        del record['a']
+
+    copy = pickle.loads(pickle.dumps(record))
+    assert isinstance(copy, DataRecord)
+    assert dict(copy) == {'b': 2}
+    assert 'a' not in copy
@@ -1,5 +1,6 @@
 """Module grouping tests for the pydov.types.bodemclassificatie module."""
 
+from pydov.types.abstract import DataRecord
 from pydov.types.bodemclassificatie import Bodemclassificatie
 from pydov.search.fields import ReturnFieldList
 from pydov.util.dovutil import build_dov_url
@@ -66,5 +67,5 @@ class TestBodemclassificatie(AbstractTestTypes):
         if self.pkey_base is not None:
             assert feature.pkey.startswith(self.pkey_base)
 
-        assert isinstance(feature.data, dict)
+        assert isinstance(feature.data, DataRecord)
         assert isinstance(feature.subdata, dict)
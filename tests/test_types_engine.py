@@ -0,0 +1,540 @@
+"""Module grouping tests for the download engines of the DOV types."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from owslib.etree import etree
+
+import pydov
+from pydov.search.fields import ReturnFieldList
+from pydov.types.boring import Boring
+from pydov.types.fields import XmlField
+from pydov.util import dovutil, net, parsing
+from pydov.util.caching import GzipTextFileCache, ParsedDataCache
+from pydov.util.dovutil import build_dov_url
+from pydov.util.errors import ParsedCacheWarning, XmlParseWarning
+from pydov.util.hooks import AbstractReadHook, Hooks
+
+location_wfs_feature = 'tests/data/types/boring/feature.xml'
+location_dov_xml = 'tests/data/types/boring/boring.xml'
+
+namespace = 'http://dov.vlaanderen.be/ocdov/dov-pub'
+
+
+def get_features(datatype=Boring):
+    """Get a list of Boring instances with distinct permanent keys.
+
+    Parameters
+    ----------
+    datatype : subclass of pydov.types.boring.Boring, optional
+        Type of the instances. Defaults to Boring.
+
+    Returns
+    -------
+    list of pydov.types.boring.Boring
+        List of Boring instances.
+
+    """
+    with open(location_wfs_feature, 'r') as f:
+        element = etree.fromstring(f.read().encode('utf8'))
+
+    features = []
+    for i in range(20):
+        feature = datatype.from_wfs_element(element, namespace)
+        feature.pkey = build_dov_url('data/boring/{}'.format(i))
+        feature.data['pkey_boring'] = feature.pkey
+        features.append(feature)
+    return features
+
+
+@pytest.fixture
+def features():
+    """Fixture providing a list of Boring instances with distinct
+    permanent keys.
+
+    Returns
+    -------
+    list of pydov.types.boring.Boring
+        List of Boring instances.
+
+    """
+    return get_features()
+
+
+@pytest.fixture
+def mp_remote_url(monkeypatch):
+    """Monkeypatch the synchronous and asynchronous remote requests to return
+    the local XML document, with a decreasing delay so the requests
+    complete out of order.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list of str
+        List of requested URLs.
+
+    """
+    with open(location_dov_xml, 'r') as f:
+        data = f.read().encode('utf-8')
+
+    requested = []
+
+    def delay(url):
+        return (20 - int(url.rstrip('.xml').split('/')[-1])) / 1000
+
+    def get_remote_url(url, session=None, limit_concurrency=False):
+        requested.append(url)
+        time.sleep(delay(url))
+        return data
+
+    async def get_remote_url_async(url, session):
+        requested.append(url)
+        await asyncio.sleep(delay(url))
+        return data
+
+    monkeypatch.setattr(dovutil, 'get_remote_url', get_remote_url)
+    monkeypatch.setattr(dovutil, 'get_remote_url_async',
+                        get_remote_url_async)
+    return requested
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    """Disable the pydov cache.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(pydov, 'cache', None)
+
+
+class TestEngine:
+    """Class grouping tests for the threads and async download engines."""
+
+    def test_async_equals_threads(self, monkeypatch, features, mp_remote_url,
+                                  no_cache):
+        """Test whether the async engine returns the same rows, in the same
+        order, as the threads engine.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', 'threads')
+        df_threads = Boring.to_df_array(features)
+
+        monkeypatch.setattr(pydov, 'engine', 'async')
+        df_async = Boring.to_df_array(get_features())
+
+        assert len(df_async) > len(features)
+        assert [str(r) for r in df_async] == [str(r) for r in df_threads]
+        assert len(mp_remote_url) == 2 * len(features)
+
+    def test_async_wfs_only(self, monkeypatch, features, mp_remote_url,
+                            no_cache):
+        """Test whether the async engine does not request any XML document
+        if only WFS fields are requested.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', 'async')
+        df = Boring.to_df_array(
+            features,
+            ReturnFieldList.from_field_names('pkey_boring', 'boornummer'))
+
+        assert len(df) == len(features)
+        assert [r[0] for r in df] == [f.pkey for f in features]
+        assert len(mp_remote_url) == 0
+
+    def test_async_cache(self, monkeypatch, tmp_path, features,
+                         mp_remote_url):
+        """Test whether the async engine uses the cache.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        tmp_path : pytest.fixture
+            Fixture providing a temporary directory.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', 'async')
+        monkeypatch.setattr(pydov, 'cache', GzipTextFileCache(
+            cachedir=str(tmp_path)))
+
+        Boring.to_df_array(features)
+        assert len(mp_remote_url) == len(features)
+
+        Boring.to_df_array(get_features())
+        assert len(mp_remote_url) == len(features)
+
+    def test_unknown_engine(self, monkeypatch, features):
+        """Test whether an unknown engine raises a ValueError.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', 'unknown')
+        with pytest.raises(ValueError):
+            Boring.to_df_array(features)
+
+    def test_iter_df_array_lazy(self, monkeypatch, features, mp_remote_url,
+                                no_cache):
+        """Test whether iter_df_array starts yielding rows before the
+        iterable of instances is exhausted.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', 'threads')
+        monkeypatch.setattr(net, 'worker_threads', 1)
+        consumed = []
+
+        def generate():
+            for feature in features:
+                consumed.append(feature)
+                yield feature
+
+        rows = Boring.iter_df_array(generate())
+        first = next(rows)
+
+        assert len(first) > 0
+        assert len(consumed) < len(features)
+
+        remaining = list(rows)
+        assert len(consumed) == len(features)
+        assert len(remaining) == len(features) - 1
+
+
+@pytest.fixture
+def parse_processes(monkeypatch):
+    """Parse the XML documents in two worker processes, and stop them
+    afterwards.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    monkeypatch.setattr(pydov, 'parse_processes', 2)
+    yield
+    parsing.shutdown()
+
+
+class TestProcesses:
+    """Class grouping tests for parsing the XML documents in worker
+    processes."""
+
+    @pytest.mark.parametrize('engine', ['threads', 'async'])
+    def test_processes_equals_threads(self, monkeypatch, mp_remote_url,
+                                      no_cache, engine):
+        """Test whether parsing in worker processes returns the same rows,
+        in the same order, as parsing in the download threads.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        engine : str
+            Download engine to use.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', engine)
+        df_threads = Boring.to_df_array(get_features())
+
+        monkeypatch.setattr(pydov, 'parse_processes', 2)
+        try:
+            with monkeypatch.context() as m:
+                m.setattr(Boring, 'get_df_array', None)
+                df_processes = Boring.to_df_array(get_features())
+        finally:
+            parsing.shutdown()
+
+        assert len(df_processes) > 0
+        assert [str(r) for r in df_processes] == \
+            [str(r) for r in df_threads]
+
+    @pytest.mark.parametrize('engine', ['threads', 'async'])
+    def test_processes_columns(self, monkeypatch, mp_remote_url, no_cache,
+                               engine):
+        """Test whether building the columns in worker processes returns the
+        same columns as building them in the download threads.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        engine : str
+            Download engine to use.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', engine)
+        columns_threads = Boring.to_df_columns(get_features())
+
+        monkeypatch.setattr(pydov, 'parse_processes', 2)
+        try:
+            with monkeypatch.context() as m:
+                m.setattr(Boring, 'get_df_columns', None)
+                columns_processes = Boring.to_df_columns(get_features())
+        finally:
+            parsing.shutdown()
+
+        assert list(columns_processes) == list(columns_threads)
+        assert len(columns_processes['pkey_boring']) > 0
+        for name in columns_threads:
+            assert str(list(columns_processes[name])) == \
+                str(list(columns_threads[name]))
+
+    def test_processes_extra_fields(self, monkeypatch, mp_remote_url,
+                                    no_cache, parse_processes):
+        """Test whether types created at runtime are parsed in the worker
+        processes too.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        parse_processes : pytest.fixture
+            Fixture enabling the worker processes.
+
+        """
+        boring = Boring.with_extra_fields([
+            XmlField(name='doel', source_xpath='/boring/doel',
+                     datatype='string')])
+        assert boring._get_process_spec() is not None
+
+        features = get_features(boring)
+        monkeypatch.setattr(boring, 'get_df_array', None)
+        df = boring.to_df_array(
+            features, ReturnFieldList.from_field_names('pkey_boring', 'doel'))
+
+        assert len(df) == len(features)
+        assert all(r[1] == 'Geotechnisch onderzoek' for r in df)
+
+    def test_processes_unpicklable(self):
+        """Test whether types that cannot be pickled are not parsed in the
+        worker processes."""
+        boring = Boring.with_extra_fields([
+            XmlField(name='doel', source_xpath='/boring/doel',
+                     datatype='string')])
+        boring.fields[-1]['split_fn'] = lambda x: x.split('|')
+
+        assert boring._get_process_spec() is None
+
+    def test_processes_warnings(self, monkeypatch, features, no_cache,
+                                parse_processes):
+        """Test whether the warnings emitted while parsing in the worker
+        processes are emitted in the current process.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        features : pytest.fixture
+            Fixture providing a list of Boring instances.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        parse_processes : pytest.fixture
+            Fixture enabling the worker processes.
+
+        """
+        monkeypatch.setattr(dovutil, 'get_remote_url',
+                            lambda url, session=None,
+                            limit_concurrency=False: b'')
+
+        with pytest.warns(XmlParseWarning):
+            df = Boring.to_df_array(features)
+
+        assert len(df) == len(features)
+
+
+@pytest.fixture
+def parsed_cache(monkeypatch, tmp_path):
+    """Enable the parsed data cache in a temporary directory.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+
+    Returns
+    -------
+    pydov.util.caching.ParsedDataCache
+        The parsed data cache.
+
+    """
+    cache = ParsedDataCache(cachedir=str(tmp_path / 'pydov_parsed'))
+    monkeypatch.setattr(pydov, 'parsed_cache', cache)
+    return cache
+
+
+class TestParsedCache:
+    """Class grouping tests for the parsed data cache with the download
+    engines."""
+
+    @pytest.mark.parametrize('processes', [None, 2])
+    @pytest.mark.parametrize('engine', ['threads', 'async'])
+    def test_parsed_cache(self, monkeypatch, mp_remote_url, no_cache,
+                          parsed_cache, engine, processes):
+        """Test whether the XML documents are not requested once their
+        parsed values are cached, and whether the rows and columns remain
+        the same.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        parsed_cache : pytest.fixture
+            Fixture enabling the parsed data cache.
+        engine : str
+            Download engine to use.
+        processes : int or None
+            Number of worker processes to parse the XML documents in.
+
+        """
+        monkeypatch.setattr(pydov, 'engine', engine)
+        with monkeypatch.context() as m:
+            m.setattr(pydov, 'parsed_cache', None)
+            df_ref = Boring.to_df_array(get_features())
+            columns_ref = Boring.to_df_columns(get_features())
+        del mp_remote_url[:]
+
+        monkeypatch.setattr(pydov, 'parse_processes', processes)
+        try:
+            df_cold = Boring.to_df_array(get_features())
+            assert len(mp_remote_url) == 20
+
+            queries = []
+            get = ParsedDataCache.get
+
+            def _get(self, fingerprint, key):
+                queries.append(key)
+                return get(self, fingerprint, key)
+
+            monkeypatch.setattr(ParsedDataCache, 'get', _get)
+
+            events = []
+
+            class Hook(AbstractReadHook):
+                def xml_cache_hit(self, pkey_object):
+                    events.append('xml_cache_hit')
+
+                def parsed_cache_hit(self, pkey_object):
+                    events.append('parsed_cache_hit')
+
+            monkeypatch.setattr(pydov, 'hooks', Hooks((Hook(),)))
+
+            df_warm = Boring.to_df_array(get_features())
+            assert len(queries) == 20
+            assert events == ['parsed_cache_hit'] * 20
+
+            columns_warm = Boring.to_df_columns(get_features())
+            assert len(mp_remote_url) == 20
+        finally:
+            parsing.shutdown()
+
+        assert [str(r) for r in df_cold] == [str(r) for r in df_ref]
+        assert [str(r) for r in df_warm] == [str(r) for r in df_ref]
+        for name in columns_ref:
+            assert str(list(columns_warm[name])) == \
+                str(list(columns_ref[name]))
+
+    @pytest.mark.parametrize('processes', [None, 2])
+    def test_parsed_cache_error(self, monkeypatch, mp_remote_url, no_cache,
+                                parsed_cache, processes):
+        """Test whether the XML documents are parsed, emitting a
+        ParsedCacheWarning, when the parsed data cache cannot be used.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        mp_remote_url : pytest.fixture
+            Monkeypatch of the remote requests.
+        no_cache : pytest.fixture
+            Fixture disabling the cache.
+        parsed_cache : pytest.fixture
+            Fixture enabling the parsed data cache.
+        processes : int or None
+            Number of worker processes to parse the XML documents in.
+
+        """
+        with monkeypatch.context() as m:
+            m.setattr(pydov, 'parsed_cache', None)
+            df_ref = Boring.to_df_array(get_features())
+
+        # a directory in place of the database cannot be opened
+        os.makedirs(parsed_cache.database)
+
+        monkeypatch.setattr(pydov, 'parse_processes', processes)
+        try:
+            with pytest.warns(ParsedCacheWarning):
+                df = Boring.to_df_array(get_features())
+        finally:
+            parsing.shutdown()
+
+        assert [str(r) for r in df] == [str(r) for r in df_ref]
@@ -50,6 +50,10 @@ class TestWfsTypeFactoryOpdracht(AbstractTestTypes):
         """WfsType have no fixed fields."""
         assert True
 
+    def test_from_wfs_columns(self):
+        """WfsType have no fixed fields."""
+        assert True
+
     def test_get_field_names_wrongreturnfields(self):
         """WfsType have no fixed fields."""
         assert True
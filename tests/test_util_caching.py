@@ -1,12 +1,33 @@
 """Module grouping tests for the pydov.util.caching module."""
 
+import asyncio
+import datetime
 import gzip
 import os
+import sqlite3
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pytest
-
+from requests.exceptions import ConnectionError
+
+import pydov.util.caching
+from pydov.search.boring import BoringSearch
+from pydov.types.boring import Boring
+from pydov.util import owsutil
+from pydov.util.caching import (GzipTextFileCache, MetadataCache,
+                                ParsedDataCache, SqliteCache, TieredCache,
+                                WfsResponseCache)
 from pydov.util.dovutil import build_dov_url
+from pydov.util.errors import (ParsedCacheWarning, RemoteFetchError,
+                               WfsStaleWarning, XmlStaleWarning)
+from pydov.util.hooks import (AbstractInjectHook, AbstractReadHook, Hooks,
+                              SimpleStatusHook)
+from pydov.util.owsutil import (get_wfs_getfeature_request_hash,
+                                wfs_build_getfeature_request)
 
 
 class TestPlainTextFileCacheCache(object):
@@ -571,3 +592,1147 @@ class TestGzipTextFileCacheCache(object):
         cached_data = gziptext_cache.get(
             build_dov_url('data/boring/2004-103984.xml'))
         assert isinstance(cached_data, bytes)
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path, monkeypatch):
+    """Fixture for a temporary SQLite cache with a maximum age of 1 hour.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Yields
+    ------
+    pydov.util.caching.SqliteCache
+        SqliteCache using a temporary directory.
+
+    """
+    cache = SqliteCache(cachedir=str(tmp_path / 'pydov_sqlite'),
+                        max_age=datetime.timedelta(hours=1))
+    monkeypatch.setattr(pydov, 'cache', cache)
+    yield cache
+    cache.remove()
+
+
+@pytest.fixture
+def mp_remote_xml_count(monkeypatch):
+    """Monkeypatch the call to get the remote Boring XML data, counting the
+    requests.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list of str
+        List of requested URLs.
+
+    """
+    with open('tests/data/types/boring/boring.xml', 'r',
+              encoding='utf-8') as f:
+        data = f.read().encode('utf-8')
+
+    requested = []
+
+    def _get_remote_data(self, url, session=None):
+        requested.append(url)
+        return data
+
+    monkeypatch.setattr(pydov.util.caching.AbstractFileCache,
+                        '_get_remote', _get_remote_data)
+    return requested
+
+
+def age_records(cache, seconds):
+    """Make all records in the SQLite cache older.
+
+    Parameters
+    ----------
+    cache : pydov.util.caching.SqliteCache
+        Cache to update.
+    seconds : float
+        Number of seconds to subtract from the download time.
+
+    """
+    cache._get_connection().execute(
+        'UPDATE xml_cache SET fetched_at = fetched_at - ?', (seconds,))
+
+
+class TestSqliteCache(object):
+    """Class grouping tests for the pydov.util.caching.SqliteCache class."""
+
+    url = build_dov_url('data/boring/2004-103984.xml')
+
+    def test_wal(self, sqlite_cache):
+        """Test whether the database uses write-ahead logging.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+
+        """
+        mode, = sqlite_cache._get_connection().execute(
+            'PRAGMA journal_mode').fetchone()
+        assert mode == 'wal'
+
+    def test_get_async(self, sqlite_cache, mp_remote_xml_count,
+                       monkeypatch):
+        """Test whether the async method loads and saves documents outside
+        the event loop, and only performs the remote request on the event
+        loop.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        threads = {}
+
+        def record(name, fn):
+            def wrapper(*args, **kwargs):
+                threads.setdefault(name, set()).add(threading.get_ident())
+                return fn(*args, **kwargs)
+            return wrapper
+
+        for name in ('_get_cached', '_load', '_save'):
+            monkeypatch.setattr(sqlite_cache, name,
+                                record(name, getattr(sqlite_cache, name)))
+
+        async def _get_remote_async(url, session):
+            threads.setdefault('remote', set()).add(threading.get_ident())
+            return sqlite_cache._get_remote(url, session)
+
+        monkeypatch.setattr(sqlite_cache, '_get_remote_async',
+                            _get_remote_async)
+
+        async def get_twice():
+            loop_thread = threading.get_ident()
+            data = [await sqlite_cache.get_async(self.url, None)
+                    for i in range(2)]
+            return loop_thread, data
+
+        loop_thread, data = asyncio.run(get_twice())
+
+        assert data[0] == data[1]
+        assert len(mp_remote_xml_count) == 1
+        assert threads['remote'] == {loop_thread}
+        for name in ('_get_cached', '_load', '_save'):
+            assert loop_thread not in threads[name]
+
+    def test_get_save(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether the document is saved compressed, with its datatype,
+        key, download time and size.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        before = time.time()
+        data = sqlite_cache.get(self.url)
+
+        assert isinstance(data, bytes)
+        assert os.path.exists(sqlite_cache.database)
+
+        rows = sqlite_cache._get_connection().execute(
+            'SELECT datatype, key, fetched_at, size, content '
+            'FROM xml_cache').fetchall()
+        assert len(rows) == 1
+
+        datatype, key, fetched_at, size, content = rows[0]
+        assert (datatype, key) == ('boring', '2004-103984')
+        assert before <= fetched_at <= time.time()
+        assert size == len(data)
+        assert len(content) < size
+        assert zlib.decompress(content) == data
+
+    def test_get_reuse(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether a valid cached document is reused.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        ref_data = sqlite_cache.get(self.url)
+        cached_data = sqlite_cache.get(self.url)
+
+        assert len(mp_remote_xml_count) == 1
+        assert isinstance(cached_data, bytes)
+        assert cached_data == ref_data
+
+    def test_get_invalid(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether a cached document older than the maximum age is
+        downloaded again.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        sqlite_cache.get(self.url)
+        age_records(sqlite_cache, 7200)
+
+        assert not sqlite_cache._is_valid('boring', '2004-103984')
+        assert sqlite_cache._is_stale('boring', '2004-103984')
+
+        sqlite_cache.get(self.url)
+        assert len(mp_remote_xml_count) == 2
+
+        assert sqlite_cache._is_valid('boring', '2004-103984')
+        assert not sqlite_cache._is_stale('boring', '2004-103984')
+
+    def test_get_stale(self, sqlite_cache, monkeypatch):
+        """Test whether a stale cached document is returned when the remote
+        request fails.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        with open('tests/data/types/boring/boring.xml', 'rb') as f:
+            ref_data = f.read()
+        sqlite_cache._save('boring', '2004-103984', ref_data)
+        age_records(sqlite_cache, 7200)
+
+        def _get_remote_data(self, url, session=None):
+            raise RemoteFetchError
+
+        monkeypatch.setattr(pydov.util.caching.AbstractFileCache,
+                            '_get_remote', _get_remote_data)
+
+        with pytest.warns(XmlStaleWarning):
+            assert sqlite_cache.get(self.url) == ref_data
+
+        sqlite_cache.stale_on_error = False
+        with pytest.raises(RemoteFetchError):
+            sqlite_cache.get(self.url)
+
+    def test_clean(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether the clean method only removes the records older than
+        the maximum age.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        sqlite_cache.get(self.url)
+        age_records(sqlite_cache, 7200)
+        sqlite_cache.get(build_dov_url('data/boring/1930-120730.xml'))
+
+        sqlite_cache.clean()
+
+        rows = sqlite_cache._get_connection().execute(
+            'SELECT key FROM xml_cache').fetchall()
+        assert rows == [('1930-120730',)]
+
+    def test_remove(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether the remove method removes the database and whether
+        the cache can be used again afterwards.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        sqlite_cache.get(self.url)
+        sqlite_cache.remove()
+
+        assert not os.path.exists(sqlite_cache.cachedir)
+
+        sqlite_cache.get(self.url)
+        assert len(mp_remote_xml_count) == 2
+        assert sqlite_cache._is_valid('boring', '2004-103984')
+
+    def test_threads(self, sqlite_cache, mp_remote_xml_count):
+        """Test whether the cache can be used from multiple threads
+        simultaneously.
+
+        Parameters
+        ----------
+        sqlite_cache : pytest.fixture
+            SqliteCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        urls = [build_dov_url('data/boring/{}.xml'.format(i))
+                for i in range(20)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            data = list(executor.map(sqlite_cache.get, urls + urls))
+
+        assert len(set(data)) == 1
+        assert len(sqlite_cache._database._connections) > 1
+
+        count, = sqlite_cache._get_connection().execute(
+            'SELECT count(*) FROM xml_cache').fetchone()
+        assert count == 20
+
+
+@pytest.fixture
+def tiered_cache(tmp_path, monkeypatch):
+    """Fixture for a temporary tiered cache wrapping a GzipTextFileCache.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Yields
+    ------
+    pydov.util.caching.TieredCache
+        TieredCache wrapping a GzipTextFileCache using a temporary
+        directory.
+
+    """
+    cache = TieredCache(GzipTextFileCache(cachedir=str(tmp_path / 'pydov')))
+    monkeypatch.setattr(pydov, 'cache', cache)
+    yield cache
+    cache.remove()
+
+
+class TestTieredCache(object):
+    """Class grouping tests for the pydov.util.caching.TieredCache class."""
+
+    url = build_dov_url('data/boring/2004-103984.xml')
+
+    def test_get_reuse(self, tiered_cache, mp_remote_xml_count, monkeypatch):
+        """Test whether a document is returned from memory without loading
+        it from the wrapped cache.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        assert tiered_cache
+
+        ref_data = tiered_cache.get(self.url)
+        assert (tiered_cache.hits, tiered_cache.misses) == (0, 1)
+        assert tiered_cache.size == len(ref_data)
+
+        def _load(*args):
+            raise AssertionError('The wrapped cache should not be used.')
+
+        monkeypatch.setattr(tiered_cache.cache, '_load', _load)
+
+        cached_data = tiered_cache.get(self.url)
+        assert cached_data == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (1, 1)
+        assert len(mp_remote_xml_count) == 1
+
+    def test_get_async(self, tiered_cache, mp_remote_xml_count):
+        """Test whether the async method uses the same documents in memory.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        async def _get_remote_async(self, url, session):
+            return self._get_remote(url, session)
+
+        with pytest.MonkeyPatch.context() as m:
+            m.setattr(pydov.util.caching.AbstractFileCache,
+                      '_get_remote_async', _get_remote_async)
+            ref_data = asyncio.run(tiered_cache.get_async(self.url, None))
+
+        assert asyncio.run(tiered_cache.get_async(self.url, None)) == \
+            ref_data
+        assert tiered_cache.get(self.url) == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (2, 1)
+        assert len(mp_remote_xml_count) == 1
+
+    def test_max_size(self, tiered_cache, mp_remote_xml_count):
+        """Test whether the least recently used documents are removed from
+        memory when the maximum size is exceeded.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        urls = [build_dov_url('data/boring/{}.xml'.format(i))
+                for i in range(3)]
+        size = len(tiered_cache.get(urls[0]))
+        tiered_cache.max_size = 2 * size
+
+        tiered_cache.get(urls[1])
+        tiered_cache.get(urls[0])
+        tiered_cache.get(urls[2])
+        assert tiered_cache.size == 2 * size
+
+        assert (tiered_cache.hits, tiered_cache.misses) == (1, 3)
+
+        # urls[1] was removed from memory, urls[0] and urls[2] were not
+        for url in (urls[0], urls[2], urls[1]):
+            tiered_cache.get(url)
+        assert (tiered_cache.hits, tiered_cache.misses) == (3, 4)
+
+        tiered_cache.max_size = size - 1
+        tiered_cache.clear()
+        tiered_cache.get(urls[0])
+        assert tiered_cache.size == 0
+
+    def test_threads(self, tiered_cache, mp_remote_xml_count):
+        """Test whether the cache can be used from multiple threads
+        simultaneously.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        urls = [build_dov_url('data/boring/{}.xml'.format(i))
+                for i in range(20)]
+        tiered_cache.max_size = 10 * len(tiered_cache.get(urls[0]))
+        tiered_cache.clear()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            data = list(executor.map(tiered_cache.get, urls * 5))
+
+        assert len(set(data)) == 1
+        assert tiered_cache.hits + tiered_cache.misses == 100
+        assert tiered_cache.size <= tiered_cache.max_size
+
+    def test_stale_on_error(self, tiered_cache):
+        """Test whether the stale_on_error attribute is the one of the
+        wrapped cache.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+
+        """
+        assert tiered_cache.stale_on_error
+        tiered_cache.stale_on_error = False
+        assert not tiered_cache.cache.stale_on_error
+
+    def test_max_age(self, tiered_cache, mp_remote_xml_count, monkeypatch):
+        """Test whether documents kept in memory longer than the maximum
+        age of the wrapped cache are requested from the wrapped cache again.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        ref_data = tiered_cache.get(self.url)
+        assert tiered_cache.get(self.url) == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (1, 1)
+
+        now = time.time()
+        monkeypatch.setattr(pydov.util.caching.time, 'time',
+                            lambda: now + 3 * 7 * 24 * 3600)
+
+        assert tiered_cache.get(self.url) == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (1, 2)
+        assert len(mp_remote_xml_count) == 1
+
+        assert tiered_cache.get(self.url) == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (2, 2)
+
+    def test_get_stale(self, tiered_cache, monkeypatch):
+        """Test whether stale documents returned by the wrapped cache are
+        not kept in memory.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        with open('tests/data/types/boring/boring.xml', 'rb') as f:
+            ref_data = f.read()
+        tiered_cache.cache._save('boring', '2004-103984', ref_data)
+        tiered_cache.cache.max_age = datetime.timedelta(seconds=0)
+
+        def _get_remote_data(self, url, session=None):
+            raise RemoteFetchError
+
+        monkeypatch.setattr(pydov.util.caching.AbstractFileCache,
+                            '_get_remote', _get_remote_data)
+
+        with pytest.warns(XmlStaleWarning):
+            assert tiered_cache.get(self.url) == ref_data
+        assert tiered_cache.size == 0
+
+        with pytest.warns(XmlStaleWarning):
+            assert tiered_cache.get(self.url) == ref_data
+        assert (tiered_cache.hits, tiered_cache.misses) == (0, 2)
+
+    def test_remove(self, tiered_cache, mp_remote_xml_count):
+        """Test whether the remove method removes the documents from memory
+        and the wrapped cache.
+
+        Parameters
+        ----------
+        tiered_cache : pytest.fixture
+            TieredCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        tiered_cache.get(self.url)
+        tiered_cache.remove()
+
+        assert tiered_cache.size == 0
+        assert not os.path.exists(tiered_cache.cache.cachedir)
+
+        tiered_cache.get(self.url)
+        assert len(mp_remote_xml_count) == 2
+
+
+@pytest.fixture
+def parsed_cache(tmp_path):
+    """Fixture for a temporary parsed data cache with a maximum age of
+    1 hour.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+
+    Yields
+    ------
+    pydov.util.caching.ParsedDataCache
+        ParsedDataCache using a temporary directory.
+
+    """
+    cache = ParsedDataCache(cachedir=str(tmp_path / 'pydov_parsed'),
+                            max_age=datetime.timedelta(hours=1))
+    yield cache
+    cache.remove()
+
+
+class TestParsedDataCache(object):
+    """Class grouping tests for the pydov.util.caching.ParsedDataCache
+    class."""
+
+    values = (('2004-103984', 25.0, datetime.date(2004, 6, 9), np.nan),
+              {'BoorMethode': (1, [(0.0,), (25.0,), ('spoelboring',)])})
+
+    def test_save_get(self, parsed_cache):
+        """Test whether saved values are returned, per fingerprint.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+
+        """
+        assert parsed_cache.get('abc', 'key') is None
+
+        parsed_cache.save('abc', 'key', self.values)
+
+        assert str(parsed_cache.get('abc', 'key')) == str(self.values)
+        assert parsed_cache.get('def', 'key') is None
+
+    def test_version(self, parsed_cache, monkeypatch):
+        """Test whether values saved by another version of pydov are not
+        used, and removed when cleaning the cache.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        parsed_cache.save('abc', 'key', self.values)
+
+        with monkeypatch.context() as m:
+            m.setattr(pydov, '__version__', '0.0.1')
+            assert parsed_cache.get('abc', 'key') is None
+            parsed_cache.clean()
+
+        assert parsed_cache.get('abc', 'key') is None
+
+    def test_max_age(self, parsed_cache):
+        """Test whether values older than the maximum age are not used,
+        and removed when cleaning the cache.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+
+        """
+        parsed_cache.save('abc', 'old', self.values)
+        parsed_cache._database.connect().execute(
+            'UPDATE parsed_cache SET parsed_at = parsed_at - 7200')
+        parsed_cache.save('abc', 'new', self.values)
+
+        assert parsed_cache.get('abc', 'old') is None
+
+        parsed_cache.clean()
+        rows = parsed_cache._database.connect().execute(
+            'SELECT key FROM parsed_cache').fetchall()
+        assert rows == [('new',)]
+
+    def test_remove(self, parsed_cache):
+        """Test whether the remove method removes the database and whether
+        the cache can be used again afterwards.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+
+        """
+        parsed_cache.save('abc', 'key', self.values)
+        parsed_cache.remove()
+
+        assert not os.path.exists(parsed_cache.cachedir)
+        assert parsed_cache.get('abc', 'key') is None
+
+    def test_unpicklable(self, parsed_cache):
+        """Test whether a ParsedCacheWarning is emitted when the values
+        cannot be saved since they cannot be pickled.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+
+        """
+        with pytest.warns(ParsedCacheWarning, match='write'):
+            parsed_cache.save('abc', 'key', (threading.Lock(),))
+
+        assert parsed_cache.get('abc', 'key') is None
+
+    def test_database_error(self, parsed_cache, monkeypatch):
+        """Test whether a ParsedCacheWarning is emitted, instead of an error
+        being raised, when the database cannot be used.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        parsed_cache.save('abc', 'key', self.values)
+
+        def connect():
+            raise sqlite3.OperationalError('database is locked')
+
+        monkeypatch.setattr(parsed_cache._database, 'connect', connect)
+
+        with pytest.warns(ParsedCacheWarning, match='database is locked'):
+            assert parsed_cache.get('abc', 'key') is None
+
+        with pytest.warns(ParsedCacheWarning, match='database is locked'):
+            parsed_cache.save('abc', 'key', self.values)
+
+    def test_xml_hooks(self, parsed_cache, monkeypatch):
+        """Test whether the parsed data cache is not used when a registered
+        hook needs the XML documents.
+
+        Parameters
+        ----------
+        parsed_cache : pytest.fixture
+            ParsedDataCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        class XmlHook(AbstractReadHook):
+            def xml_received(self, pkey_object, xml):
+                pass
+
+        monkeypatch.setattr(pydov, 'parsed_cache', parsed_cache)
+
+        monkeypatch.setattr(pydov, 'hooks', Hooks((SimpleStatusHook(),)))
+        assert not pydov.hooks.has_xml_hooks()
+        assert Boring._get_parsed_cache() is parsed_cache
+
+        monkeypatch.setattr(pydov, 'hooks', Hooks((XmlHook(),)))
+        assert pydov.hooks.has_xml_hooks()
+        assert Boring._get_parsed_cache() is None
+
+        monkeypatch.setattr(pydov, 'hooks', Hooks((AbstractInjectHook(),)))
+        assert pydov.hooks.has_xml_hooks()
+
+
+@pytest.fixture
+def wfs_cache(tmp_path):
+    """Fixture for a temporary WFS response cache with a maximum age of
+    1 second.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+
+    """
+    return WfsResponseCache(cachedir=str(tmp_path / 'pydov_wfs'),
+                            max_age=datetime.timedelta(seconds=1))
+
+
+@pytest.fixture
+def mp_wfs_get_feature(monkeypatch):
+    """Monkeypatch the call to get the remote WFS GetFeature response.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list of etree.Element
+        List of executed GetFeature requests.
+
+    """
+    with open('tests/data/types/boring/wfsgetfeature.xml', 'rb') as f:
+        data = f.read()
+
+    requests = []
+
+    def _wfs_get_feature(baseurl, get_feature_request, session=None):
+        requests.append(get_feature_request)
+        return data
+
+    monkeypatch.setattr(pydov.util.caching, 'wfs_get_feature',
+                        _wfs_get_feature)
+    return requests
+
+
+def get_request(typename='dov-pub:Boringen'):
+    """Build a WFS GetFeature request.
+
+    Parameters
+    ----------
+    typename : str
+        Typename of the layer to query.
+
+    Returns
+    -------
+    etree.Element
+        XML element representing the WFS GetFeature request.
+
+    """
+    return wfs_build_getfeature_request(typename)
+
+
+class TestWfsResponseCache(object):
+    """Class grouping tests for the pydov.util.caching.WfsResponseCache
+    class."""
+
+    def test_get_reuse(self, wfs_cache, mp_wfs_get_feature):
+        """Test whether a cached response is reused for the same request.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+        mp_wfs_get_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS service.
+
+        """
+        ref_data = wfs_cache.get('https://wfs', get_request())
+        cached_data = wfs_cache.get('https://wfs', get_request())
+
+        assert len(mp_wfs_get_feature) == 1
+        assert isinstance(cached_data, bytes)
+        assert cached_data == ref_data
+
+        wfs_cache.get('https://wfs', get_request('dov-pub:Grondwaterfilters'))
+        wfs_cache.get('https://other', get_request())
+        assert len(mp_wfs_get_feature) == 3
+
+    def test_get_invalid(self, wfs_cache, mp_wfs_get_feature):
+        """Test whether a cached response is not reused after the maximum
+        age.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+        mp_wfs_get_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS service.
+
+        """
+        wfs_cache.get('https://wfs', get_request())
+        time.sleep(1.5)
+        wfs_cache.get('https://wfs', get_request())
+
+        assert len(mp_wfs_get_feature) == 2
+
+        wfs_cache.clean()
+        assert len(os.listdir(wfs_cache.cachedir)) == 1
+
+        time.sleep(1.5)
+        wfs_cache.clean()
+        assert len(os.listdir(wfs_cache.cachedir)) == 0
+
+    def test_key(self, wfs_cache):
+        """Test whether the key contains the hash used by the
+        RepeatableLogRecorder.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+
+        """
+        request = get_request()
+        assert wfs_cache._get_key('https://wfs', request).endswith(
+            get_wfs_getfeature_request_hash(request))
+
+    def test_no_save_exception(self, wfs_cache, monkeypatch):
+        """Test whether service exceptions are not saved in the cache.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        monkeypatch.setattr(
+            pydov.util.caching, 'wfs_get_feature',
+            lambda *args: b'<ows:ExceptionReport></ows:ExceptionReport>')
+
+        wfs_cache.get('https://wfs', get_request())
+        assert len(os.listdir(wfs_cache.cachedir)) == 0
+
+    @pytest.mark.parametrize('stale_on_error', [True, False])
+    def test_stale_on_error(self, wfs_cache, mp_wfs_get_feature, monkeypatch,
+                            stale_on_error):
+        """Test whether a stale response is returned if the request fails.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+        mp_wfs_get_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS service.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        stale_on_error : bool
+            Whether to return stale responses.
+
+        """
+        ref_data = wfs_cache.get('https://wfs', get_request())
+        time.sleep(1.5)
+
+        def _wfs_get_feature(*args):
+            raise ConnectionError()
+
+        monkeypatch.setattr(pydov.util.caching, 'wfs_get_feature',
+                            _wfs_get_feature)
+        wfs_cache.stale_on_error = stale_on_error
+
+        if stale_on_error:
+            with pytest.warns(WfsStaleWarning):
+                data = wfs_cache.get('https://wfs', get_request())
+            assert data == ref_data
+        else:
+            with pytest.raises(ConnectionError):
+                wfs_cache.get('https://wfs', get_request())
+
+    def test_max_size(self, wfs_cache, mp_wfs_get_feature):
+        """Test whether the oldest responses are removed when the cache
+        grows larger than its maximum size.
+
+        Parameters
+        ----------
+        wfs_cache : pytest.fixture
+            WfsResponseCache using a temporary directory.
+        mp_wfs_get_feature : pytest.fixture
+            Monkeypatch the call to the remote WFS service.
+
+        """
+        wfs_cache.get('https://wfs', get_request())
+        size = os.path.getsize(os.path.join(
+            wfs_cache.cachedir, os.listdir(wfs_cache.cachedir)[0]))
+        wfs_cache.max_size = int(size * 2.5)
+
+        for typename in ('dov-pub:Grondwaterfilters', 'dov-pub:Sonderingen',
+                         'dov-pub:Interpretaties'):
+            time.sleep(0.05)
+            wfs_cache.get('https://wfs', get_request(typename))
+
+        assert len(os.listdir(wfs_cache.cachedir)) == 2
+
+        wfs_cache.get('https://wfs', get_request())
+        assert len(mp_wfs_get_feature) == 5
+
+        wfs_cache.remove()
+        assert not os.path.exists(wfs_cache.cachedir)
+
+
+@pytest.fixture
+def metadata_cache(tmp_path, monkeypatch):
+    """Fixture for a temporary metadata cache with a maximum age of 1 second,
+    enabled as the pydov metadata cache.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    """
+    cache = MetadataCache(cachedir=str(tmp_path / 'pydov_metadata'),
+                          max_age=datetime.timedelta(seconds=1))
+    monkeypatch.setattr(pydov, 'metadata_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def mp_metadata_remote(metadata_cache, monkeypatch):
+    """Monkeypatch the call to request remote metadata documents.
+
+    Parameters
+    ----------
+    metadata_cache : pytest.fixture
+        MetadataCache using a temporary directory.
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list of str
+        List of requested URLs.
+
+    """
+    with open('tests/data/types/boring/fc_featurecatalogue.xml', 'rb') as f:
+        data = f.read()
+
+    requested = []
+
+    def _get_remote(url):
+        requested.append(url)
+        return data, 'invalid' not in url
+
+    monkeypatch.setattr(metadata_cache, '_get_remote', _get_remote)
+    return requested
+
+
+class TestMetadataCache(object):
+    """Class grouping tests for the pydov.util.caching.MetadataCache
+    class."""
+
+    def test_get_reuse(self, metadata_cache, mp_metadata_remote):
+        """Test whether a cached document is reused until the maximum age.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+        mp_metadata_remote : pytest.fixture
+            Monkeypatch the call to request remote metadata documents.
+
+        """
+        ref_data = owsutil.get_url('https://metadata')
+        cached_data = owsutil.get_url('https://metadata')
+
+        assert len(mp_metadata_remote) == 1
+        assert isinstance(cached_data, bytes)
+        assert cached_data == ref_data
+
+        time.sleep(1.5)
+        owsutil.get_url('https://metadata')
+        assert len(mp_metadata_remote) == 2
+
+    def test_get_invalid_response(self, metadata_cache, mp_metadata_remote):
+        """Test whether failed requests are not saved in the cache.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+        mp_metadata_remote : pytest.fixture
+            Monkeypatch the call to request remote metadata documents.
+
+        """
+        owsutil.get_url('https://invalid')
+        owsutil.get_url('https://invalid')
+        assert len(mp_metadata_remote) == 2
+
+    def test_version(self, metadata_cache, mp_metadata_remote, monkeypatch):
+        """Test whether documents saved by another pydov version are not
+        reused and removed when cleaning the cache.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+        mp_metadata_remote : pytest.fixture
+            Monkeypatch the call to request remote metadata documents.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        owsutil.get_url('https://metadata')
+        old_versiondir = metadata_cache._get_versiondir()
+
+        monkeypatch.setattr(pydov, '__version__', '0.0.0')
+        owsutil.get_url('https://metadata')
+        assert len(mp_metadata_remote) == 2
+
+        metadata_cache.clean()
+        assert not os.path.exists(old_versiondir)
+        assert len(os.listdir(metadata_cache._get_versiondir())) == 1
+
+        metadata_cache.remove()
+        assert not os.path.exists(metadata_cache.cachedir)
+
+    def test_get_shared(self, metadata_cache):
+        """Test whether parsed metadata is built only once per key.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+
+        """
+        built = []
+
+        def build():
+            built.append(1)
+            return len(built)
+
+        assert metadata_cache.get_shared(('a', 'layer'), build) == 1
+        assert metadata_cache.get_shared(('a', 'layer'), build) == 1
+        assert metadata_cache.get_shared(('b', 'layer'), build) == 2
+
+        time.sleep(1.5)
+        assert metadata_cache.get_shared(('a', 'layer'), build) == 3
+
+    def test_search_shared(self, metadata_cache, monkeypatch,
+                           wfs_capabilities):
+        """Test whether the WFS capabilities are shared between search
+        instances.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+        wfs_capabilities : pytest.fixture
+            Fixture providing WFS capabilities response.
+
+        """
+        requested = []
+
+        def _get_wfs_capabilities(url):
+            requested.append(url)
+            return wfs_capabilities
+
+        monkeypatch.setattr(owsutil, 'get_wfs_capabilities',
+                            _get_wfs_capabilities)
+
+        first = BoringSearch()
+        first._init_wfs()
+        second = BoringSearch()
+        second._init_wfs()
+
+        assert len(requested) == 1
+        assert first._wfs is second._wfs
+        assert second._wfs_max_features == first._wfs_max_features
+
+    def test_search_fields(self, metadata_cache, monkeypatch):
+        """Test whether all metadata documents needed for the fields of a
+        search class are requested through the metadata cache.
+
+        Parameters
+        ----------
+        metadata_cache : pytest.fixture
+            MetadataCache using a temporary directory.
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        documents = {
+            'GetCapabilities': 'tests/data/util/owsutil/wfscapabilities.xml',
+            'DescribeFeatureType':
+                'tests/data/types/boring/wfsdescribefeaturetype.xml',
+            '2005/gmd': 'tests/data/types/boring/md_metadata.xml',
+            '2005/gfc': 'tests/data/types/boring/fc_featurecatalogue.xml'
+        }
+        requested = []
+
+        def _get_remote(url):
+            requested.append(url)
+            for key, path in documents.items():
+                if key in url:
+                    with open(path, 'rb') as f:
+                        return f.read(), True
+
+        monkeypatch.setattr(metadata_cache, '_get_remote', _get_remote)
+
+        fields = BoringSearch().get_fields()
+        assert fields['diepte_boring_tot']['type'] == 'float'
+        assert fields['diepte_boring_tot']['definition'].startswith(
+            'Maximumdiepte')
+        assert len(requested) == 4
+
+        metadata_cache._shared.clear()
+        BoringSearch().get_fields()
+        assert len(requested) == 4
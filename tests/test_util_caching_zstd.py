@@ -0,0 +1,267 @@
+"""Module grouping tests for the pydov.util.caching.ZstdTextFileCache
+class."""
+
+import datetime
+import os
+
+import pytest
+import zstandard
+
+import pydov.util.caching
+from pydov.util.caching import GzipTextFileCache, ZstdTextFileCache
+from pydov.util.dovutil import build_dov_url
+
+location_dov_xml = 'tests/data/types/boring/boring.xml'
+
+
+def get_document(key):
+    """Get a Boring XML document with the given key.
+
+    Parameters
+    ----------
+    key : str
+        Key of the document.
+
+    Returns
+    -------
+    bytes
+        The XML document.
+
+    """
+    with open(location_dov_xml, 'rb') as f:
+        return f.read().replace(b'2004-103984', key.encode('utf-8'))
+
+
+@pytest.fixture
+def zstd_cache(tmp_path):
+    """Fixture for a temporary Zstandard cache with a maximum age of 1 hour.
+
+    Parameters
+    ----------
+    tmp_path : pytest.fixture
+        Fixture providing a temporary directory.
+
+    Yields
+    ------
+    pydov.util.caching.ZstdTextFileCache
+        ZstdTextFileCache using a temporary directory.
+
+    """
+    cache = ZstdTextFileCache(cachedir=str(tmp_path / 'pydov'),
+                              max_age=datetime.timedelta(hours=1))
+    yield cache
+    cache.remove()
+
+
+@pytest.fixture
+def mp_remote_xml_count(monkeypatch):
+    """Monkeypatch the call to get the remote Boring XML data, counting the
+    requests.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.fixture
+        PyTest monkeypatch fixture.
+
+    Returns
+    -------
+    list of str
+        List of requested URLs.
+
+    """
+    requested = []
+
+    def _get_remote_data(self, url, session=None):
+        requested.append(url)
+        return get_document('2004-103984')
+
+    monkeypatch.setattr(pydov.util.caching.AbstractFileCache,
+                        '_get_remote', _get_remote_data)
+    return requested
+
+
+def save_documents(cache, count=20):
+    """Save a number of Boring XML documents in the cache.
+
+    Parameters
+    ----------
+    cache : pydov.util.caching.ZstdTextFileCache
+        Cache to save the documents in.
+    count : int, optional
+        Number of documents to save. Defaults to 20.
+
+    """
+    for i in range(count):
+        key = '2004-{:06d}'.format(i)
+        cache._save('boring', key, get_document(key))
+
+
+class TestZstdTextFileCache(object):
+    """Class grouping tests for the pydov.util.caching.ZstdTextFileCache
+    class."""
+
+    url = build_dov_url('data/boring/2004-103984.xml')
+
+    def test_get_save(self, zstd_cache, mp_remote_xml_count):
+        """Test whether the document is saved Zstandard compressed and
+        reused.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        cached_file = os.path.join(
+            zstd_cache.cachedir, 'boring', '2004-103984.xml.zst')
+
+        ref_data = zstd_cache.get(self.url)
+        assert os.path.exists(cached_file)
+
+        with open(cached_file, 'rb') as f:
+            assert zstandard.ZstdDecompressor().decompress(
+                f.read()) == ref_data
+
+        cached_data = zstd_cache.get(self.url)
+        assert isinstance(cached_data, bytes)
+        assert cached_data == ref_data
+        assert len(mp_remote_xml_count) == 1
+
+    def test_read_gzip(self, zstd_cache, mp_remote_xml_count):
+        """Test whether documents saved by a GzipTextFileCache are reused,
+        and replaced when they are downloaded again.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+        mp_remote_xml_count : pytest.fixture
+            Monkeypatch the call to the remote DOV service.
+
+        """
+        gzip_cache = GzipTextFileCache(cachedir=zstd_cache.cachedir)
+        gzip_cache.get(self.url)
+        gzip_file = os.path.join(
+            zstd_cache.cachedir, 'boring', '2004-103984.xml.gz')
+        assert os.path.exists(gzip_file)
+
+        assert zstd_cache.get(self.url) == get_document('2004-103984')
+        assert len(mp_remote_xml_count) == 1
+
+        zstd_cache.max_age = datetime.timedelta(seconds=0)
+        zstd_cache.get(self.url)
+
+        assert len(mp_remote_xml_count) == 2
+        assert not os.path.exists(gzip_file)
+        assert os.path.exists(os.path.join(
+            zstd_cache.cachedir, 'boring', '2004-103984.xml.zst'))
+
+    def test_train_dictionaries(self, zstd_cache):
+        """Test whether the trained dictionary is used to compress new
+        documents and whether older documents remain readable.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+
+        """
+        save_documents(zstd_cache)
+        cached_file = os.path.join(
+            zstd_cache.cachedir, 'boring', '2004-000000.xml.zst')
+        size = os.path.getsize(cached_file)
+
+        trained = zstd_cache.train_dictionaries()
+        assert list(trained) == ['boring']
+        assert os.path.exists(os.path.join(
+            zstd_cache.cachedir, 'boring', 'dictionaries',
+            '{}.zdict'.format(trained['boring'])))
+
+        zstd_cache._save('boring', '2004-000000',
+                         get_document('2004-000000'))
+        with open(cached_file, 'rb') as f:
+            data = f.read()
+        assert zstandard.get_frame_parameters(data).dict_id == \
+            trained['boring']
+        assert len(data) < size
+
+        # a new instance reads the dictionaries from disk
+        cache = ZstdTextFileCache(cachedir=zstd_cache.cachedir)
+        for i in range(20):
+            key = '2004-{:06d}'.format(i)
+            assert cache._load('boring', key) == \
+                get_document(key)
+
+    def test_retrain_dictionaries(self, zstd_cache):
+        """Test whether documents compressed with an earlier dictionary
+        remain readable after retraining.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+
+        """
+        save_documents(zstd_cache)
+        first = zstd_cache.train_dictionaries()
+        save_documents(zstd_cache)
+
+        second = zstd_cache.train_dictionaries(dict_size=4*1024)
+        assert first['boring'] != second['boring']
+        assert len(os.listdir(os.path.join(
+            zstd_cache.cachedir, 'boring', 'dictionaries'))) == 3
+
+        cache = ZstdTextFileCache(cachedir=zstd_cache.cachedir)
+        assert cache._load('boring', '2004-000000') == \
+            get_document('2004-000000')
+
+    def test_train_min_samples(self, zstd_cache):
+        """Test whether no dictionary is trained for datatypes with too few
+        documents.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+
+        """
+        save_documents(zstd_cache, 5)
+        assert zstd_cache.train_dictionaries() == {}
+        assert not os.path.exists(os.path.join(
+            zstd_cache.cachedir, 'boring', 'dictionaries'))
+
+    def test_clean(self, zstd_cache):
+        """Test whether the clean method removes the old documents, but
+        keeps the dictionaries.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+
+        """
+        save_documents(zstd_cache)
+        zstd_cache.train_dictionaries()
+
+        zstd_cache.max_age = datetime.timedelta(seconds=0)
+        zstd_cache.clean()
+
+        assert os.listdir(os.path.join(zstd_cache.cachedir, 'boring')) == \
+            ['dictionaries']
+
+    def test_remove(self, zstd_cache):
+        """Test whether the remove method removes the cache directory.
+
+        Parameters
+        ----------
+        zstd_cache : pytest.fixture
+            ZstdTextFileCache using a temporary directory.
+
+        """
+        save_documents(zstd_cache)
+        zstd_cache.train_dictionaries()
+        zstd_cache.remove()
+
+        assert not os.path.exists(zstd_cache.cachedir)
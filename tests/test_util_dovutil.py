@@ -1,10 +1,13 @@
 """Module grouping tests for the pydov.util.owsutil module."""
+import asyncio
 import copy
 import os
 
 import pytest
+import requests
 
-from pydov.util import dovutil
+from pydov.util import dovutil, net
+from pydov.util.net import AdaptiveConcurrencyLimiter, SessionFactory
 
 env_var = "PYDOV_BASE_URL"
 
@@ -136,3 +139,121 @@ class TestDovutil(object):
             'https://data-oefen.bodemenondergrond.vlaanderen.be/sparql'
 
         del os.environ[env_var]
+
+    def test_get_remote_url_bytes(self):
+        """Test whether get_remote_url returns the raw response content,
+        without decoding and encoding it again."""
+        content = '<boring>Geotechnisch onderzoek — ë</boring>'.encode(
+            'utf-8')
+
+        class Response:
+            status_code = 200
+
+            def __init__(self):
+                self.content = content
+
+            @property
+            def text(self):
+                raise AssertionError('The response should not be decoded.')
+
+        class Session:
+            def get(self, url):
+                return Response()
+
+        data = dovutil.get_remote_url('https://dov/data/boring/1.xml',
+                                      Session())
+        assert data is content
+
+    def test_get_dov_xml_limit_concurrency(self, monkeypatch):
+        """Test whether only the requests for XML documents are limited by
+        the adaptive concurrency limiter."""
+        monkeypatch.setattr(net, 'concurrency_limiter',
+                            AdaptiveConcurrencyLimiter())
+        limited = []
+
+        def send(self, request, **kwargs):
+            limited.append(getattr(request, 'limit_concurrency', False))
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'<boring/>'
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+        session = SessionFactory.get_session()
+        dovutil.get_remote_url('https://dov/data/boring/1.xml', session)
+        assert limited == [False]
+
+        data = dovutil.get_dov_xml('https://dov/data/boring/1.xml', session)
+        assert data == b'<boring/>'
+        assert limited == [False, True]
+
+    def test_get_remote_url_async_limit_concurrency(self, monkeypatch):
+        """Test whether the async requests are limited by the adaptive
+        concurrency limiter, and HTTP 503 responses are reported to it and
+        retried after releasing the request slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        monkeypatch.setattr(net, 'async_concurrency_limiter', limiter)
+
+        attempts = []
+        sleeps = []
+
+        class Response:
+            def __init__(self, status):
+                self.status = status
+
+            async def read(self):
+                return b'<boring/>'
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+        class Session:
+            def get(self, url):
+                attempts.append(limiter._active)
+                return Response(503 if len(attempts) < 3 else 200)
+
+        async def sleep(delay):
+            sleeps.append(limiter._active)
+
+        monkeypatch.setattr(dovutil.asyncio, 'sleep', sleep)
+
+        data = asyncio.run(dovutil.get_remote_url_async(
+            'https://dov/data/boring/1.xml', Session()))
+
+        assert data == b'<boring/>'
+        assert attempts == [1, 1, 1]
+        assert sleeps == [0, 0]
+        assert limiter._active == 0
+        assert limiter.limit == 2
+
+    def test_get_remote_request_bytes(self):
+        """Test whether get_remote_request returns the raw response content,
+        without decoding and encoding it again."""
+        content = '<sparql>Geotechnisch onderzoek — ë</sparql>'.encode(
+            'utf-8')
+
+        class Response:
+            status_code = 200
+            url = 'https://dov/sparql'
+
+            def __init__(self):
+                self.content = content
+
+            @property
+            def text(self):
+                raise AssertionError('The response should not be decoded.')
+
+        class Session:
+            def prepare_request(self, request):
+                return request
+
+            def send(self, request):
+                return Response()
+
+        data = dovutil.get_remote_request(
+            requests.Request('GET', 'https://dov/sparql'), Session())
+        assert data is content
@@ -15,7 +15,9 @@ from pydov.util.location import (
     Within,
     Intersects,
     WithinDistance,
-    GmlObject
+    GmlFilter,
+    GmlObject,
+    get_extent
 )
 from owslib.etree import etree
 from pydov.util.owsutil import set_geometry_column
@@ -699,3 +701,55 @@ class TestLocationFilterExpressions(object):
             '186910.000000</gml:lowerCorner><gml:upperCorner>112220.000000 '
             '202870.000000</gml:upperCorner></gml:Envelope></fes:Within'
             '></fes:And>')
+
+
+class TestLocationExtent(object):
+    """Class grouping tests for the extent of locations and location
+    filters."""
+
+    def test_box(self):
+        """Test the extent of a Within(Box) filter.
+
+        Test whether the extent equals the box.
+
+        """
+        extent = get_extent(Within(Box(94720, 186910, 112220, 202870,
+                                       epsg=31370)))
+        assert (extent.minx, extent.miny, extent.maxx, extent.maxy,
+                extent.epsg) == (94720, 186910, 112220, 202870, 31370)
+
+    def test_gml(self):
+        """Test the extent of a GmlFilter.
+
+        Test whether the extent is the bounding box of the coordinates.
+
+        """
+        extent = get_extent(GmlFilter(
+            'tests/data/util/location/polygon_single_31370.gml', Within))
+        assert (extent.minx, extent.miny, extent.maxx, extent.maxy,
+                extent.epsg) == (108636.150020818, 194291.111953824,
+                                 109195.573506438, 195118.42837622, 31370)
+
+    def test_or(self):
+        """Test the extent of an Or of two Within(Box) filters.
+
+        Test whether the extent is the union of both boxes.
+
+        """
+        extent = get_extent(Or([
+            Within(Box(94720, 186910, 112220, 202870, epsg=31370)),
+            Within(Box(100000, 150000, 120000, 160000, epsg=31370))]))
+        assert (extent.minx, extent.miny, extent.maxx, extent.maxy) == \
+            (94720, 150000, 120000, 202870)
+
+    def test_unbounded(self):
+        """Test the extent of unbounded location filters.
+
+        Test whether the extent is None.
+
+        """
+        box = Box(94720, 186910, 112220, 202870, epsg=31370)
+        assert get_extent(Disjoint(box)) is None
+        assert get_extent(Not([Within(box)])) is None
+        assert get_extent(WithinDistance(
+            Point(150000, 150000, epsg=31370), 100)) is None
@@ -1,9 +1,19 @@
 """Module grouping tests for the pydov.util.net module."""
 
+import asyncio
+import time
+from threading import Event, Thread
+
+import pytest
 import requests
 import urllib3
 
-from pydov.util.net import SessionFactory, TimeoutHTTPAdapter
+import pydov
+from pydov.types.boring import Boring
+from pydov.util import net, parsing
+from pydov.util.hooks import AbstractReadHook, Hooks
+from pydov.util.net import (AdaptiveConcurrencyLimiter, SessionFactory,
+                            SharedSessionThreadPool, TimeoutHTTPAdapter)
 
 
 class TestSessionFactory:
@@ -58,3 +68,308 @@ class TestSessionFactory:
                 assert adapter.max_retries.method_whitelist == set(
                     ["HEAD", "GET", "POST", "PUT", "OPTIONS"]
                 )
+
+
+class TestSharedWorkerPool:
+    """Class for testing the shared pool of persistent worker threads."""
+
+    def test_order(self):
+        """Test whether the results are returned in the order the jobs
+        were submitted."""
+        def job(i, session):
+            time.sleep((10 - i) / 1000)
+            return i
+
+        pool = SharedSessionThreadPool()
+        for i in range(10):
+            pool.execute(job, (i,))
+
+        assert [r.get_result() for r in pool.join()] == list(range(10))
+
+    def test_error(self):
+        """Test whether errors of jobs are returned."""
+        def job(session):
+            raise RuntimeError
+
+        pool = SharedSessionThreadPool()
+        pool.execute(job, ())
+
+        results = list(pool.join())
+        assert len(results) == 1
+        assert isinstance(results[0].get_error(), RuntimeError)
+
+    def test_persistent_sessions(self):
+        """Test whether the sessions are reused across job groups."""
+        def job(session):
+            return session
+
+        sessions = set()
+        for i in range(3):
+            pool = SharedSessionThreadPool()
+            for j in range(20):
+                pool.execute(job, ())
+            sessions.update(id(r.get_result()) for r in pool.join())
+
+        assert len(sessions) <= net.worker_threads
+
+    def test_shutdown(self):
+        """Test whether shutdown stops the worker threads and they are
+        started again on next use."""
+        worker_pool = net.get_shared_worker_pool()
+        assert net.get_shared_worker_pool() is worker_pool
+
+        pydov.shutdown()
+
+        for w in worker_pool.workers:
+            assert not w.is_alive()
+
+        assert net.get_shared_worker_pool() is not worker_pool
+
+    def test_shutdown_queued(self):
+        """Test whether jobs still queued on shutdown are completed with an
+        error instead of waiting forever."""
+        release = Event()
+
+        def blocking_job(session):
+            release.wait(5)
+            return True
+
+        def job(session):
+            return True
+
+        worker_pool = net.get_shared_worker_pool()
+        running = [worker_pool.submit(blocking_job, ())
+                   for w in worker_pool.workers]
+        queued = [worker_pool.submit(job, ()) for i in range(5)]
+
+        shutdown = Thread(target=pydov.shutdown)
+        shutdown.start()
+
+        while not all(w.stopping for w in worker_pool.workers):
+            time.sleep(0.01)
+        release.set()
+        shutdown.join(5)
+        assert not shutdown.is_alive()
+
+        for r in running:
+            r.wait()
+            assert r.get_result() is True
+
+        for r in queued:
+            r.wait()
+            assert isinstance(r.get_error(), RuntimeError)
+            assert r.get_result() is None
+
+        late = worker_pool.submit(job, ())
+        late.wait()
+        assert isinstance(late.get_error(), RuntimeError)
+
+    def test_shutdown_processes(self, monkeypatch):
+        """Test whether parsing in worker processes does not wait forever
+        for the XML documents of jobs that are not executed because the
+        shared worker pool was stopped.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.fixture
+            PyTest monkeypatch fixture.
+
+        """
+        worker_pool = net.get_shared_worker_pool()
+        pydov.shutdown()
+
+        monkeypatch.setattr(pydov, 'engine', 'threads')
+        monkeypatch.setattr(pydov, 'parse_processes', 1)
+        monkeypatch.setattr(net, 'get_shared_worker_pool',
+                            lambda: worker_pool)
+
+        boring = Boring(
+            'https://www.dov.vlaanderen.be/data/boring/1930-120730')
+        monkeypatch.setattr(Boring, '_get_parsed_cache',
+                            classmethod(lambda cls: None))
+
+        output = []
+        thread = Thread(target=lambda: output.extend(
+            Boring._iter_df_array_processes([boring], None)))
+        try:
+            thread.start()
+            thread.join(10)
+            assert not thread.is_alive()
+        finally:
+            parsing.shutdown()
+
+        assert output == [[]]
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Class for testing the AdaptiveConcurrencyLimiter."""
+
+    def test_increase(self):
+        """Test whether the limit increases while latency stays flat."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+        for i in range(20):
+            limiter.acquire()
+            limiter.release(0.1)
+
+        assert limiter.limit == 4
+        assert limiter.get_latency() == (0.1, 0.1)
+
+    def test_no_increase_latency(self):
+        """Test whether the limit does not increase when latency rises."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+        for latency in (0.1, 0.1, 1, 1, 1, 1, 1, 1):
+            limiter.acquire()
+            limiter.release(latency)
+
+        assert limiter.limit == 3
+
+    def test_decrease(self):
+        """Test whether the limit decreases once per round on errors."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        for i in range(4):
+            limiter.acquire()
+        for i in range(4):
+            limiter.release(1, success=False)
+
+        assert limiter.limit == 4
+
+    def test_acquire_async(self):
+        """Test whether coroutines wait asynchronously for a request slot,
+        and are woken up when one is released."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+
+        async def run():
+            await limiter.acquire_async()
+            waiting = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            assert not waiting.done()
+
+            limiter.release(0.1)
+            await asyncio.wait_for(waiting, 1)
+            limiter.release(0.1)
+
+        asyncio.run(run())
+
+        assert limiter._active == 0
+        assert limiter.limit == 2
+
+    def test_hook(self, monkeypatch):
+        """Test whether limit changes are reported to the hooks."""
+        events = []
+
+        class Hook(AbstractReadHook):
+            def concurrency_changed(self, limit, latency_p50, latency_p95):
+                events.append((limit, latency_p50, latency_p95))
+
+        monkeypatch.setattr(pydov, 'hooks', Hooks((Hook(),)))
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        limiter.release(0.5)
+        limiter.acquire()
+        limiter.release(0.5, success=False)
+
+        assert events == [(2, 0.5, 0.5), (1, 0.5, 0.5)]
+
+    def test_adapter(self, monkeypatch):
+        """Test whether the adapter reports HTTP 503 responses as errors."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        monkeypatch.setattr(net, 'concurrency_limiter', limiter)
+
+        def send(self, request, **kwargs):
+            response = requests.Response()
+            response.status_code = 503
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+        request = requests.Request('GET', 'https://localhost').prepare()
+        request.limit_concurrency = True
+
+        adapter = TimeoutHTTPAdapter()
+        adapter.send(request)
+
+        assert limiter.limit == 2
+
+    def test_adapter_not_limited(self, monkeypatch):
+        """Test whether requests not marked to be limited, like the WFS and
+        metadata requests, do not use the limiter."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        monkeypatch.setattr(net, 'concurrency_limiter', limiter)
+
+        def send(self, request, **kwargs):
+            assert limiter._active == 0
+            response = requests.Response()
+            response.status_code = 503
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+        session = SessionFactory.get_session()
+        session.get('https://localhost')
+
+        assert limiter.limit == 4
+
+    def test_adapter_retry(self, monkeypatch):
+        """Test whether the request slot is released while waiting to retry,
+        and only the failed attempts are reported as errors."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        monkeypatch.setattr(net, 'concurrency_limiter', limiter)
+
+        attempts = []
+        sleeps = []
+
+        def send(self, request, **kwargs):
+            attempts.append(limiter._active)
+            if len(attempts) < 3:
+                raise requests.exceptions.ConnectionError
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        def sleep(self, response=None):
+            sleeps.append(limiter._active)
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+        monkeypatch.setattr(urllib3.util.Retry, 'sleep', sleep)
+
+        request = requests.Request('GET', 'https://localhost').prepare()
+        request.limit_concurrency = True
+
+        adapter = TimeoutHTTPAdapter(max_retries=urllib3.util.Retry(
+            total=3, backoff_factor=0))
+        response = adapter.send(request)
+
+        assert response.status_code == 200
+        assert attempts == [1, 1, 1]
+        assert sleeps == [0, 0]
+        assert limiter.limit == 2
+
+    def test_adapter_retry_exhausted(self, monkeypatch):
+        """Test whether the error of the last attempt is raised when the
+        retries are exhausted."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        monkeypatch.setattr(net, 'concurrency_limiter', limiter)
+
+        attempts = []
+
+        def send(self, request, **kwargs):
+            attempts.append(request)
+            raise requests.exceptions.ConnectTimeout
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+        monkeypatch.setattr(urllib3.util.Retry, 'sleep',
+                            lambda self, response=None: None)
+
+        request = requests.Request('GET', 'https://localhost').prepare()
+        request.limit_concurrency = True
+
+        adapter = TimeoutHTTPAdapter(max_retries=2)
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            adapter.send(request)
+
+        assert len(attempts) == 3
+        assert limiter._active == 0
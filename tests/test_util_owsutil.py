@@ -2,14 +2,16 @@
 import copy
 
 import pytest
+import requests
 from owslib.etree import etree
 from owslib.fes2 import FilterRequest, PropertyIsEqualTo, SortBy, SortProperty, Or
 from owslib.iso import MD_Metadata
 from owslib.util import nspath_eval
 
-from pydov.util import owsutil
+from pydov.util import net, owsutil
 from pydov.util.dovutil import build_dov_url
 from pydov.util.location import Box, Within, WithinDistance
+from pydov.util.net import SessionFactory
 from tests.abstract import clean_xml
 
 location_md_metadata = 'tests/data/types/boring/md_metadata.xml'
@@ -366,6 +368,64 @@ class TestWfsGetFeatureRequest(object):
             owsutil.wfs_build_getfeature_request(
                 'dov-pub:Boringen', max_features="0")
 
+    def test_wfs_build_getfeature_result_type_hits(self):
+        """Test the owsutil.wfs_build_getfeature_request method with a
+        resultType of 'hits'.
+
+        Test whether the XML of the WFS GetFeature call is generated correctly.
+
+        """
+        xml = owsutil.wfs_build_getfeature_request(
+            'dov-pub:Boringen', result_type='hits')
+
+        assert xml.attrib["resultType"] == "hits"
+
+    def test_wfs_build_getfeature_result_type_invalid(self):
+        """Test the owsutil.wfs_build_getfeature_request method with an
+        invalid resultType.
+
+        Test whether a ValueError is raised.
+
+        """
+        with pytest.raises(ValueError):
+            owsutil.wfs_build_getfeature_request(
+                'dov-pub:Boringen', result_type='count')
+
+    def test_wfs_build_getfeature_keyset(self):
+        """Test the owsutil.wfs_build_getfeature_request method with keyset
+        pagination.
+
+        Test whether the request is sorted on the key and filtered on the
+        keys following the start value.
+
+        """
+        xml = owsutil.wfs_build_getfeature_request(
+            'dov-pub:Boringen', keyset_property='fiche',
+            keyset_start='https://www.dov.vlaanderen.be/data/boring/1')
+
+        assert clean_xml(etree.tostring(xml[0]).decode('utf8')) == clean_xml(
+            '<wfs:Query typeNames="dov-pub:Boringen"><fes:Filter>'
+            '<fes:PropertyIsGreaterThan><fes:ValueReference>fiche'
+            '</fes:ValueReference><fes:Literal>'
+            'https://www.dov.vlaanderen.be/data/boring/1</fes:Literal>'
+            '</fes:PropertyIsGreaterThan></fes:Filter><fes:SortBy>'
+            '<fes:SortProperty><fes:ValueReference>fiche</fes:ValueReference>'
+            '<fes:SortOrder>ASC</fes:SortOrder></fes:SortProperty>'
+            '</fes:SortBy></wfs:Query>')
+
+    def test_wfs_build_getfeature_keyset_sortby(self):
+        """Test the owsutil.wfs_build_getfeature_request method with keyset
+        pagination and a sort_by.
+
+        Test whether an AttributeError is raised.
+
+        """
+        with pytest.raises(AttributeError):
+            owsutil.wfs_build_getfeature_request(
+                'dov-pub:Boringen', keyset_property='fiche',
+                sort_by=etree.tostring(SortBy(
+                    [SortProperty('diepte_tot_m', 'DESC')]).toXML()))
+
     def test_wfs_build_getfeature_request_bbox_nogeometrycolumn(self):
         """Test the owsutil.wfs_build_getfeature_request method with a location
         argument but without the geometry_column argument.
@@ -682,3 +742,98 @@ class TestWfsGetFeatureRequest(object):
         """
         with pytest.raises(ValueError):
             owsutil.wfs_build_getfeature_request('dov-pub:Boringen', crs='31370')
+
+    def test_wfs_get_feature_limit_concurrency(self, monkeypatch):
+        """Test the owsutil.wfs_get_feature method.
+
+        Test whether the requests for features are limited by the adaptive
+        concurrency limiter, and the requests for hits are not.
+
+        """
+        monkeypatch.setattr(net, 'concurrency_limiter',
+                            net.AdaptiveConcurrencyLimiter())
+        limited = []
+
+        def send(self, request, **kwargs):
+            limited.append(getattr(request, 'limit_concurrency', False))
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'<wfs:FeatureCollection/>'
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+        session = SessionFactory.get_session()
+        owsutil.wfs_get_feature(
+            build_dov_url('geoserver/wfs'),
+            owsutil.wfs_build_getfeature_request(
+                'dov-pub:Boringen', max_features=10, start_index=10),
+            session)
+        owsutil.wfs_get_feature(
+            build_dov_url('geoserver/wfs'),
+            owsutil.wfs_build_getfeature_request(
+                'dov-pub:Boringen', result_type='hits'),
+            session)
+
+        assert limited == [True, False]
+
+    def test_get_wfs_getfeature_request_hash(self):
+        """Test the owsutil.get_wfs_getfeature_request_hash method.
+
+        Test whether requests that only differ in namespace prefixes,
+        attribute order or whitespace get the same hash, and other requests
+        get a different hash.
+
+        """
+        request = etree.fromstring(
+            '<wfs:GetFeature xmlns:wfs="http://www.opengis.net/wfs/2.0" '
+            'service="WFS" version="2.0.0" count="10">'
+            '<wfs:Query typeNames="dov-pub:Boringen"/>'
+            '</wfs:GetFeature>')
+        equivalent = etree.fromstring(
+            '<wfs20:GetFeature count="10" version="2.0.0"\n'
+            '    xmlns:wfs20="http://www.opengis.net/wfs/2.0" service="WFS">\n'
+            '  <wfs20:Query typeNames="dov-pub:Boringen" />\n'
+            '</wfs20:GetFeature>')
+        different = etree.fromstring(
+            '<wfs:GetFeature xmlns:wfs="http://www.opengis.net/wfs/2.0" '
+            'service="WFS" version="2.0.0" count="20">'
+            '<wfs:Query typeNames="dov-pub:Boringen"/>'
+            '</wfs:GetFeature>')
+
+        request_hash = owsutil.get_wfs_getfeature_request_hash(request)
+
+        assert owsutil.get_wfs_getfeature_request_hash(equivalent) == \
+            request_hash
+        assert owsutil.get_wfs_getfeature_request_hash(different) != \
+            request_hash
+
+    def test_wfs_get_feature_bytes(self, monkeypatch):
+        """Test the owsutil.wfs_get_feature method.
+
+        Test whether the raw response content is returned, without decoding
+        and encoding it again.
+
+        """
+        content = '<wfs:FeatureCollection>ë</wfs:FeatureCollection>'.encode(
+            'utf-8')
+
+        class Response(requests.Response):
+            @property
+            def text(self):
+                raise AssertionError('The response should not be decoded.')
+
+        def send(self, request, **kwargs):
+            response = Response()
+            response.status_code = 200
+            response._content = content
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+        data = owsutil.wfs_get_feature(
+            build_dov_url('geoserver/wfs'),
+            owsutil.wfs_build_getfeature_request(
+                'dov-pub:Boringen', max_features=10),
+            SessionFactory.get_session())
+        assert data is content
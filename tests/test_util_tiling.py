@@ -0,0 +1,88 @@
+"""Module grouping tests for the pydov.util.tiling module."""
+from pydov.util.location import Box
+from pydov.util.tiling import TilePlanner
+
+points = [(x * 10 + 5, y * 10 + 5) for x in range(10) for y in range(10)
+          if x < 5 or y < 2]
+
+
+def get_number_matched(tile, session=None):
+    """Get the number of points in the given tile.
+
+    Parameters
+    ----------
+    tile : pydov.util.location.Box
+        Tile to count the points of.
+    session : requests.Session, optional
+        Session to use to perform HTTP requests.
+
+    Returns
+    -------
+    int
+        Number of points in the tile.
+
+    """
+    return len([p for p in points if tile.minx <= p[0] <= tile.maxx
+                and tile.miny <= p[1] <= tile.maxy])
+
+
+class TestTilePlanner(object):
+    """Class grouping tests for the TilePlanner."""
+
+    def test_split(self):
+        """Test splitting a tile.
+
+        Test whether the number of tiles is proportional to the number of
+        features and whether the tiles cover the original tile.
+
+        """
+        planner = TilePlanner()
+        tile = Box(0, 0, 100, 100, epsg=31370)
+
+        assert len(planner.split(tile, 15, 10)) == 4
+        assert len(planner.split(tile, 90, 10)) == 9
+        assert len(planner.split(tile, 100000, 10)) == 64
+
+        tiles = planner.split(tile, 90, 10)
+        assert min(t.minx for t in tiles) == 0
+        assert min(t.miny for t in tiles) == 0
+        assert max(t.maxx for t in tiles) == 100
+        assert max(t.maxy for t in tiles) == 100
+
+    def test_plan(self):
+        """Test planning the tiles of an extent.
+
+        Test whether all tiles contain features, no tile contains too many
+        features and the tiles are sized adaptively.
+
+        """
+        planner = TilePlanner()
+        tiles = planner.plan(Box(0, 0, 100, 100, epsg=31370),
+                             get_number_matched, 10)
+
+        assert all(0 < n <= 10 for t, n in tiles)
+        assert sum(n for t, n in tiles) >= len(points)
+        assert len(set((t.maxx - t.minx) for t, n in tiles)) > 1
+
+    def test_plan_max_depth(self):
+        """Test planning the tiles of an extent with a maximum depth of 0.
+
+        Test whether the full extent is returned as a single tile.
+
+        """
+        planner = TilePlanner(max_depth=0)
+        tiles = planner.plan(Box(0, 0, 100, 100, epsg=31370),
+                             get_number_matched, 10)
+
+        assert len(tiles) == 1
+        assert tiles[0][1] == len(points)
+
+    def test_plan_unknown(self):
+        """Test planning the tiles when the number of features is unknown.
+
+        Test whether None is returned.
+
+        """
+        planner = TilePlanner()
+        assert planner.plan(Box(0, 0, 100, 100, epsg=31370),
+                            lambda tile, session: None, 10) is None